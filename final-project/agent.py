@@ -1,15 +1,17 @@
-from typing import Literal, Any
-from langchain_core.messages import HumanMessage, AIMessage, SystemMessage
+from typing import Iterator, Literal, Any
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, SystemMessage
 from langchain_core.prompts.chat import ChatPromptTemplate, MessagesPlaceholder
 from langgraph.types import Command
 from langgraph.graph.message import add_messages
 from langgraph.graph import START, StateGraph, END
 from langgraph.prebuilt import create_react_agent
-from langgraph.checkpoint.memory import MemorySaver
+from langgraph.prebuilt.chat_agent_executor import AgentState as ReactAgentState
+from langgraph.checkpoint.base import BaseCheckpointSaver
 from typing_extensions import Annotated, TypedDict
 
 # --- project‑local imports ----------------------------------------------------
-from prompt_library.prompt import system_prompt
+from prompt_library.prompt import get_system_prompt
+from utils.checkpoint import make_checkpointer
 from utils.llms import LLMModel
 from toolkit.toolkits import (
     check_availability_by_doctor,
@@ -41,6 +43,30 @@ class AgentState(TypedDict):
     follow_up_needed: bool
 
 
+class SpecialistState(ReactAgentState):
+    """ReAct sub‑agent state; carries the user id into the prompt template."""
+
+    id_number: int
+
+
+INFORMATION_PROMPT = """
+            You are an assistant specialized in answering questions about doctor
+            availability and hospital‑related FAQs. Use the provided tools to
+            check schedules.
+
+            The user's identification number is {id_number}. Never ask
+            for it again. If date, time, doctor name, or specialization is
+            missing, politely ask for it. Current year is 2025.
+        """
+
+BOOKING_PROMPT = """
+            You manage doctor appointments (set, cancel, reschedule) via tools.
+            The user's identification number is {id_number}; never ask
+            for it again. If date, time, or doctor name is missing, ask
+            clarifying questions. Assume year 2025.
+        """
+
+
 # -----------------------------------------------------------------------------
 # Main agent class
 # -----------------------------------------------------------------------------
@@ -53,9 +79,27 @@ class DoctorAppointmentAgent:
     # constructor and workflow compilation
     # ------------------------------------------------------------------
 
-    def __init__(self, memory: MemorySaver | None = None):
-        self.llm_model = LLMModel().get_model()
-        self.memory = memory or MemorySaver()
+    def __init__(self, memory: BaseCheckpointSaver | None = None, llm_model: Any = None):
+        self.llm_model = llm_model or LLMModel().get_model()
+        self.memory = memory or make_checkpointer()
+
+        # specialist sub‑agents are compiled once, not on every node call
+        self.info_agent = create_react_agent(
+            model=self.llm_model,
+            tools=[check_availability_by_doctor, check_availability_by_specialization],
+            prompt=ChatPromptTemplate.from_messages(
+                [("system", INFORMATION_PROMPT), MessagesPlaceholder(variable_name="messages")]
+            ),
+            state_schema=SpecialistState,
+        )
+        self.booking_agent = create_react_agent(
+            model=self.llm_model,
+            tools=[set_appointment, cancel_appointment, reschedule_appointment],
+            prompt=ChatPromptTemplate.from_messages(
+                [("system", BOOKING_PROMPT), MessagesPlaceholder(variable_name="messages")]
+            ),
+            state_schema=SpecialistState,
+        )
 
         # build graph
         self.graph = StateGraph(AgentState)
@@ -69,11 +113,40 @@ class DoctorAppointmentAgent:
     # public entrypoint
     # ------------------------------------------------------------------
 
-    def invoke(self, state: AgentState, *, thread_id: str) -> AgentState:
+    def invoke(self, state: AgentState, *, thread_id: str, callbacks: list | None = None) -> AgentState:
         """Invoke the LangGraph run bound to a stable thread id."""
         config = {"configurable": {"thread_id": thread_id}}
+        if callbacks:
+            config["callbacks"] = callbacks
         return self.app.invoke(state, config=config)  # type: ignore[return-value]
 
+    def stream(self, state: AgentState, *, thread_id: str, callbacks: list | None = None) -> Iterator[dict]:
+        """Run a turn like :meth:`invoke`, yielding progress events as it goes.
+
+        ``{"event": "route", "next": node}`` whenever the supervisor hands off,
+        ``{"event": "token", "node": node, "text": ...}`` for each chunk of a
+        specialist's reply, and finally ``{"event": "done", "content": ...}``
+        with the turn's last message (which the tokens may not add up to, e.g.
+        when the supervisor waits for a follow-up).
+        """
+        config = {"configurable": {"thread_id": thread_id}}
+        if callbacks:
+            config["callbacks"] = callbacks
+        for namespace, mode, data in self.app.stream(
+            state, config=config, stream_mode=["updates", "messages"], subgraphs=True
+        ):
+            if mode == "updates" and not namespace:
+                next_node = (data.get("supervisor") or {}).get("next")
+                if next_node and next_node != END:
+                    yield {"event": "route", "next": next_node}
+            elif mode == "messages" and namespace:
+                # only the specialists' ReAct LLM calls; the router's JSON is not shown
+                chunk, metadata = data
+                if isinstance(chunk, AIMessageChunk) and chunk.content and metadata.get("langgraph_node") == "agent":
+                    yield {"event": "token", "node": namespace[0].split(":")[0], "text": chunk.content}
+        final = self.app.get_state({"configurable": {"thread_id": thread_id}}).values["messages"][-1]
+        yield {"event": "done", "content": final.content}
+
     # ------------------------------------------------------------------
     # Graph nodes
     # ------------------------------------------------------------------
@@ -94,7 +167,7 @@ class DoctorAppointmentAgent:
         # 2. build routing prompt -----------------------------------
         router_messages = [
             SystemMessage(
-                content=f"{system_prompt}\nUser's identification number is {state['id_number']}"
+                content=f"{get_system_prompt()}\nUser's identification number is {state['id_number']}"
             )
         ] + state["messages"]
 
@@ -131,27 +204,7 @@ class DoctorAppointmentAgent:
     def information_node(self, state: AgentState) -> Command[Literal["supervisor"]]:
         print("\n>>>>>>>> INFORMATION NODE <<<<<<<<")
 
-        sys_prompt = f"""
-            You are an assistant specialized in answering questions about doctor
-            availability and hospital‑related FAQs. Use the provided tools to
-            check schedules.
-
-            The user's identification number is {state['id_number']}. Never ask
-            for it again. If date, time, doctor name, or specialization is
-            missing, politely ask for it. Current year is 2025.
-        """
-
-        agent_prompt = ChatPromptTemplate.from_messages(
-            [("system", sys_prompt), MessagesPlaceholder(variable_name="messages")]
-        )
-
-        info_agent = create_react_agent(
-            model=self.llm_model,
-            tools=[check_availability_by_doctor, check_availability_by_specialization],
-            prompt=agent_prompt,
-        )
-
-        result = info_agent.invoke(state)
+        result = self.info_agent.invoke(state)
         follow_up_msg = result["messages"][-1].content
         tool_was_used = any(getattr(msg, "role", None) == "tool" for msg in result["messages"])
 
@@ -173,24 +226,7 @@ class DoctorAppointmentAgent:
         print("\n>>>>>>>> BOOKING NODE <<<<<<<<")
         print("User id →", state.get("id_number"))
 
-        sys_prompt = f"""
-            You manage doctor appointments (set, cancel, reschedule) via tools.
-            The user's identification number is {state['id_number']}; never ask
-            for it again. If date, time, or doctor name is missing, ask
-            clarifying questions. Assume year 2025.
-        """
-
-        agent_prompt = ChatPromptTemplate.from_messages(
-            [("system", sys_prompt), MessagesPlaceholder(variable_name="messages")]
-        )
-
-        booking_agent = create_react_agent(
-            model=self.llm_model,
-            tools=[set_appointment, cancel_appointment, reschedule_appointment],
-            prompt=agent_prompt,
-        )
-
-        result = booking_agent.invoke(state)
+        result = self.booking_agent.invoke(state)
         follow_up_msg = result["messages"][-1].content
         tool_was_used = any(getattr(msg, "role", None) == "tool" for msg in result["messages"])
 
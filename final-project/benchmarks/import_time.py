@@ -0,0 +1,84 @@
+"""Import-time report for the appointment service.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+(several times, keeping the fastest run), then prints the total, the
+slowest direct imports and the modules with the largest self time.
+
+    python benchmarks/import_time.py
+    python benchmarks/import_time.py --module agent --top 15
+    python benchmarks/import_time.py --budget-ms 800 --forbid streamlit,pandas,langchain_groq
+
+Exits non-zero if the total exceeds ``--budget-ms`` or a ``--forbid``
+module is imported, so it can gate startup regressions in CI.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def profile_import(module: str) -> list[tuple[int, int, int, str]]:
+    """Return (self_us, cumulative_us, depth, name) rows for one fresh import."""
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "import-time-benchmark")
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"importing {module} failed:\n{proc.stderr[-2000:]}")
+    rows = []
+    for line in proc.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((int(self_us), int(cumulative_us), (len(indent) - 1) // 2, name))
+    return rows
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="main")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--budget-ms", type=float, default=None)
+    parser.add_argument("--forbid", default="", help="comma-separated top-level packages that must not be imported")
+    args = parser.parse_args()
+
+    runs = [profile_import(args.module) for _ in range(args.runs)]
+    rows = min(runs, key=lambda r: next(c for _, c, _, n in r if n == args.module))
+    total_ms = next(c for _, c, _, n in rows if n == args.module) / 1000
+
+    print(f"import {args.module}: {total_ms:.1f} ms (best of {args.runs}), {len(rows)} modules")
+
+    print(f"\nSlowest direct imports of {args.module}:")
+    direct = sorted((r for r in rows if r[2] == 1), key=lambda r: r[1], reverse=True)
+    for _, cumulative_us, _, name in direct[: args.top]:
+        print(f"  {cumulative_us / 1000:9.1f} ms  {name}")
+
+    print("\nLargest self time:")
+    for self_us, _, _, name in sorted(rows, reverse=True)[: args.top]:
+        print(f"  {self_us / 1000:9.1f} ms  {name}")
+
+    failed = False
+    imported = {name.split(".")[0] for *_, name in rows}
+    for package in filter(None, args.forbid.split(",")):
+        if package in imported:
+            print(f"\nFAIL: {package} is imported by {args.module}")
+            failed = True
+    if args.budget_ms is not None and total_ms > args.budget_ms:
+        print(f"\nFAIL: {total_ms:.1f} ms exceeds budget of {args.budget_ms:.1f} ms")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
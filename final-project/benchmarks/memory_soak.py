@@ -0,0 +1,118 @@
+"""Memory soak: thousands of synthetic conversation threads through one agent.
+
+Runs ``--threads`` conversations of ``--turns`` turns each through a single
+``DoctorAppointmentAgent`` (scripted model, no network) and samples RSS as it
+goes. Then it prints the /debug/memory report: checkpoint bytes per thread and
+per checkpoint, live message bytes per type, and the allocation sites that
+grew most.
+
+    python benchmarks/memory_soak.py --threads 2000 --turns 3 --ceiling-mb 600
+    python benchmarks/memory_soak.py --saver sqlite --threads 5000
+
+Exits non-zero if RSS grows by more than ``--ceiling-mb`` over the run.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+MB = 1024 * 1024
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, default=2000)
+    parser.add_argument("--turns", type=int, default=3, help="turns per thread")
+    parser.add_argument("--reply-chars", type=int, default=400, help="length of each scripted reply")
+    parser.add_argument("--saver", choices=["memory", "sqlite"], default="memory")
+    parser.add_argument("--ceiling-mb", type=float, default=600.0, help="max RSS growth over the run")
+    parser.add_argument("--tracemalloc", action="store_true", help="also attribute growth to allocation sites (slower)")
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="memory-soak-")
+    os.environ["SLOT_STORE_DIR"] = os.path.join(tmp, "slots")
+    os.environ.setdefault("SLOT_STORE_PATH", os.path.join(PROJECT_DIR, "data", "doctor_availability.csv"))
+    os.environ.setdefault("OPENAI_API_KEY", "memory-soak")
+    if args.saver == "sqlite":
+        os.environ["CHECKPOINT_DB"] = os.path.join(tmp, "checkpoints.sqlite")
+
+    from langchain_core.messages import AIMessage, HumanMessage
+
+    from agent import DoctorAppointmentAgent
+    from utils import memory
+    from utils.fake_llm import ScriptedChatModel
+
+    reply = ("Dr. John Doe is available at 9:00 AM, 9:30 AM and 10:00 AM. " * 20)[: args.reply_chars]
+    fake = ScriptedChatModel(
+        responses=[AIMessage(content=reply)],
+        routes=[{"next": "information_node", "reasoning": "soak"}],
+    )
+    agent = DoctorAppointmentAgent(llm_model=fake)
+
+    def turn(thread: int, n: int) -> None:
+        agent.invoke(
+            {
+                "messages": [HumanMessage(content=f"Is anyone free on 0{n % 9 + 1}-08-2025 for a cleaning? ({thread})")],
+                "id_number": 1_000_000 + thread,
+                "next": "",
+                "query": "",
+                "current_reasoning": "",
+                "follow_up_needed": False,
+            },
+            thread_id=f"soak-{thread}",
+        )
+
+    quiet = io.StringIO()
+    with redirect_stdout(quiet):
+        turn(-1, 0)  # first run pays one-off import and compile costs
+    if args.tracemalloc:
+        memory.start()
+    rss_start = memory.rss_bytes()
+    started = time.perf_counter()
+    step = max(1, args.threads // 10)
+    for thread in range(args.threads):
+        with redirect_stdout(quiet):
+            for n in range(args.turns):
+                turn(thread, n)
+        quiet.seek(0)
+        quiet.truncate()
+        if (thread + 1) % step == 0:
+            growth = (memory.rss_bytes() - rss_start) / MB
+            print(f"{thread + 1:7,} threads  rss +{growth:8.1f} MB  ({growth * MB / (thread + 1) / 1024:6.1f} KB/thread)")
+    elapsed = time.perf_counter() - started
+
+    growth_mb = (memory.rss_bytes() - rss_start) / MB
+    turns = args.threads * args.turns
+    print(f"\n{turns:,} turns in {elapsed:.1f}s ({turns / elapsed:.0f} turns/s); "
+          f"rss grew {growth_mb:.1f} MB with the {agent.memory.__class__.__name__}")
+
+    report = memory.memory_report(agent.memory, top=args.top, message_threads=args.top)
+    checkpoints = report["checkpoints"]
+    print(f"checkpoints: {checkpoints['threads']:,} threads, {checkpoints['checkpoints']:,} checkpoints, "
+          f"{checkpoints['bytes'] / MB:.1f} MB serialized "
+          f"({checkpoints['bytes_per_thread']:,} B/thread, {checkpoints['bytes_per_checkpoint']:,} B/checkpoint)")
+    if "history_bytes" in checkpoints:
+        print(f"  superseded channel values (history): {checkpoints['history_bytes'] / MB:.1f} MB")
+    print("live message bytes by type (largest threads): " + json.dumps(report["message_types"]))
+    if args.tracemalloc:
+        print("\nlargest allocation growth:")
+        for site in report["allocations"]["top_growth"]:
+            print(f"  {site['bytes_diff'] / 1024:10.1f} KB  {site['where']}")
+
+    if growth_mb > args.ceiling_mb:
+        print(f"\nFAIL: rss grew {growth_mb:.1f} MB, ceiling {args.ceiling_mb:.1f} MB")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
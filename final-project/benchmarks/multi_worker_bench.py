@@ -0,0 +1,220 @@
+"""Consistency and throughput of ``uvicorn --workers N``.
+
+For each worker count, starts the service on a throwaway copy of the slot
+store with a shared SQLite checkpointer, then drives the direct data
+endpoints from several client processes: mostly availability reads, plus
+bookings and cancellations of free slots by synthetic patients. Afterwards
+the partitions on disk must hold exactly the bookings the clients were
+acknowledged (no lost or double bookings, no patient in two places at once).
+
+    python benchmarks/multi_worker_bench.py --workers 1,4 --duration 15
+    python benchmarks/multi_worker_bench.py --workers 1,2,4 --min-efficiency 0.7
+
+Exits non-zero on any inconsistency, or when throughput at N workers is
+below ``--min-efficiency`` x N x the single-worker rate (checked only when
+the machine has at least N cores).
+"""
+
+import argparse
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+import httpx
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from toolkit.slot_store import read_slots  # noqa: E402
+
+SEED_PATH = os.path.join(PROJECT_DIR, "data", "doctor_availability.csv")
+FIRST_PATIENT = 90_000_000  # synthetic patients; the seed data uses lower ids
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(workers: int, tmp: str) -> tuple[subprocess.Popen, str]:
+    port = free_port()
+    env = dict(os.environ)
+    env.setdefault("OPENAI_API_KEY", "multi-worker-benchmark")
+    env.update(
+        SLOT_STORE_DIR=os.path.join(tmp, "slots"),
+        SLOT_STORE_PATH=SEED_PATH,
+        CHECKPOINT_DB=os.path.join(tmp, "checkpoints.sqlite"),
+    )
+    log = open(os.path.join(tmp, "server.log"), "w")
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=PROJECT_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+    return proc, f"http://127.0.0.1:{port}"
+
+
+def wait_until_ready(base_url: str, workers: int, timeout: float = 90) -> None:
+    """Wait until /ready has answered 200 several times in a row, so every
+    worker (requests land on any of them) has finished its warm-up."""
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while time.monotonic() < deadline and streak < 3 * workers:
+        try:
+            streak = streak + 1 if httpx.get(f"{base_url}/ready", timeout=2).status_code == 200 else 0
+        except httpx.HTTPError:
+            streak = 0
+        time.sleep(0.1)
+    if streak < 3 * workers:
+        raise RuntimeError(f"service at {base_url} did not become ready")
+
+
+def client(base_url: str, days: list[str], seconds: float, threads: int, write_ratio: float, client_id: int) -> dict:
+    """One load-generator process; returns counts, latencies and the bookings it holds."""
+    result = {"ops": 0, "writes": 0, "latencies": [], "held": set(), "errors": []}
+    lock = threading.Lock()
+    deadline = time.monotonic() + seconds
+
+    def run(thread_no: int):
+        rng = random.Random(client_id * 1000 + thread_no)
+        patient = FIRST_PATIENT + client_id * 1000 + thread_no
+        held: list[tuple[str, str]] = []
+        latencies, ops, writes, errors = [], 0, 0, []
+        with httpx.Client(base_url=base_url, timeout=30) as http:
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                day = rng.choice(days)
+                free = http.get("/availability", params={"date": day, "limit": 500}).json()["items"]
+                if rng.random() < write_ratio:
+                    writes += 1
+                    if held and rng.random() < 0.5:
+                        date_slot, doctor = held.pop(rng.randrange(len(held)))
+                        r = http.delete(f"/appointments/{doctor}/{date_slot}", params={"id_number": patient})
+                        if r.status_code != 200:
+                            errors.append(f"cancel of an acknowledged booking returned {r.status_code}")
+                    elif free:
+                        slot = rng.choice(free)
+                        r = http.post("/appointments", json={
+                            "date_slot": slot["date_slot"], "doctor_name": slot["doctor_name"], "id_number": patient,
+                        })
+                        if r.status_code == 201:
+                            held.append((slot["date_slot"], slot["doctor_name"]))
+                        elif r.status_code != 409:
+                            errors.append(f"booking returned {r.status_code}")
+                latencies.append(time.perf_counter() - started)
+                ops += 1
+        with lock:
+            result["ops"] += ops
+            result["writes"] += writes
+            result["latencies"] += latencies
+            result["held"].update((date_slot, doctor, patient) for date_slot, doctor in held)
+            result["errors"] += errors
+
+    workers = [threading.Thread(target=run, args=(i,)) for i in range(threads)]
+    for t in workers:
+        t.start()
+    for t in workers:
+        t.join()
+    return result
+
+
+def check_consistency(slots_dir: str, held: set) -> list[str]:
+    on_disk = set()
+    for name in os.listdir(slots_dir):
+        if name.endswith(".csv") and name != "roster.csv":
+            with open(os.path.join(slots_dir, name), newline="") as f:
+                on_disk.update(
+                    (s.date_slot, s.doctor_name, s.patient_to_attend)
+                    for s in read_slots(f)
+                    if s.patient_to_attend is not None and s.patient_to_attend >= FIRST_PATIENT
+                )
+    problems = []
+    if on_disk - held:
+        problems.append(f"{len(on_disk - held)} bookings on disk that no client holds (e.g. {sorted(on_disk - held)[:3]})")
+    if held - on_disk:
+        problems.append(f"{len(held - on_disk)} acknowledged bookings missing on disk (e.g. {sorted(held - on_disk)[:3]})")
+    times = [(patient, date_slot) for date_slot, _, patient in on_disk]
+    if len(times) != len(set(times)):
+        problems.append("a patient holds two slots at the same time")
+    return problems
+
+
+def run_once(workers: int, args, days: list[str]) -> dict:
+    with tempfile.TemporaryDirectory() as tmp:
+        proc, base_url = start_server(workers, tmp)
+        try:
+            wait_until_ready(base_url, workers)
+            with ProcessPoolExecutor(args.clients) as pool:
+                futures = [
+                    pool.submit(client, base_url, days, args.duration, args.threads, args.write_ratio, i)
+                    for i in range(args.clients)
+                ]
+                results = [f.result() for f in futures]
+        finally:
+            proc.terminate()
+            proc.wait(timeout=30)
+        held = set().union(*(r["held"] for r in results))
+        errors = Counter(e for r in results for e in r["errors"])
+        problems = [f"{count}x {error}" for error, count in errors.items()] + check_consistency(os.path.join(tmp, "slots"), held)
+    latencies = sorted(latency for r in results for latency in r["latencies"])
+    ops = sum(r["ops"] for r in results)
+    return {
+        "workers": workers,
+        "ops": ops,
+        "writes": sum(r["writes"] for r in results),
+        "rps": ops / args.duration,
+        "p50_ms": latencies[len(latencies) // 2] * 1000 if latencies else 0.0,
+        "p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else 0.0,
+        "held": len(held),
+        "problems": problems,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", default="1,4", help="comma-separated worker counts")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load per worker count")
+    parser.add_argument("--clients", type=int, default=4, help="load-generator processes")
+    parser.add_argument("--threads", type=int, default=8, help="threads per load-generator process")
+    parser.add_argument("--write-ratio", type=float, default=0.2)
+    parser.add_argument("--min-efficiency", type=float, default=0.7)
+    args = parser.parse_args()
+
+    with open(SEED_PATH, newline="") as f:
+        days = sorted({slot.date for slot in read_slots(f)})
+
+    failed = False
+    baseline = None
+    for workers in map(int, args.workers.split(",")):
+        r = run_once(workers, args, days)
+        print(f"workers={r['workers']}: {r['ops']:,} requests ({r['writes']:,} writes) "
+              f"{r['rps']:,.0f} req/s, p50 {r['p50_ms']:.1f} ms, p99 {r['p99_ms']:.1f} ms, "
+              f"{r['held']} bookings held at the end")
+        for problem in r["problems"]:
+            print(f"  FAIL: {problem}")
+            failed = True
+        if not r["problems"]:
+            print("  consistent: disk matches every acknowledged booking and cancellation")
+        if baseline is None:
+            baseline = r
+            continue
+        efficiency = r["rps"] / (baseline["rps"] * r["workers"] / baseline["workers"])
+        print(f"  scaling efficiency vs {baseline['workers']} worker(s): {efficiency:.2f}")
+        if (os.cpu_count() or 1) < r["workers"] + args.clients:
+            print(f"  (scaling not checked: {os.cpu_count()} cores for {r['workers']} workers + {args.clients} clients)")
+        elif efficiency < args.min_efficiency:
+            print(f"  FAIL: efficiency below {args.min_efficiency}")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,167 @@
+"""Replay captured /execute traffic through the agent.
+
+Reads a capture written with ``CAPTURE_PATH`` (see utils/capture.py) and
+runs every turn through one shared ``DoctorAppointmentAgent``, keeping
+each conversation's turns in order and spacing turns as they arrived.
+LLM calls are served by ``ReplayChatModel``, so runs are deterministic and
+need no API key:
+
+- ``--llm recorded`` returns the captured responses, sleeping their
+  recorded latency x ``--llm-latency``. Replies are checked against the
+  captured ones.
+- ``--llm fake`` answers every turn with one canned information reply, to
+  measure framework overhead alone.
+
+Bookings go to a throwaway copy of the slot store, and conversations are
+checkpointed in memory even when ``CHECKPOINT_DB`` is set.
+
+    python benchmarks/replay.py captures/traffic.jsonl                 # original speed
+    python benchmarks/replay.py captures/traffic.jsonl --speed 10      # 10x faster arrivals
+    python benchmarks/replay.py captures/traffic.jsonl --speed 0 --llm-latency 0 --out after.json
+"""
+
+import argparse
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from contextlib import redirect_stdout
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+
+def load_capture(path: str) -> dict[str, list[dict]]:
+    threads: dict[str, list[dict]] = {}
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                threads.setdefault(entry["thread"], []).append(entry)
+    for turns in threads.values():
+        turns.sort(key=lambda e: e["ts"])
+    return threads
+
+
+def fake_calls(entry: dict) -> list[dict]:
+    """Route to the information node, answer, then finish."""
+    def ai(**data):
+        return {"message": {"type": "ai", "data": {"content": "", **data}}}
+
+    return [
+        ai(content=json.dumps({"next": "information_node", "reasoning": "replay"})),
+        ai(content="(fake reply)"),
+        ai(content=json.dumps({"next": "FINISH", "reasoning": "replay"})),
+    ]
+
+
+def percentile(values: list[float], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * q))] if values else 0.0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("capture", help="JSONL file written with CAPTURE_PATH")
+    parser.add_argument("--speed", type=float, default=1.0, help="arrival speed-up; 0 = replay back to back")
+    parser.add_argument("--llm", choices=["recorded", "fake"], default="recorded")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="scale for recorded LLM latency; 0 = none")
+    parser.add_argument("--out", help="write per-turn results as JSON, for comparing runs")
+    parser.add_argument("--verbose", action="store_true", help="keep the agent's own logging")
+    args = parser.parse_args()
+
+    threads = load_capture(args.capture)
+    if not threads:
+        print(f"{args.capture} holds no turns")
+        return 1
+
+    # the store and the checkpointer read their locations at import time
+    store_dir = tempfile.mkdtemp(prefix="replay-slots-")
+    os.environ["SLOT_STORE_DIR"] = store_dir
+    # replayed turns must not land in the real checkpoint database: keep them in memory
+    os.environ.pop("CHECKPOINT_DB", None)
+    os.environ.setdefault("SLOT_STORE_PATH", os.path.join(PROJECT_DIR, "data", "doctor_availability.csv"))
+    os.environ.setdefault("OPENAI_API_KEY", "replay")
+    from agent import DoctorAppointmentAgent
+    from langchain_core.messages import HumanMessage
+    from utils.fake_llm import ReplayChatModel, ReplayDiverged
+
+    model = ReplayChatModel(latency_scale=args.llm_latency if args.llm == "recorded" else 0.0)
+    agent = DoctorAppointmentAgent(llm_model=model)
+
+    t0 = min(turns[0]["ts"] for turns in threads.values())
+    results: list[dict] = []
+    lock = threading.Lock()
+    started = time.perf_counter()
+
+    def run_thread(thread: str, turns: list[dict]):
+        for entry in turns:
+            if args.speed > 0:
+                delay = started + (entry["ts"] - t0) / args.speed - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            calls = entry["llm_calls"] if args.llm == "recorded" else fake_calls(entry)
+            state = {
+                "messages": [HumanMessage(content=entry["message"])],
+                "id_number": entry["id_number"],
+                "next": "",
+                "query": "",
+                "current_reasoning": "",
+                "follow_up_needed": False,
+            }
+            outcome, reply = "ok", None
+            turn_started = time.perf_counter()
+            try:
+                with model.turn(calls):
+                    reply = agent.invoke(state, thread_id=f"replay-{thread}")["messages"][-1].content
+            except ReplayDiverged:
+                outcome = "diverged"
+            except Exception as e:
+                outcome = f"error: {type(e).__name__}"
+            elapsed_ms = (time.perf_counter() - turn_started) * 1000
+            if outcome == "ok" and args.llm == "recorded" and entry.get("reply") is not None and reply != entry["reply"]:
+                outcome = "reply mismatch"
+            with lock:
+                results.append({
+                    "thread": thread,
+                    "turn": entry["turn"],
+                    "outcome": outcome,
+                    "elapsed_ms": round(elapsed_ms, 1),
+                    "recorded_ms": entry["elapsed_ms"],
+                })
+
+    workers = [threading.Thread(target=run_thread, args=item) for item in threads.items()]
+    quiet = io.StringIO()
+    try:
+        with redirect_stdout(sys.stdout if args.verbose else quiet):
+            for w in workers:
+                w.start()
+            for w in workers:
+                w.join()
+    finally:
+        shutil.rmtree(store_dir, ignore_errors=True)
+    wall = time.perf_counter() - started
+
+    latencies = [r["elapsed_ms"] for r in results]
+    recorded = [r["recorded_ms"] for r in results]
+    outcomes: dict[str, int] = {}
+    for r in results:
+        outcomes[r["outcome"]] = outcomes.get(r["outcome"], 0) + 1
+    print(f"replayed {len(results)} turns from {len(threads)} threads in {wall:.2f}s "
+          f"({len(results) / wall:.1f} turns/s), speed={args.speed:g}, llm={args.llm}")
+    print(f"  turn latency  p50 {percentile(latencies, 0.5):8.1f} ms   p95 {percentile(latencies, 0.95):8.1f} ms"
+          f"   max {max(latencies):8.1f} ms")
+    print(f"  recorded      p50 {percentile(recorded, 0.5):8.1f} ms   p95 {percentile(recorded, 0.95):8.1f} ms")
+    print("  outcomes: " + ", ".join(f"{k}={v}" for k, v in sorted(outcomes.items())))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({"args": vars(args), "wall_s": wall, "turns": results}, f, indent=2)
+    return 0 if outcomes.get("ok", 0) == len(results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
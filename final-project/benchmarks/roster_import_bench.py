@@ -0,0 +1,69 @@
+"""Throughput of the bulk roster import.
+
+Generates a synthetic roster (30-minute slots, 08:00-17:30, for as many
+doctors and days as needed to reach ``--rows``, with ~1% malformed rows),
+then imports it twice into a throwaway slot store: once cold, once again
+to measure the de-duplication path.
+
+    python benchmarks/roster_import_bench.py --rows 1000000
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from toolkit.roster_import import import_roster  # noqa: E402
+from toolkit.slot_store import SlotStore  # noqa: E402
+
+SPECIALIZATIONS = [
+    "general_dentist", "cosmetic_dentist", "prosthodontist", "pediatric_dentist",
+    "emergency_dentist", "oral_surgeon", "orthodontist",
+]
+TIMES = [f"{h:02d}:{m:02d}" for h in range(8, 18) for m in (0, 30)]
+
+
+def synthetic_roster(rows: int, doctors: int) -> pd.DataFrame:
+    days = -(-rows // (doctors * len(TIMES)))
+    dates = pd.date_range("2026-01-05", periods=days).strftime("%d-%m-%Y")
+    grid = pd.MultiIndex.from_product(
+        [dates, TIMES, [f"doctor {i:04d}" for i in range(doctors)]], names=["d", "t", "doctor_name"]
+    ).to_frame(index=False).head(rows)
+    rng = np.random.default_rng(0)
+    grid["date_slot"] = grid["d"] + " " + grid["t"]
+    grid["specialization"] = [SPECIALIZATIONS[int(name[-4:]) % len(SPECIALIZATIONS)] for name in grid["doctor_name"]]
+    grid["is_available"] = "True"
+    grid["patient_to_attend"] = ""
+    broken = rng.random(len(grid)) < 0.01
+    grid.loc[broken, "date_slot"] = "31-02-2026 25:00"
+    return grid[["date_slot", "specialization", "doctor_name", "is_available", "patient_to_attend"]]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--doctors", type=int, default=500)
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        roster_path = os.path.join(tmp, "roster.csv")
+        synthetic_roster(args.rows, args.doctors).to_csv(roster_path, index=False)
+        store = SlotStore(directory=os.path.join(tmp, "slots"), seed_path=os.path.join(tmp, "missing.csv"))
+
+        for label in ("cold import", "re-import (all duplicates)"):
+            stats = import_roster(
+                roster_path, store=store, chunksize=args.chunksize, allow_new_specializations=True
+            )
+            rate = stats["read"] / stats["seconds"] if stats["seconds"] else float("inf")
+            print(f"{label}: {stats['read']:,} rows in {stats['seconds']:.2f}s ({rate:,.0f} rows/s), "
+                  f"{stats['inserted']:,} inserted, {stats['rejected']:,} rejected\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Prompt-token cost of the tool schemas sent on every ReAct step.
+
+``create_react_agent`` binds the specialist's tools to the model, so each
+LLM call of the information and booking agents carries these JSON schemas.
+Reports tokens per tool and per agent, and the cost of a typical turn.
+
+    python benchmarks/tool_schema_tokens.py
+    python benchmarks/tool_schema_tokens.py --budget 400
+
+Uses tiktoken's o200k_base (gpt-4o) encoding when it is available locally,
+otherwise estimates 4 characters per token.
+"""
+
+import argparse
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from langchain_core.utils.function_calling import convert_to_openai_tool  # noqa: E402
+
+from toolkit.toolkits import (  # noqa: E402
+    cancel_appointment,
+    check_availability_by_doctor,
+    check_availability_by_specialization,
+    reschedule_appointment,
+    set_appointment,
+)
+
+AGENTS = {
+    "information_node": [check_availability_by_doctor, check_availability_by_specialization],
+    "booking_node": [set_appointment, cancel_appointment, reschedule_appointment],
+}
+
+
+def token_counter():
+    try:
+        import tiktoken
+
+        encoding = tiktoken.get_encoding("o200k_base")
+        return "o200k_base", lambda text: len(encoding.encode(text))
+    except Exception:
+        return "chars/4 estimate", lambda text: (len(text) + 3) // 4
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--steps", type=int, default=3, help="LLM calls per specialist turn (ReAct steps)")
+    parser.add_argument("--budget", type=int, default=None, help="fail if any agent's tools exceed this many tokens")
+    args = parser.parse_args()
+
+    encoding, count = token_counter()
+    print(f"token counter: {encoding}\n")
+
+    failed = False
+    for agent, tools in AGENTS.items():
+        total = 0
+        print(f"{agent}:")
+        for tool in tools:
+            tokens = count(json.dumps(convert_to_openai_tool(tool)))
+            total += tokens
+            print(f"  {tokens:6d}  {tool.name}")
+        print(f"  {total:6d}  total per LLM call, ~{total * args.steps} per {args.steps}-step turn\n")
+        if args.budget is not None and total > args.budget:
+            print(f"FAIL: {agent} tool schemas use {total} tokens (budget {args.budget})\n")
+            failed = True
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
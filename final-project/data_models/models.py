@@ -1,9 +1,12 @@
 import re
+from typing import List, Optional
 from pydantic import BaseModel, Field, field_validator
 
 
 class DateTimeModel(BaseModel):
-    date:str=Field(description="Properly formatted date", pattern=r'^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$')
+    # format is enforced by the validator; the schema only describes it, since
+    # a regex pattern costs prompt tokens on every tool-bound LLM call
+    date:str=Field(description="DD-MM-YYYY HH:MM")
     
     @field_validator("date")
     def check_format_date(cls, v):
@@ -12,7 +15,7 @@ class DateTimeModel(BaseModel):
         return v
     
 class DateModel(BaseModel):
-    date: str = Field(description="Properly formatted date", pattern=r'^\d{2}-\d{2}-\d{4}$')
+    date: str = Field(description="DD-MM-YYYY")
     @field_validator("date")
     def check_format_date(cls, v):
         if not re.match(r'^\d{2}-\d{2}-\d{4}$', v):  # Ensures DD-MM-YYYY format
@@ -25,4 +28,28 @@ class IdentificationNumberModel(BaseModel):
     def check_format_id(cls, v):
         if not re.match(r'^\d{7,8}$', str(v)):  # Convert to string before matching
             raise ValueError("The ID number should be a 7 or 8-digit number")
-        return v
\ No newline at end of file
+        return v
+
+# -----------------------------------------------------------------------------
+# REST API schemas (structured clients that bypass the LLM)
+# -----------------------------------------------------------------------------
+
+class SlotOut(BaseModel):
+    date_slot: str
+    specialization: str
+    doctor_name: str
+    is_available: bool
+    patient_to_attend: Optional[int] = None
+
+
+class SlotPage(BaseModel):
+    items: List[SlotOut]
+    total: int
+    offset: int
+    limit: int
+
+
+class AppointmentRequest(BaseModel):
+    date_slot: str = Field(description="Slot to book, 'DD-MM-YYYY HH:MM'", pattern=r'^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$')
+    doctor_name: str
+    id_number: int = Field(description="Identification number (7 or 8 digits long)", ge=1000000, le=99999999)
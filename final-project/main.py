@@ -1,15 +1,48 @@
-from fastapi import FastAPI
+import json
+import queue
+import threading
+from contextlib import ExitStack, asynccontextmanager
+from fastapi import FastAPI, Header, HTTPException, Path, Query, Response
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from agent import DoctorAppointmentAgent
-from langchain_core.messages import HumanMessage
+from data_models.models import AppointmentRequest, SlotOut, SlotPage
+from toolkit.slot_store import AppointmentNotFound, PatientConflict, SlotUnavailable, get_slot_store
+from utils.admission import AdmissionController, Overloaded
+from utils.capture import capture_turn
+from utils.checkpoint import thread_turn
+from utils.profiling import profile_request
+from utils.llms import add_response_listener, registry
+from utils import memory
+from utils.warmup import Readiness, warm_up
 import os
-import uuid
-import streamlit as st
 
 os.environ.pop("SSL_CERT_FILE", None)
 
 
-app = FastAPI()
+readiness = Readiness()
+agent = None  # DoctorAppointmentAgent, set once warm‑up has compiled it
+
+def _warm_up():
+    global agent
+    # langgraph/langchain are imported here rather than at module import so
+    # uvicorn binds (and /ready answers) as soon as possible
+    from agent import DoctorAppointmentAgent
+
+    agent = warm_up(DoctorAppointmentAgent, readiness)
+    if memory.MEMORY_DIAGNOSTICS:
+        memory.reset_baseline()  # report growth from traffic, not from startup
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if memory.MEMORY_DIAGNOSTICS:
+        memory.start()
+    # warm up off the event loop so /ready can answer 503 meanwhile
+    threading.Thread(target=_warm_up, name="warm-up", daemon=True).start()
+    yield
+    get_slot_store().stop_watcher()
+    registry.close()
+
+app = FastAPI(lifespan=lifespan)
 
 # Define Pydantic model to accept request body
 class UserQuery(BaseModel):
@@ -17,16 +50,22 @@ class UserQuery(BaseModel):
     messages: str
     thread_id : str
 
-agent = DoctorAppointmentAgent()
+# cap in-flight graph runs; the limit adapts to LLM latency and 429s
+admission = AdmissionController()
+add_response_listener(admission.observe)
 
-@app.post("/execute")
-def execute_agent(user_input: UserQuery):
-    
-    # Prepare agent state as expected by the workflow
-    input = [HumanMessage(content=user_input.messages)]
+@app.get("/ready")
+def ready():
+    snapshot = readiness.snapshot()
+    return JSONResponse(snapshot, status_code=200 if snapshot["ready"] else 503)
+
+def _initial_state(user_input: UserQuery) -> dict:
+    # imported per call (cached after the first) to keep langchain out of module import
+    from langchain_core.messages import HumanMessage
 
-    state = {
-        "messages": input,
+    # Prepare agent state as expected by the workflow
+    return {
+        "messages": [HumanMessage(content=user_input.messages)],
         "id_number": user_input.id_number,
         "next": "",
         "query": "",
@@ -34,7 +73,142 @@ def execute_agent(user_input: UserQuery):
         "follow_up_needed": False
     }
 
+def _overloaded(e: Overloaded) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+@app.post("/execute")
+def execute_agent(user_input: UserQuery, response: Response, x_profile: str | None = Header(None)):
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Service is warming up", headers={"Retry-After": "5"})
+
+    state = _initial_state(user_input)
+    thread_id = str(user_input.thread_id)
+
+    try:
+        with admission.admit(), thread_turn(thread_id):
+            # opt-in: cProfile of the graph run (X-Profile header / PROFILE_SAMPLE_RATE)
+            # and anonymised traffic capture for benchmarks/replay.py (CAPTURE_PATH)
+            with profile_request(x_profile, label=f"thread={thread_id}") as profile, \
+                    capture_turn(thread_id, user_input.id_number, user_input.messages) as recorder:
+                result = agent.invoke(
+                    state=state, thread_id=thread_id, callbacks=[recorder] if recorder else None
+                )
+                if recorder:
+                    recorder.reply = result["messages"][-1].content
+    except Overloaded as e:
+        raise _overloaded(e)
+    if profile is not None:
+        response.headers["X-Profile-Summary"] = profile.header()
+    return {"messages": result["messages"]}
+
+@app.post("/execute/stream")
+def execute_agent_stream(user_input: UserQuery):
+    """The /execute turn as NDJSON events, one per line, while it runs:
+    ``route`` when the supervisor hands off, ``token`` for each chunk of the
+    specialist's reply, then ``done`` with the final reply (or ``error``)."""
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Service is warming up", headers={"Retry-After": "5"})
+
+    state = _initial_state(user_input)
     thread_id = str(user_input.thread_id)
 
-    response = agent.invoke(state=state,thread_id=thread_id)
-    return {"messages": response["messages"]}
\ No newline at end of file
+    # admitted before the response starts so overload is still a plain 429;
+    # the run owns the slot and the thread's turn lock from here on and
+    # releases them when it ends, even if the client has gone away
+    turn = ExitStack()
+    try:
+        turn.enter_context(admission.admit())
+    except Overloaded as e:
+        raise _overloaded(e)
+    turn.enter_context(thread_turn(thread_id))
+    events: queue.Queue = queue.Queue()
+
+    def run():
+        try:
+            with turn, capture_turn(thread_id, user_input.id_number, user_input.messages) as recorder:
+                for event in agent.stream(state, thread_id=thread_id, callbacks=[recorder] if recorder else None):
+                    if event["event"] == "done" and recorder:
+                        recorder.reply = event["content"]
+                    events.put(event)
+        except Exception as e:
+            print(f"❌ Streamed turn failed: {e}")
+            events.put({"event": "error", "detail": str(e)})
+        finally:
+            events.put(None)
+
+    # the graph runs on its own thread: LangGraph keeps context across steps,
+    # which Starlette's per-chunk threadpool hops would not preserve
+    threading.Thread(target=run, name=f"stream-{thread_id}", daemon=True).start()
+
+    def body():
+        while (event := events.get()) is not None:
+            yield json.dumps(event) + "\n"
+
+    return StreamingResponse(body(), media_type="application/x-ndjson")
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    return admission.prometheus()
+
+@app.get("/debug/memory")
+def debug_memory(top: int = Query(20, ge=1, le=500), reset: bool = False):
+    """RSS, tracemalloc growth since startup (or the last reset), checkpoint
+    bytes per thread / per checkpoint, and live message bytes per type."""
+    if not memory.MEMORY_DIAGNOSTICS:
+        raise HTTPException(status_code=404, detail="Set MEMORY_DIAGNOSTICS=true to enable")
+    report = memory.memory_report(agent.memory if agent is not None else None, top=top)
+    if reset:
+        memory.reset_baseline()
+    return report
+
+
+# -----------------------------------------------------------------------------
+# Direct data endpoints: no LLM, no admission queue
+# -----------------------------------------------------------------------------
+
+def _page(slots, offset: int, limit: int) -> SlotPage:
+    return SlotPage(
+        items=[SlotOut(**vars(slot)) for slot in slots[offset:offset + limit]],
+        total=len(slots),
+        offset=offset,
+        limit=limit,
+    )
+
+@app.get("/availability", response_model=SlotPage)
+def availability(
+    date: str = Query(pattern=r'^\d{2}-\d{2}-\d{4}$', description="DD-MM-YYYY"),
+    doctor_name: str | None = None,
+    specialization: str | None = None,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    slots = get_slot_store().available_slots(date, doctor_name=doctor_name, specialization=specialization)
+    return _page(slots, offset, limit)
+
+@app.get("/patients/{id_number}/appointments", response_model=SlotPage)
+def patient_appointments(
+    id_number: int,
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+):
+    return _page(get_slot_store().patient_appointments(id_number), offset, limit)
+
+@app.post("/appointments", response_model=SlotOut, status_code=201)
+def book_appointment(request: AppointmentRequest):
+    try:
+        slot = get_slot_store().book(request.date_slot, request.doctor_name, request.id_number)
+    except (SlotUnavailable, PatientConflict) as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    return SlotOut(**vars(slot))
+
+@app.delete("/appointments/{doctor_name}/{date_slot}", response_model=SlotOut)
+def cancel_appointment(
+    doctor_name: str,
+    date_slot: str = Path(pattern=r'^\d{2}-\d{2}-\d{4} \d{2}:\d{2}$', description="DD-MM-YYYY HH:MM"),
+    id_number: int = Query(ge=1000000, le=99999999),
+):
+    try:
+        slot = get_slot_store().cancel(date_slot, doctor_name, id_number)
+    except AppointmentNotFound as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    return SlotOut(**vars(slot))
@@ -1,33 +1,43 @@
 from datetime import datetime
+from functools import lru_cache
 
 members_dict = {'information_node':'specialized agent to provide information related to availability of doctors or any FAQs related to hospital.','booking_node':'specialized agent to only to book, cancel or reschedule appointment'}
 
 options = list(members_dict.keys()) + ["FINISH"]
 
 worker_info = '\n\n'.join([f'WORKER: {member} \nDESCRIPTION: {description}' for member, description in members_dict.items()]) + '\n\nWORKER: FINISH \nDESCRIPTION: If User Query is answered and route to Finished'
-datetime_now = datetime.now().strftime("%B %d, %Y at %I:%M %p")
 
-system_prompt = (
-    """You are a supervisor agent that manages and routes user queries to the appropriate specialized assistant.\n\n"
+@lru_cache(maxsize=2)
+def _build_system_prompt(datetime_now: str) -> str:
+    return (
+        "You are a supervisor agent that manages and routes user queries to the appropriate specialized assistant.\n\n"
 
-    "**Available Assistants:**\n"
-    f"{worker_info}\n\n"
+        "**Available Assistants:**\n"
+        f"{worker_info}\n\n"
 
-    f"Current date and time: {datetime_now}\n\n"
+        f"Current date and time: {datetime_now}\n\n"
 
-    "**Your Objective:**\n"
-    Help users efficiently manage doctor appointments or retrieve information by choosing the correct assistant based on their intent. Use conversation context and assistant responses to decide if the query is resolved or needs follow-up.\n\n"
+        "**Your Objective:**\n"
+        "Help users efficiently manage doctor appointments or retrieve information by choosing the correct assistant based on their intent. Use conversation context and assistant responses to decide if the query is resolved or needs follow-up.\n\n"
 
-    "**Routing Rules:**\n"
-    - Route to `information_node` if the query is about doctor availability, schedule, working hours, or general hospital info.\n"
-    - Route to `booking_node` for booking, canceling, or rescheduling appointments.\n"
-    - Respond with `FINISH` if the query is fully answered, or if the user has nothing more to ask.\n\n"
+        "**Routing Rules:**\n"
+        "- Route to `information_node` if the query is about doctor availability, schedule, working hours, or general hospital info.\n"
+        "- Route to `booking_node` for booking, canceling, or rescheduling appointments.\n"
+        "- Respond with `FINISH` if the query is fully answered, or if the user has nothing more to ask.\n\n"
 
-    "**Completion Guidelines (FINISH):**\n"
-    1. The user’s question has been clearly and fully answered.\n"
-    2. Booking/cancellation fails and the user provides no alternative or follow-up.\n"
-    3. Availability info is provided, and the user does not ask a follow-up.\n"
-    4. Appointment changes succeed/fail and the user does not ask more.\n"
-    5. More than 10 turns or circular conversation → FINISH immediately.\n"
-    6. Always prioritize user satisfaction based on full context.\n"""
-)
+        "**Completion Guidelines (FINISH):**\n"
+        "1. The user’s question has been clearly and fully answered.\n"
+        "2. Booking/cancellation fails and the user provides no alternative or follow-up.\n"
+        "3. Availability info is provided, and the user does not ask a follow-up.\n"
+        "4. Appointment changes succeed/fail and the user does not ask more.\n"
+        "5. More than 10 turns or circular conversation → FINISH immediately.\n"
+        "6. Always prioritize user satisfaction based on full context.\n"
+    )
+
+def get_system_prompt() -> str:
+    """Supervisor prompt with the current date and time.
+
+    Built per request so the date never goes stale in a long‑running
+    process; the rendered prompt is reused for the rest of the minute.
+    """
+    return _build_system_prompt(datetime.now().strftime("%B %d, %Y at %I:%M %p"))
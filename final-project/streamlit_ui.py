@@ -1,9 +1,122 @@
 import streamlit as st
 import requests
+import json
 import uuid
+from requests.adapters import HTTPAdapter
 
 # API Configuration
 API_URL = "http://127.0.0.1:8003/execute"
+STREAM_URL = f"{API_URL}/stream"
+
+# shown while the supervisor hands the turn to a specialist
+NODE_STATUS = {
+    "information_node": "Checking availability...",
+    "booking_node": "Working on your booking...",
+}
+
+
+@st.cache_resource
+def get_session() -> requests.Session:
+    """One pooled HTTP session per Streamlit server, shared by every rerun and
+    browser tab, so messages reuse a kept-alive connection instead of opening
+    a new one each time."""
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.verify = False
+    return session
+
+
+def stream_reply(response: requests.Response, status, reply: dict):
+    """Yield the reply text from an /execute/stream NDJSON body as it arrives.
+
+    ``reply["content"]`` is set from the final ``done`` event.
+    """
+    for line in response.iter_lines():
+        if not line:
+            continue
+        event = json.loads(line)
+        if event["event"] == "route":
+            status.caption(NODE_STATUS.get(event["next"], "Processing your request..."))
+        elif event["event"] == "token":
+            status.empty()
+            yield event["text"]
+        elif event["event"] == "done":
+            reply["content"] = event["content"]
+        elif event["event"] == "error":
+            raise RuntimeError(event["detail"])
+    status.empty()
+
+
+def send(prompt: str):
+    """Send one user message and render the assistant reply as it streams in."""
+    # Add user message to chat history
+    st.session_state.messages.append({"role": "user", "content": prompt})
+    with st.chat_message("user"):
+        st.markdown(prompt)
+
+    # Get assistant response
+    with st.chat_message("assistant"):
+        status = st.empty()
+        status.caption("Processing your request...")
+        placeholder = st.empty()
+        try:
+            with get_session().post(
+                STREAM_URL,
+                json={
+                    'messages': prompt,
+                    'id_number': int(st.session_state.user_id),
+                    'thread_id': st.session_state.thread_id
+                },
+                stream=True,
+                timeout=30
+            ) as response:
+                if response.status_code == 200:
+                    reply = {}
+                    with placeholder.container():
+                        streamed = st.write_stream(stream_reply(response, status, reply))
+                    content = reply.get("content") or streamed or "No assistant response found."
+                    if content != streamed:
+                        # e.g. a follow-up question: the final message is not what was streamed
+                        placeholder.markdown(content)
+                    st.session_state.messages.append({
+                        "role": "assistant",
+                        "content": content
+                    })
+                else:
+                    error_msg = f"❌ Error {response.status_code}: Could not process the request."
+                    status.empty()
+                    st.error(error_msg)
+                    st.session_state.messages.append({
+                        "role": "assistant",
+                        "content": error_msg
+                    })
+
+        except requests.exceptions.Timeout:
+            error_msg = "⏰ Request timed out. Please try again."
+            status.empty()
+            st.error(error_msg)
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": error_msg
+            })
+
+        except Exception as e:
+            error_msg = f"❌ An error occurred: {str(e)}"
+            status.empty()
+            st.error(error_msg)
+            st.session_state.messages.append({
+                "role": "assistant",
+                "content": error_msg
+            })
+
+
+def queue_prompt(prompt: str):
+    # button callbacks run before the rerun, so the quick action is sent in
+    # the same run, in order after the chat history
+    st.session_state.pending_prompt = prompt
+
 
 # Page configuration
 st.set_page_config(page_title="Doctor Appointment Assistant", page_icon="🩺")
@@ -43,72 +156,14 @@ for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
 
-# Chat input
-if prompt := st.chat_input("Ask about appointments, availability, or healthcare services..."):
+# Chat input (or a quick action queued by a button callback)
+prompt = st.chat_input("Ask about appointments, availability, or healthcare services...")
+prompt = prompt or st.session_state.pop("pending_prompt", None)
+if prompt:
     if not st.session_state.user_id:
         st.error("⚠️ Please enter your ID number in the sidebar first.")
         st.stop()
-    
-    # Add user message to chat history
-    st.session_state.messages.append({"role": "user", "content": prompt})
-    with st.chat_message("user"):
-        st.markdown(prompt)
-    
-    # Get assistant response
-    with st.chat_message("assistant"):
-        with st.spinner("Processing your request..."):
-            try:
-                response = requests.post(
-                    API_URL, 
-                    json={
-                        'messages': prompt, 
-                        'id_number': int(st.session_state.user_id),
-                        'thread_id': st.session_state.thread_id
-                    },
-                    verify=False,
-                    timeout=30
-                )
-                
-                if response.status_code == 200:
-                    messages = response.json().get("messages", [])
-                    
-                    if messages:
-                        # Get the last AI message with type 'ai'
-                        last_ai_msg = next((msg for msg in reversed(messages) if msg["type"] == "ai"), None)
-                        content = last_ai_msg["content"] if last_ai_msg else "No assistant response found."
-
-                        st.markdown(content)
-
-                        st.session_state.messages.append({
-                            "role": "assistant", 
-                            "content": content
-                        })
-                    else:
-                        st.error("No messages returned from the agent.")
-                    
-                else:
-                    error_msg = f"❌ Error {response.status_code}: Could not process the request."
-                    st.error(error_msg)
-                    st.session_state.messages.append({
-                        "role": "assistant", 
-                        "content": error_msg
-                    })
-                    
-            except requests.exceptions.Timeout:
-                error_msg = "⏰ Request timed out. Please try again."
-                st.error(error_msg)
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": error_msg
-                })
-                
-            except Exception as e:
-                error_msg = f"❌ An error occurred: {str(e)}"
-                st.error(error_msg)
-                st.session_state.messages.append({
-                    "role": "assistant", 
-                    "content": error_msg
-                })
+    send(prompt)
 
 # Quick action buttons
 if st.session_state.user_id:
@@ -118,22 +173,13 @@ if st.session_state.user_id:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        if st.button("📅 Check Availability"):
-            quick_query = "What appointments are available today?"
-            st.session_state.messages.append({"role": "user", "content": quick_query})
-            st.rerun()
+        st.button("📅 Check Availability", on_click=queue_prompt, args=("What appointments are available today?",))
     
     with col2:
-        if st.button("🦷 Find Dentist"):
-            quick_query = "I need to book a dentist appointment"
-            st.session_state.messages.append({"role": "user", "content": quick_query})
-            st.rerun()
+        st.button("🦷 Find Dentist", on_click=queue_prompt, args=("I need to book a dentist appointment",))
     
     with col3:
-        if st.button("👨‍⚕️ General Doctor"):
-            quick_query = "I need to see a general practitioner"
-            st.session_state.messages.append({"role": "user", "content": quick_query})
-            st.rerun()
+        st.button("👨‍⚕️ General Doctor", on_click=queue_prompt, args=("I need to see a general practitioner",))
 
 # Footer
 st.markdown("---")
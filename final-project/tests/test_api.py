@@ -0,0 +1,32 @@
+import pytest
+from fastapi.testclient import TestClient
+
+import main
+from toolkit.slot_store import SlotStore
+
+SEED = """date_slot,specialization,doctor_name,is_available,patient_to_attend
+05-08-2025 08:00,general_dentist,john doe,False,1000082.0
+"""
+
+
+@pytest.fixture
+def client(tmp_path, monkeypatch):
+    seed = tmp_path / "doctor_availability.csv"
+    seed.write_text(SEED)
+    store = SlotStore(str(tmp_path / "slots"), str(seed))
+    monkeypatch.setattr(main, "get_slot_store", lambda: store)
+    return TestClient(main.app)
+
+
+@pytest.mark.parametrize("date_slot, id_number", [("foo", 1000082), ("5-8-2025 8:00", 1000082), ("05-08-2025 08:00", 12)])
+def test_cancel_rejects_malformed_input(client, date_slot, id_number):
+    response = client.delete(f"/appointments/john doe/{date_slot}", params={"id_number": id_number})
+
+    assert response.status_code == 422
+
+
+def test_cancel_frees_the_slot(client):
+    response = client.delete("/appointments/john doe/05-08-2025 08:00", params={"id_number": 1000082})
+
+    assert response.status_code == 200
+    assert response.json()["is_available"] is True
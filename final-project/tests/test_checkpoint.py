@@ -0,0 +1,86 @@
+import multiprocessing
+import threading
+import time
+from typing import TypedDict
+
+import pytest
+
+from utils import checkpoint
+
+TURNS = 5
+
+
+class Counter(TypedDict):
+    count: int
+
+
+def counting_graph():
+    from langgraph.graph import END, START, StateGraph
+
+    def increment(state: Counter) -> Counter:
+        count = state.get("count", 0)
+        time.sleep(0.02)  # widen the window in which an unserialised turn would overlap
+        return {"count": count + 1}
+
+    graph = StateGraph(Counter)
+    graph.add_node("increment", increment)
+    graph.add_edge(START, "increment")
+    graph.add_edge("increment", END)
+    return graph.compile(checkpointer=checkpoint.make_checkpointer())
+
+
+def run_turns(thread_id: str) -> None:
+    # each worker process opens its own connection, as a uvicorn worker does
+    graph = counting_graph()
+    config = {"configurable": {"thread_id": thread_id}}
+    for _ in range(TURNS):
+        with checkpoint.thread_turn(thread_id):
+            count = graph.get_state(config).values.get("count", 0)
+            graph.invoke({"count": count}, config)
+
+
+@pytest.fixture
+def checkpoint_db(tmp_path, monkeypatch):
+    path = str(tmp_path / "checkpoints.sqlite")
+    monkeypatch.setattr(checkpoint, "CHECKPOINT_DB", path)
+    return path
+
+
+def test_sqlite_checkpointer_uses_wal(checkpoint_db):
+    saver = checkpoint.make_checkpointer()
+
+    assert saver.conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+
+def test_turns_of_one_thread_are_serialised_across_threads(checkpoint_db):
+    active, overlaps = [], []
+
+    def turn():
+        with checkpoint.thread_turn("patient-1"):
+            active.append(1)
+            overlaps.append(len(active) > 1)
+            time.sleep(0.01)
+            active.pop()
+
+    threads = [threading.Thread(target=turn) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert overlaps == [False] * 8
+
+
+@pytest.mark.skipif(checkpoint.fcntl is None, reason="cross-process locking needs fcntl")
+def test_turns_of_one_thread_are_serialised_across_processes(checkpoint_db):
+    counting_graph()  # create the schema before the workers race to
+    context = multiprocessing.get_context("fork")
+    workers = [context.Process(target=run_turns, args=("patient-1",)) for _ in range(2)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join(timeout=60)
+        assert worker.exitcode == 0
+
+    state = counting_graph().get_state({"configurable": {"thread_id": "patient-1"}})
+    assert state.values["count"] == 2 * TURNS
@@ -0,0 +1,89 @@
+import pandas as pd
+
+from toolkit.roster_import import import_roster
+from toolkit.slot_store import SlotStore
+
+SEED = """date_slot,specialization,doctor_name,is_available,patient_to_attend
+05-08-2025 08:00,general_dentist,john doe,False,1000082.0
+05-08-2025 08:30,general_dentist,john doe,True,
+"""
+
+
+def make_store(tmp_path) -> SlotStore:
+    seed = tmp_path / "doctor_availability.csv"
+    seed.write_text(SEED)
+    return SlotStore(str(tmp_path / "slots"), str(seed))
+
+
+def test_rejects_dates_that_are_not_zero_padded(tmp_path):
+    store = make_store(tmp_path)
+    roster = tmp_path / "roster.csv"
+    roster.write_text(
+        "date_slot,specialization,doctor_name\n"
+        "5-8-2025 8:00,general_dentist,jane roe\n"
+        "06-08-2025 08:00,general_dentist,jane roe\n"
+    )
+
+    stats = import_roster(str(roster), store)
+
+    assert (stats["inserted"], stats["rejected"]) == (1, 1)
+    assert store.dates() == ["05-08-2025", "06-08-2025"]
+
+
+def test_rejects_patient_double_bookings(tmp_path):
+    store = make_store(tmp_path)
+    roster = tmp_path / "roster.csv"
+    rejects = tmp_path / "rejects.csv"
+    roster.write_text(
+        "date_slot,specialization,doctor_name,is_available,patient_to_attend\n"
+        "05-08-2025 08:00,general_dentist,jane roe,False,1000082\n"
+        "06-08-2025 09:00,general_dentist,jane roe,False,1000099\n"
+        "06-08-2025 09:00,general_dentist,emily johnson,False,1000099\n"
+    )
+
+    stats = import_roster(str(roster), store, rejects_path=str(rejects))
+
+    assert (stats["inserted"], stats["rejected"]) == (1, 2)
+    assert [s.doctor_name for s in store.patient_appointments(1000082)] == ["john doe"]
+    assert [s.doctor_name for s in store.patient_appointments(1000099)] == ["jane roe"]
+    reasons = pd.read_csv(rejects)
+    assert set(reasons["reason"]) == {"patient already booked at that time"}
+    assert sorted(reasons["doctor_name"]) == ["emily johnson", "jane roe"]
+
+
+def test_rejects_free_slots_with_a_patient_and_bad_patient_ids(tmp_path):
+    store = make_store(tmp_path)
+    roster = tmp_path / "roster.csv"
+    rejects = tmp_path / "rejects.csv"
+    roster.write_text(
+        "date_slot,specialization,doctor_name,is_available,patient_to_attend\n"
+        "06-08-2025 09:00,general_dentist,jane roe,True,1000099\n"
+        "06-08-2025 09:30,general_dentist,jane roe,False,12345\n"
+        "06-08-2025 10:00,general_dentist,jane roe,False,1000099\n"
+    )
+
+    stats = import_roster(str(roster), store, rejects_path=str(rejects))
+
+    assert (stats["inserted"], stats["rejected"]) == (1, 2)
+    assert set(pd.read_csv(rejects)["reason"]) == {
+        "available slot with patient_to_attend", "patient_to_attend is not a 7-8 digit id"
+    }
+    assert [s.date_slot for s in store.patient_appointments(1000099)] == ["06-08-2025 10:00"]
+
+
+def test_rejects_rows_on_archived_days(tmp_path):
+    store = make_store(tmp_path)
+    store.archive_before("06-08-2025")
+    roster = tmp_path / "roster.csv"
+    rejects = tmp_path / "rejects.csv"
+    roster.write_text(
+        "date_slot,specialization,doctor_name\n"
+        "05-08-2025 09:00,general_dentist,john doe\n"
+        "06-08-2025 09:00,general_dentist,john doe\n"
+    )
+
+    stats = import_roster(str(roster), store, rejects_path=str(rejects))
+
+    assert (stats["inserted"], stats["rejected"]) == (1, 1)
+    assert list(pd.read_csv(rejects)["reason"]) == ["day is archived"]
+    assert store.dates() == ["06-08-2025"]
@@ -0,0 +1,119 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from toolkit.slot_store import DayArchived, Slot, SlotStore
+
+SEED = """date_slot,specialization,doctor_name,is_available,patient_to_attend
+05-08-2025 08:00,general_dentist,john doe,True,
+05-08-2025 08:30,general_dentist,john doe,False,1000082.0
+06-08-2025 08:00,general_dentist,john doe,True,
+07-08-2025 08:00,general_dentist,john doe,True,
+"""
+
+
+def make_store(tmp_path) -> SlotStore:
+    seed = tmp_path / "doctor_availability.csv"
+    if not seed.exists():
+        seed.write_text(SEED)
+    return SlotStore(str(tmp_path / "slots"), str(seed))
+
+
+def test_reload_after_archiving_every_day_does_not_reseed(tmp_path):
+    store = make_store(tmp_path)
+    store.book("05-08-2025 08:00", "john doe", 1000099)
+    assert len(store.apply_retention(7, today=datetime(2026, 1, 1))) == 3
+
+    reloaded = make_store(tmp_path)
+
+    assert reloaded.dates() == []
+    assert reloaded.available_slots("05-08-2025") == []
+    archived = {s.date_slot: s for s in reloaded.read_archived("05-08-2025")}
+    assert archived["05-08-2025 08:00"].patient_to_attend == 1000099
+    assert reloaded.doctors == {"john doe": "general_dentist"}
+
+
+def test_reload_after_partial_retention_keeps_hot_days(tmp_path):
+    store = make_store(tmp_path)
+    store.book("07-08-2025 08:00", "john doe", 1000099)
+    assert store.apply_retention(0, today=datetime(2025, 8, 7)) == ["05-08-2025", "06-08-2025"]
+
+    reloaded = make_store(tmp_path)
+
+    assert reloaded.dates() == ["07-08-2025"]
+    assert [s.date_slot for s in reloaded.patient_appointments(1000099)] == ["07-08-2025 08:00"]
+    assert reloaded.available_slots("07-08-2025") == []
+
+
+def test_first_load_seeds_the_store(tmp_path):
+    store = make_store(tmp_path)
+
+    assert store.dates() == ["05-08-2025", "06-08-2025", "07-08-2025"]
+    assert [s.date_slot for s in store.patient_appointments(1000082)] == ["05-08-2025 08:30"]
+
+
+def test_patient_appointments_loads_only_the_patients_days(tmp_path):
+    store = make_store(tmp_path)
+    store.book("07-08-2025 08:00", "john doe", 1000082)
+    reloaded = make_store(tmp_path)
+
+    slots = reloaded.patient_appointments(1000082)
+
+    assert [s.date_slot for s in slots] == ["05-08-2025 08:30", "07-08-2025 08:00"]
+    assert sorted(reloaded._partitions) == ["05-08-2025", "07-08-2025"]
+    assert reloaded.patient_appointments(1000099) == []
+    assert "06-08-2025" not in reloaded._partitions
+
+
+def test_patient_appointments_sees_bookings_from_another_process(tmp_path):
+    store = make_store(tmp_path)
+    assert store.patient_appointments(1000099) == []
+
+    make_store(tmp_path).book("06-08-2025 08:00", "john doe", 1000099)
+
+    assert [s.date_slot for s in store.patient_appointments(1000099)] == ["06-08-2025 08:00"]
+
+
+def test_seed_edits_do_not_overwrite_bookings(tmp_path, capsys):
+    store = make_store(tmp_path)
+    store.book("06-08-2025 08:00", "john doe", 1000099)
+    seed = tmp_path / "doctor_availability.csv"
+    booked = "07-08-2025 08:00,general_dentist,john doe,False,1000100.0"
+    seed.write_text(
+        SEED.replace("06-08-2025 08:00,general_dentist", "06-08-2025 08:00,cosmetic_dentist")
+        .replace("07-08-2025 08:00,general_dentist,john doe,True,", booked)
+    )
+
+    assert store.poll() == ["07-08-2025"]
+
+    assert "conflicts with the booking of patient 1000099" in capsys.readouterr().out
+    assert [s.date_slot for s in store.patient_appointments(1000099)] == ["06-08-2025 08:00"]
+    assert [s.date_slot for s in store.patient_appointments(1000100)] == ["07-08-2025 08:00"]
+
+
+def test_seed_edits_are_applied_by_one_process(tmp_path):
+    store, other = make_store(tmp_path), make_store(tmp_path)
+    seed = tmp_path / "doctor_availability.csv"
+    seed.write_text(SEED + "08-08-2025 08:00,general_dentist,john doe,True,\n")
+
+    assert store.poll() == ["08-08-2025"]
+    assert other._reload_seed() == []  # already applied by the first process
+
+    assert [s.date_slot for s in other.available_slots("08-08-2025")] == ["08-08-2025 08:00"]
+
+
+def test_archived_days_are_not_recreated(tmp_path):
+    store = make_store(tmp_path)
+    store.archive_before("06-08-2025")
+    seed = tmp_path / "doctor_availability.csv"
+    booked = "05-08-2025 08:00,general_dentist,john doe,False,1000100.0"
+    seed.write_text(SEED.replace("05-08-2025 08:00,general_dentist,john doe,True,", booked))
+
+    assert store.poll() == []
+    with pytest.raises(DayArchived):
+        store.bulk_insert([Slot("05-08-2025 09:00", "general_dentist", "john doe", True)])
+
+    assert store.dates() == ["06-08-2025", "07-08-2025"]
+    assert not os.path.exists(store._path("05-08-2025"))
+    assert [s.is_available for s in store.read_archived("05-08-2025")] == [True, False]
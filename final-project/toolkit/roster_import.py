@@ -0,0 +1,179 @@
+"""Streaming bulk import of doctor rosters into the slot store.
+
+    python -m toolkit.roster_import rosters/week_36.csv
+    python -m toolkit.roster_import big.csv --chunksize 500000 --rejects rejects.csv
+    python -m toolkit.roster_import new_clinic.csv --allow-new-specializations --dry-run
+
+The roster is read in chunks; each chunk is normalised and validated with
+vectorized pandas operations (date format and calendar validity, the
+specialization catalog, one specialization per doctor, consistency with
+the existing roster, a valid patient on booked slots only, not an
+archived day), de-duplicated, and written with one
+``SlotStore.bulk_insert`` transaction, i.e. one file write per touched day.
+Slots that already exist are kept as they are; booked slots that would
+double-book a patient are rejected.
+"""
+
+import argparse
+import time
+
+import pandas as pd
+
+from toolkit.slot_store import Slot, SlotStore, get_slot_store
+
+REQUIRED = ["date_slot", "specialization", "doctor_name"]
+DATE_SLOT_FORMAT = "%d-%m-%Y %H:%M"
+# strptime also takes '5-8-2025 8:00'; partitions are keyed by the zero-padded text
+DATE_SLOT_PATTERN = r"\d{2}-\d{2}-\d{4} \d{2}:\d{2}"
+# the 7-8 digit identification numbers AppointmentRequest accepts
+PATIENT_ID_RANGE = (1_000_000, 99_999_999)
+
+
+def _per_unique(series: pd.Series, fn) -> pd.Series:
+    """Apply ``fn`` once per distinct value (rosters repeat names and slots
+    heavily), then broadcast with a vectorized map. Missing values become ''."""
+    series = series.fillna("")
+    uniques = series.unique()
+    return series.map(dict(zip(uniques, map(fn, uniques))))
+
+
+def validate_chunk(
+    chunk: pd.DataFrame,
+    doctors: dict[str, str],
+    specializations: set[str] | None,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split a raw chunk into (valid rows, rejected rows with a ``reason``).
+
+    ``doctors`` maps known doctors to their specialization and is extended
+    in place with doctors first seen in this chunk; ``specializations`` is
+    the allowed catalog, or ``None`` to accept any.
+    """
+    df = chunk.copy()
+    df["doctor_name"] = _per_unique(df["doctor_name"], lambda v: " ".join(v.lower().split()))
+    df["specialization"] = _per_unique(df["specialization"], lambda v: "_".join(v.lower().split()))
+    df["date_slot"] = _per_unique(df["date_slot"], str.strip)
+    if "is_available" in df:
+        df["is_available"] = ~_per_unique(df["is_available"], lambda v: v.strip().lower() in ("false", "0", "no"))
+    else:
+        df["is_available"] = True
+    if "patient_to_attend" in df:
+        df["patient_to_attend"] = pd.to_numeric(df["patient_to_attend"], errors="coerce")
+    else:
+        df["patient_to_attend"] = float("nan")
+
+    reason = pd.Series("", index=df.index)
+    unique_slots = pd.Series(df["date_slot"].unique())
+    parsed_ok = unique_slots.str.fullmatch(DATE_SLOT_PATTERN) & pd.to_datetime(
+        unique_slots, format=DATE_SLOT_FORMAT, errors="coerce"
+    ).notna()
+    valid_date = df["date_slot"].map(dict(zip(unique_slots, parsed_ok)))
+    reason = reason.mask((reason == "") & ~valid_date, "date_slot is not a valid 'DD-MM-YYYY HH:MM'")
+    reason = reason.mask((reason == "") & (df["doctor_name"] == ""), "missing doctor_name")
+    if specializations is not None:
+        reason = reason.mask(
+            (reason == "") & ~df["specialization"].isin(specializations), "unknown specialization"
+        )
+    known = df["doctor_name"].map(doctors)
+    reason = reason.mask(
+        (reason == "") & known.notna() & (known != df["specialization"]),
+        "doctor already listed under another specialization",
+    )
+    per_doctor = df[reason == ""].groupby("doctor_name")["specialization"].nunique()
+    ambiguous = per_doctor.index[per_doctor > 1]
+    reason = reason.mask(
+        (reason == "") & df["doctor_name"].isin(ambiguous), "doctor listed under several specializations"
+    )
+    booked_without_patient = ~df["is_available"] & df["patient_to_attend"].isna()
+    reason = reason.mask((reason == "") & booked_without_patient, "booked slot without patient_to_attend")
+    free_with_patient = df["is_available"] & df["patient_to_attend"].notna()
+    reason = reason.mask((reason == "") & free_with_patient, "available slot with patient_to_attend")
+    bad_patient = df["patient_to_attend"].notna() & ~df["patient_to_attend"].between(*PATIENT_ID_RANGE)
+    reason = reason.mask((reason == "") & bad_patient, "patient_to_attend is not a 7-8 digit id")
+
+    valid = df[reason == ""].drop_duplicates(["date_slot", "doctor_name"])
+    rejected = chunk[reason != ""].assign(reason=reason[reason != ""])
+    for doctor, specialization in valid[["doctor_name", "specialization"]].drop_duplicates().itertuples(index=False):
+        doctors.setdefault(doctor, specialization)
+    return valid, rejected
+
+
+def to_slots(valid: pd.DataFrame) -> list[Slot]:
+    patients = valid["patient_to_attend"].tolist()
+    return [
+        Slot(date_slot, specialization, doctor, bool(available), None if patient != patient else int(patient))
+        for date_slot, specialization, doctor, available, patient in zip(
+            valid["date_slot"], valid["specialization"], valid["doctor_name"], valid["is_available"], patients
+        )
+    ]
+
+
+def import_roster(
+    path: str,
+    store: SlotStore | None = None,
+    chunksize: int = 200_000,
+    allow_new_specializations: bool = False,
+    rejects_path: str | None = None,
+    dry_run: bool = False,
+) -> dict:
+    store = store or get_slot_store()
+    doctors = dict(store.doctors)
+    specializations = None if allow_new_specializations else store.specializations()
+    archived = store.archived_days()
+    stats = {"read": 0, "valid": 0, "inserted": 0, "rejected": 0, "seconds": 0.0}
+    started = time.perf_counter()
+    wrote_header = False
+
+    for chunk in pd.read_csv(path, dtype=str, chunksize=chunksize, keep_default_na=False, na_values=[""]):
+        missing = [column for column in REQUIRED if column not in chunk]
+        if missing:
+            raise ValueError(f"{path} is missing required columns: {', '.join(missing)}")
+        valid, rejected = validate_chunk(chunk, doctors, specializations)
+        on_archived = valid["date_slot"].str[:10].isin(archived)
+        if on_archived.any():
+            rejected = pd.concat([rejected, chunk.loc[valid.index[on_archived]].assign(reason="day is archived")])
+            valid = valid[~on_archived]
+        stats["read"] += len(chunk)
+        stats["valid"] += len(valid)
+        stats["rejected"] += len(rejected)
+        if not dry_run and len(valid):
+            conflicts: list[Slot] = []
+            stats["inserted"] += store.bulk_insert(to_slots(valid), conflicts)
+            if conflicts:
+                # back to the raw rows; valid keeps the chunk's index
+                rows = pd.Series(valid.index, index=pd.MultiIndex.from_frame(valid[["date_slot", "doctor_name"]]))
+                clashing = rows.loc[[(slot.date_slot, slot.doctor_name) for slot in conflicts]]
+                rejected = pd.concat([
+                    rejected, chunk.loc[clashing].assign(reason="patient already booked at that time")
+                ])
+                stats["valid"] -= len(conflicts)
+                stats["rejected"] += len(conflicts)
+        if rejects_path and len(rejected):
+            rejected.to_csv(rejects_path, mode="a" if wrote_header else "w", header=not wrote_header, index=False)
+            wrote_header = True
+        print(f"  {stats['read']:>10,} rows read, {stats['inserted']:>10,} inserted, {stats['rejected']:>8,} rejected")
+
+    stats["seconds"] = round(time.perf_counter() - started, 3)
+    return stats
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("path", help="roster CSV with date_slot, specialization, doctor_name columns")
+    parser.add_argument("--chunksize", type=int, default=200_000)
+    parser.add_argument("--allow-new-specializations", action="store_true")
+    parser.add_argument("--rejects", help="write rejected rows with a reason column to this CSV")
+    parser.add_argument("--dry-run", action="store_true", help="validate only, write nothing")
+    args = parser.parse_args()
+
+    result = import_roster(
+        args.path,
+        chunksize=args.chunksize,
+        allow_new_specializations=args.allow_new_specializations,
+        rejects_path=args.rejects,
+        dry_run=args.dry_run,
+    )
+    print(
+        f"Imported {result['inserted']:,} new slots from {result['read']:,} rows "
+        f"({result['rejected']:,} rejected, {result['valid'] - result['inserted']:,} already present) "
+        f"in {result['seconds']}s"
+    )
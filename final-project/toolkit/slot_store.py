@@ -0,0 +1,976 @@
+import argparse
+import csv
+import difflib
+import gzip
+import os
+import shutil
+import threading
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, run a single worker
+    fcntl = None
+
+# flat file the partitions are seeded from on first start
+DATA_PATH = os.getenv("SLOT_STORE_PATH", "data/doctor_availability.csv")
+# one CSV per day: <STORE_DIR>/YYYY-MM-DD.csv, archived days in <STORE_DIR>/archive/
+STORE_DIR = os.getenv("SLOT_STORE_DIR", "data/slots")
+# days in the past kept hot; unset disables automatic archiving at startup
+RETENTION_DAYS = os.getenv("SLOT_RETENTION_DAYS")
+# seconds between checks for externally edited files; 0 disables hot reload
+RELOAD_INTERVAL = float(os.getenv("SLOT_RELOAD_INTERVAL", "2"))
+
+FIELDS = ["date_slot", "specialization", "doctor_name", "is_available", "patient_to_attend"]
+ROSTER_FILE = "roster.csv"
+# last seed contents applied to the partitions; edits are diffed against it
+SEED_SNAPSHOT_FILE = "seed.snapshot"
+# flock'ed by every writer; holds the token of the last committed mutation
+LOCK_FILE = ".lock"
+
+
+class SlotStoreError(Exception):
+    """Base class for slot store failures surfaced to tools and the API."""
+
+
+class SlotUnavailable(SlotStoreError):
+    """The requested slot does not exist or is already taken."""
+
+
+class AppointmentNotFound(SlotStoreError):
+    """No appointment matches the patient / slot / doctor given."""
+
+
+class PatientConflict(SlotStoreError):
+    """The patient already holds another slot at the same date and time."""
+
+
+class DayArchived(SlotStoreError):
+    """The day was moved to the archive and is read-only history."""
+
+
+class UnknownDoctor(SlotStoreError):
+    """The doctor name is not on the loaded roster."""
+
+
+class UnknownSpecialization(SlotStoreError):
+    """The specialization is not offered by any doctor on the roster."""
+
+
+@dataclass
+class Slot:
+    date_slot: str  # 'DD-MM-YYYY HH:MM'
+    specialization: str
+    doctor_name: str
+    is_available: bool
+    patient_to_attend: int | None = None
+
+    @property
+    def date(self) -> str:
+        return self.date_slot[:10]
+
+    @property
+    def time(self) -> str:
+        return self.date_slot[11:]
+
+    @property
+    def sort_key(self) -> tuple:
+        day, month, year = self.date.split("-")
+        return (year, month, day, self.time, self.doctor_name)
+
+
+def _parse_patient(value: str) -> int | None:
+    # pandas wrote this column as float ('1000082.0'); empty means free
+    return int(float(value)) if value else None
+
+
+def _format_patient(value: int | None) -> str:
+    return f"{value:.1f}" if value is not None else ""
+
+
+def day_to_iso(day: str) -> str:
+    """'DD-MM-YYYY' -> 'YYYY-MM-DD' (partition file names sort by date)."""
+    dd, mm, yyyy = day.split("-")
+    return f"{yyyy}-{mm}-{dd}"
+
+
+def iso_to_day(iso: str) -> str:
+    yyyy, mm, dd = iso.split("-")
+    return f"{dd}-{mm}-{yyyy}"
+
+
+def read_slots(f) -> list[Slot]:
+    return [
+        Slot(
+            date_slot=row["date_slot"],
+            specialization=row["specialization"],
+            doctor_name=row["doctor_name"],
+            is_available=row["is_available"] == "True",
+            patient_to_attend=_parse_patient(row["patient_to_attend"]),
+        )
+        for row in csv.DictReader(f)
+    ]
+
+
+def write_slots(f, slots) -> None:
+    writer = csv.writer(f, lineterminator="\n")
+    writer.writerow(FIELDS)
+    for slot in slots:
+        writer.writerow([
+            slot.date_slot,
+            slot.specialization,
+            slot.doctor_name,
+            slot.is_available,
+            _format_patient(slot.patient_to_attend),
+        ])
+
+
+def _signature(path: str) -> tuple[int, int, int] | None:
+    """(inode, mtime_ns, size): an atomic replace or an in-place edit changes it."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _read_keyed(path: str) -> dict[tuple[str, str], Slot]:
+    with open(path, newline="") as f:
+        return {(s.date_slot, s.doctor_name): s for s in read_slots(f)}
+
+
+def convert_to_am_pm(time_str: str) -> str:
+    """'13:30' -> '1:30 PM'."""
+    hours, minutes = map(int, time_str.split(":"))
+    period = "AM" if hours < 12 else "PM"
+    return f"{hours % 12 or 12}:{minutes:02d} {period}"
+
+
+def _day_order(slot: Slot) -> tuple[str, str]:
+    # within one day 'DD-MM-YYYY HH:MM' sorts by time, then doctor
+    return (slot.date_slot, slot.doctor_name)
+
+
+class Partition:
+    """All slots of one day, ordered by time then doctor."""
+
+    def __init__(self, day: str, slots: list[Slot]):
+        self.day = day
+        self.slots = sorted(slots, key=_day_order)
+        self.by_key = {(s.date_slot, s.doctor_name): s for s in self.slots}
+        self._summary: dict[str, dict[str, dict[str, str]]] | None = None
+
+    @classmethod
+    def read(cls, path: str, day: str) -> "Partition":
+        with open(path, newline="") as f:
+            return cls(day, read_slots(f))
+
+    def add(self, slots: list[Slot]) -> None:
+        self.slots = sorted(self.slots + slots, key=_day_order)
+        self.by_key.update({(s.date_slot, s.doctor_name): s for s in slots})
+        self._summary = None
+
+    def summary(self) -> dict[str, dict[str, dict[str, str]]]:
+        """Free slots as specialization -> doctor -> {date_slot: '1:30 PM'}.
+
+        Built on first use, doctors and times in order, then kept current by
+        :meth:`booked` / :meth:`freed` instead of being rebuilt.
+        """
+        if self._summary is None:
+            summary: dict[str, dict[str, dict[str, str]]] = {}
+            for slot in sorted(self.slots, key=lambda s: (s.doctor_name, s.date_slot)):
+                if slot.is_available:
+                    summary.setdefault(slot.specialization, {}).setdefault(slot.doctor_name, {})[
+                        slot.date_slot
+                    ] = convert_to_am_pm(slot.time)
+            self._summary = summary
+        return self._summary
+
+    def booked(self, slot: Slot) -> None:
+        if self._summary is None:
+            return
+        doctors = self._summary.get(slot.specialization, {})
+        times = doctors.get(slot.doctor_name, {})
+        times.pop(slot.date_slot, None)
+        if not times:
+            doctors.pop(slot.doctor_name, None)
+
+    def freed(self, slot: Slot) -> None:
+        if self._summary is None:
+            return
+        doctors = self._summary.setdefault(slot.specialization, {})
+        times = doctors.get(slot.doctor_name, {})
+        times[slot.date_slot] = convert_to_am_pm(slot.time)
+        doctors[slot.doctor_name] = dict(sorted(times.items()))
+        if len(times) == 1:  # doctor was fully booked: restore doctor order
+            self._summary[slot.specialization] = dict(sorted(doctors.items()))
+
+    def write(self, path: str) -> None:
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", newline="") as f:
+            write_slots(f, self.slots)
+        os.replace(tmp_path, path)
+
+
+class SlotStore:
+    """Day-partitioned, indexed doctor availability store.
+
+    Each day lives in its own CSV under ``directory``; a partition is read
+    the first time a query touches its date and every mutation rewrites only
+    that day's file, atomically. Patient and (patient, time) occupancy
+    indexes span the loaded partitions. Past days can be moved to a gzip
+    cold store with :meth:`archive_before` / :meth:`apply_retention`.
+
+    Files edited outside the service (partitions, the roster, or the seed
+    CSV) are picked up by :meth:`poll`, which :meth:`start_watcher` runs in
+    the background.
+
+    Several processes (uvicorn workers, the roster importer) may share one
+    directory: mutations run in :meth:`_transaction`, which takes an flock
+    on the store's lock file and re-reads any day another process has
+    committed to since this one last looked.
+    """
+
+    def __init__(self, directory: str = STORE_DIR, seed_path: str = DATA_PATH):
+        self.directory = directory
+        self.archive_dir = os.path.join(directory, "archive")
+        self.seed_path = seed_path
+        self._lock = threading.RLock()
+        self._partitions: dict[str, Partition] = {}  # loaded days
+        self._catalog: set[str] = set()  # days with a hot partition file
+        self._by_patient: dict[int, set[tuple[str, str]]] = {}
+        self._occupancy: dict[tuple[int, str], str] = {}  # (patient, date_slot) -> doctor
+        # hot days not loaded yet -> patients booked on them, from a patient-column-only scan
+        self._day_patients: dict[str, frozenset[int]] = {}
+        self.doctors: dict[str, str] = {}  # doctor_name -> specialization
+        # file signatures as of our last read or write, keyed by day
+        self._signatures: dict[str, tuple[int, int, int] | None] = {}
+        self._roster_signature: tuple[int, int, int] | None = None
+        self._seed_signature: tuple[int, int, int] | None = None
+        self._watcher: threading.Thread | None = None
+        self._stop_watching = threading.Event()
+        # cross-process state: last commit token seen, days verified against it
+        self._token: str | None = None
+        self._verified: set[str] = set()
+        self._lock_depth = 0
+        self._dirty = False
+        self.load()
+
+    # ------------------------------------------------------------------
+    # loading / persistence
+    # ------------------------------------------------------------------
+
+    def _path(self, day: str) -> str:
+        return os.path.join(self.directory, f"{day_to_iso(day)}.csv")
+
+    def _scan(self) -> set[str]:
+        return {
+            iso_to_day(name[:-4])
+            for name in os.listdir(self.directory)
+            if name.endswith(".csv") and name != ROSTER_FILE
+        }
+
+    def _is_empty(self) -> bool:
+        """No store here yet: no partitions, roster, seed snapshot or archived days.
+
+        A store whose days have all been archived is not empty and must not
+        be re-seeded, or archived days and bookings would come back.
+        """
+        return not (
+            self._scan()
+            or os.path.exists(self._roster_path)
+            or os.path.exists(self._seed_snapshot_path)
+            or os.listdir(self.archive_dir)
+        )
+
+    def load(self) -> None:
+        """(Re)discover partitions and the roster; partitions load lazily."""
+        os.makedirs(self.archive_dir, exist_ok=True)
+        with self._transaction():
+            if self._is_empty() and os.path.exists(self.seed_path):
+                self.migrate(self.seed_path)
+            self._partitions = {}
+            self._by_patient = {}
+            self._occupancy = {}
+            self._day_patients = {}
+            self._verified = set()
+            self._catalog = self._scan()
+            self._signatures = {day: _signature(self._path(day)) for day in self._catalog}
+            self._roster_signature = _signature(self._roster_path)
+            self.doctors = self._read_roster()
+            if not self.doctors:
+                self.preload()
+                self._write_roster()
+                self._dirty = True
+            if not os.path.exists(self._seed_snapshot_path) and os.path.exists(self.seed_path):
+                # stores created before hot reload: take the current seed as the baseline
+                self._write_seed_snapshot()
+        self._reload_seed()
+
+    def preload(self) -> None:
+        """Load every hot partition and build the patient indexes."""
+        with self._lock:
+            for day in self._catalog:
+                self._partition(day)
+
+    def index_patients(self) -> None:
+        """Note which patients are booked on each hot day that is not loaded.
+
+        Only the patient column is kept, so this is far lighter than
+        :meth:`preload`; :meth:`patient_appointments` then loads just the
+        days a patient is booked on. Days already noted are not re-read.
+        """
+        with self._lock:
+            for day in self._catalog - self._partitions.keys() - self._day_patients.keys():
+                try:
+                    with open(self._path(day), newline="") as f:
+                        patients = {row["patient_to_attend"] for row in csv.DictReader(f)}
+                except FileNotFoundError:  # deleted meanwhile; the next sync drops the day
+                    patients = set()
+                patients.discard("")
+                self._day_patients[day] = frozenset(map(_parse_patient, patients))
+
+    def migrate(self, seed_path: str) -> int:
+        """Split a flat availability CSV into per-day partitions."""
+        with open(seed_path, newline="") as f:
+            slots = read_slots(f)
+        by_day: dict[str, list[Slot]] = {}
+        for slot in slots:
+            by_day.setdefault(slot.date, []).append(slot)
+        for day, day_slots in by_day.items():
+            Partition(day, day_slots).write(self._path(day))
+        self._write_seed_snapshot(seed_path)
+        self._dirty = True
+        print(f"Slot store: migrated {len(slots)} slots from {seed_path} into {len(by_day)} partitions")
+        return len(by_day)
+
+    @property
+    def _roster_path(self) -> str:
+        return os.path.join(self.directory, ROSTER_FILE)
+
+    @property
+    def _seed_snapshot_path(self) -> str:
+        return os.path.join(self.directory, SEED_SNAPSHOT_FILE)
+
+    def _read_roster(self) -> dict[str, str]:
+        if not os.path.exists(self._roster_path):
+            return {}
+        with open(self._roster_path, newline="") as f:
+            return {row["doctor_name"]: row["specialization"] for row in csv.DictReader(f)}
+
+    def _write_roster(self) -> None:
+        path = self._roster_path
+        with open(f"{path}.tmp", "w", newline="") as f:
+            writer = csv.writer(f, lineterminator="\n")
+            writer.writerow(["doctor_name", "specialization"])
+            writer.writerows(sorted(self.doctors.items()))
+        os.replace(f"{path}.tmp", path)
+        self._roster_signature = _signature(path)
+
+    def _write_seed_snapshot(self, seed_path: str | None = None) -> None:
+        seed_path = seed_path or self.seed_path
+        shutil.copyfile(seed_path, f"{self._seed_snapshot_path}.tmp")
+        os.replace(f"{self._seed_snapshot_path}.tmp", self._seed_snapshot_path)
+        self._seed_signature = _signature(seed_path)
+
+    def _partition(self, day: str) -> Partition | None:
+        """The loaded partition for ``day``, reading it on first access."""
+        partition = self._partitions.get(day)
+        if partition is None and day in self._catalog:
+            partition = Partition.read(self._path(day), day)
+            self._attach(partition)
+        return partition
+
+    def _attach(self, partition: Partition) -> None:
+        self._partitions[partition.day] = partition
+        self._day_patients.pop(partition.day, None)  # the patient indexes cover it now
+        for slot in partition.slots:
+            self.doctors.setdefault(slot.doctor_name, slot.specialization)
+            if slot.patient_to_attend is not None:
+                self._index_patient(slot)
+
+    def _detach(self, day: str) -> None:
+        self._day_patients.pop(day, None)
+        partition = self._partitions.pop(day, None)
+        if partition is not None:
+            for slot in partition.slots:
+                if slot.patient_to_attend is not None:
+                    self._unindex_patient(slot)
+
+    def _save(self, *days: str) -> None:
+        for day in set(days):
+            path = self._path(day)
+            self._partitions[day].write(path)
+            # our own write must not look like an external edit to poll()
+            self._signatures[day] = _signature(path)
+        self._dirty = True
+
+    # ------------------------------------------------------------------
+    # cross-process transactions
+    # ------------------------------------------------------------------
+
+    @property
+    def _lock_path(self) -> str:
+        return os.path.join(self.directory, LOCK_FILE)
+
+    def _read_token(self) -> str:
+        try:
+            with open(self._lock_path) as f:
+                return f.read()
+        except FileNotFoundError:
+            return ""
+
+    @contextmanager
+    def _transaction(self, *days: str):
+        """Run a mutation exclusively across threads and processes.
+
+        ``days`` are brought up to date with other processes' commits first.
+        If anything was saved, a new commit token is written on the way out,
+        which tells the other processes to re-check the days they hold.
+        """
+        with self._lock:
+            if self._lock_depth:
+                self._sync(*days)
+                yield
+                return
+            with open(self._lock_path, "a+") as f:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_EX)
+                self._lock_depth += 1
+                self._dirty = False
+                try:
+                    self._sync(*days)
+                    yield
+                finally:
+                    self._lock_depth -= 1
+                    if self._dirty:
+                        self._token = uuid.uuid4().hex
+                        f.seek(0)
+                        f.truncate()
+                        f.write(self._token)
+                        f.flush()
+                # closing the file releases the flock
+
+    def _sync(self, *days: str) -> None:
+        """Make ``days`` reflect the latest commit of any process.
+
+        Cheap when nothing else has committed: one small file read. Otherwise
+        every day is re-read from disk the next time it is touched.
+        """
+        with self._lock:
+            token = self._read_token()
+            if token != self._token:
+                self._token = token
+                self._verified.clear()
+                self.doctors.update(self._read_roster())
+            for day in days:
+                if day not in self._verified:
+                    self._reload_day(day)
+                    self._verified.add(day)
+
+    def _reload_day(self, day: str) -> tuple[int, int, int] | None:
+        """Re-read one day from disk (under the lock); None if it was unchanged."""
+        path = self._path(day)
+        signature = _signature(path)
+        if signature is None:
+            if day not in self._catalog:
+                return None
+            self._detach(day)
+            self._catalog.discard(day)
+            self._signatures.pop(day, None)
+            return (0, 0, 0)
+        counts = (0, 0, 0)
+        if day in self._partitions:
+            counts = self._swap(self._partitions[day], Partition.read(path, day))
+        elif signature != self._signatures.get(day):
+            self._day_patients.pop(day, None)  # re-scan the changed file when next needed
+        self._catalog.add(day)
+        self._signatures[day] = signature
+        return counts
+
+    def _index_patient(self, slot: Slot) -> None:
+        self._by_patient.setdefault(slot.patient_to_attend, set()).add(
+            (slot.date_slot, slot.doctor_name)
+        )
+        self._occupancy[(slot.patient_to_attend, slot.date_slot)] = slot.doctor_name
+
+    def _unindex_patient(self, slot: Slot) -> None:
+        keys = self._by_patient.get(slot.patient_to_attend)
+        if keys is not None:
+            keys.discard((slot.date_slot, slot.doctor_name))
+            if not keys:
+                del self._by_patient[slot.patient_to_attend]
+        if self._occupancy.get((slot.patient_to_attend, slot.date_slot)) == slot.doctor_name:
+            del self._occupancy[(slot.patient_to_attend, slot.date_slot)]
+
+    def _get(self, date_slot: str, doctor_name: str) -> Slot | None:
+        partition = self._partition(date_slot.split(" ")[0])
+        return partition.by_key.get((date_slot, doctor_name)) if partition else None
+
+    # ------------------------------------------------------------------
+    # retention / cold store
+    # ------------------------------------------------------------------
+
+    def archive_before(self, cutoff_day: str) -> list[str]:
+        """Move partitions dated before ``cutoff_day`` into the gzip archive."""
+        cutoff = day_to_iso(cutoff_day)
+        archived = []
+        with self._transaction(*self._scan()):
+            for day in sorted(self._catalog, key=day_to_iso):
+                if day_to_iso(day) >= cutoff:
+                    break
+                src = self._path(day)
+                dst = self._archive_path(day)
+                with open(src, "rb") as f_in, gzip.open(f"{dst}.tmp", "wb") as f_out:
+                    shutil.copyfileobj(f_in, f_out)
+                os.replace(f"{dst}.tmp", dst)
+                os.remove(src)
+                self._detach(day)
+                self._catalog.discard(day)
+                self._signatures.pop(day, None)
+                self._dirty = True
+                archived.append(day)
+        if archived:
+            print(f"Slot store: archived {len(archived)} partitions before {cutoff_day}")
+        return archived
+
+    def apply_retention(self, keep_days: int, today: datetime | None = None) -> list[str]:
+        """Archive every day older than ``keep_days`` days before today."""
+        cutoff = (today or datetime.now()) - timedelta(days=keep_days)
+        return self.archive_before(cutoff.strftime("%d-%m-%Y"))
+
+    def _archive_path(self, day: str) -> str:
+        return os.path.join(self.archive_dir, f"{day_to_iso(day)}.csv.gz")
+
+    def is_archived(self, day: str) -> bool:
+        return os.path.exists(self._archive_path(day))
+
+    def archived_days(self) -> set[str]:
+        """Dates ('DD-MM-YYYY') in the archive."""
+        return {iso_to_day(name[:-7]) for name in os.listdir(self.archive_dir) if name.endswith(".csv.gz")}
+
+    def read_archived(self, day: str) -> list[Slot]:
+        """Slots of an archived day (read-only history)."""
+        path = self._archive_path(day)
+        if not os.path.exists(path):
+            return []
+        with gzip.open(path, "rt", newline="") as f:
+            return read_slots(f)
+
+    # ------------------------------------------------------------------
+    # hot reload of externally edited files
+    # ------------------------------------------------------------------
+
+    def _swap(self, old: Partition | None, new: Partition) -> tuple[int, int, int]:
+        """Replace a day's partition, re-indexing only the slots that differ.
+
+        Runs under the lock; the new partition is fully built beforehand, so
+        readers see either the old or the new day. Returns (added, removed,
+        changed) slot counts.
+        """
+        old_keys = old.by_key.keys() if old else set()
+        added = new.by_key.keys() - old_keys
+        removed = old_keys - new.by_key.keys()
+        changed = {key for key in new.by_key.keys() & old_keys if new.by_key[key] != old.by_key[key]}
+        for key in removed | changed:
+            if old.by_key[key].patient_to_attend is not None:
+                self._unindex_patient(old.by_key[key])
+        for key in added | changed:
+            slot = new.by_key[key]
+            self.doctors.setdefault(slot.doctor_name, slot.specialization)
+            if slot.patient_to_attend is not None:
+                self._index_patient(slot)
+        self._partitions[new.day] = new
+        self._day_patients.pop(new.day, None)
+        self._catalog.add(new.day)
+        return len(added), len(removed), len(changed)
+
+    def _reload_partitions(self) -> list[str]:
+        with self._lock:
+            known = dict(self._signatures)
+        changed = []
+        for day in self._scan() | known.keys():
+            path = self._path(day)
+            signature = _signature(path)
+            if signature == known.get(day):
+                continue
+            with self._lock:
+                if signature is None or day not in self._partitions:
+                    # deleted, or not read yet: the lazy load will see the new contents
+                    if self._reload_day(day) is not None:
+                        changed.append(day)
+                    continue
+            try:
+                # parse outside the lock so readers are not held up
+                partition = Partition.read(path, day)
+            except (OSError, KeyError, ValueError) as e:
+                print(f"❌ Slot store: could not reload {day}, keeping the loaded copy:", e)
+                continue
+            with self._lock:
+                if self._signatures.get(day) != known.get(day):
+                    continue  # the store rewrote the file meanwhile; that write wins
+                counts = self._swap(self._partitions.get(day), partition)
+                self._signatures[day] = signature
+            changed.append(day)
+            if any(counts):
+                print(f"Slot store: reloaded {day} (+{counts[0]} -{counts[1]} ~{counts[2]} slots)")
+        return changed
+
+    def _reload_roster(self) -> None:
+        signature = _signature(self._roster_path)
+        if signature is None or signature == self._roster_signature:
+            return
+        try:
+            doctors = self._read_roster()
+        except (OSError, KeyError) as e:
+            print("❌ Slot store: could not reload the roster:", e)
+            return
+        with self._lock:
+            for partition in self._partitions.values():
+                for slot in partition.slots:
+                    doctors.setdefault(slot.doctor_name, slot.specialization)
+            self.doctors = doctors
+            self._roster_signature = signature
+        print(f"Slot store: reloaded roster ({len(doctors)} doctors)")
+
+    def _reload_seed(self) -> list[str]:
+        """Apply edits made to the seed CSV since it was last applied.
+
+        The seed is diffed against the snapshot of its previous contents, so
+        only rows the front desk actually changed are written into the
+        partitions; bookings made through the service are left alone. The
+        diff and the snapshot update run under the store's flock, so only
+        one process applies a given edit. An edit that would free a booked
+        slot or give it another patient is reported and skipped, since the
+        seed does not know about bookings made through the service.
+        """
+        signature = _signature(self.seed_path)
+        if signature is None or signature == self._seed_signature:
+            return []
+        with self._transaction():
+            try:
+                rows = _read_keyed(self.seed_path)
+                previous = _read_keyed(self._seed_snapshot_path) if os.path.exists(self._seed_snapshot_path) else {}
+            except (OSError, KeyError, ValueError) as e:
+                print("❌ Slot store: could not reload the seed, will retry:", e)
+                return []
+            edits: dict[str, dict[tuple[str, str], Slot | None]] = {}
+            for key, slot in rows.items():
+                if previous.get(key) != slot:
+                    edits.setdefault(slot.date, {})[key] = slot
+            for key in previous.keys() - rows.keys():
+                edits.setdefault(key[0][:10], {})[key] = None
+
+            changed = []
+            for day, day_edits in edits.items():
+                if self.is_archived(day):
+                    print(f"❌ Slot store: seed edits to {day} skipped, the day is archived")
+                    continue
+                with self._transaction(day):
+                    old = self._partition(day)
+                    slots = dict(old.by_key) if old else {}
+                    applied = 0
+                    for key, slot in day_edits.items():
+                        live = slots.get(key)
+                        if live is not None and not live.is_available and (
+                            slot is None or slot.is_available or slot.patient_to_attend != live.patient_to_attend
+                        ):
+                            print(
+                                f"❌ Slot store: seed edit to {key[1]} at {key[0]} conflicts with the booking "
+                                f"of patient {live.patient_to_attend}; skipped"
+                            )
+                            continue
+                        if slot is None:
+                            slots.pop(key, None)
+                        else:
+                            slots[key] = slot
+                        applied += 1
+                    if not applied:
+                        continue
+                    counts = self._swap(old, Partition(day, list(slots.values())))
+                    self._save(day)
+                changed.append(day)
+                print(f"Slot store: applied seed edits to {day} (+{counts[0]} -{counts[1]} ~{counts[2]} slots)")
+            if changed:
+                self._write_roster()
+            self._write_seed_snapshot()
+        return changed
+
+    def poll(self) -> list[str]:
+        """Pick up external edits to partitions, the roster and the seed CSV.
+
+        Returns the days whose slots changed.
+        """
+        changed = self._reload_partitions()
+        self._reload_roster()
+        return changed + [day for day in self._reload_seed() if day not in changed]
+
+    def start_watcher(self, interval: float = RELOAD_INTERVAL) -> None:
+        """Poll for external edits every ``interval`` seconds in a daemon thread."""
+        if interval <= 0 or (self._watcher and self._watcher.is_alive()):
+            return
+        self._stop_watching.clear()
+
+        def run():
+            while not self._stop_watching.wait(interval):
+                try:
+                    self.poll()
+                except Exception as e:
+                    print("❌ Slot store: reload failed:", e)
+
+        self._watcher = threading.Thread(target=run, name="slot-store-watcher", daemon=True)
+        self._watcher.start()
+
+    def stop_watcher(self) -> None:
+        self._stop_watching.set()
+        if self._watcher:
+            self._watcher.join(timeout=5)
+            self._watcher = None
+
+    # ------------------------------------------------------------------
+    # roster validation (tool schemas no longer enumerate the roster)
+    # ------------------------------------------------------------------
+
+    def specializations(self) -> set[str]:
+        with self._lock:
+            return set(self.doctors.values())
+
+    def resolve_doctor(self, name: str) -> str:
+        """Map a model-supplied name onto the roster ('Dr. John Doe' -> 'john doe')."""
+        key = " ".join(name.lower().replace("dr.", " ").split())
+        if key.startswith("dr "):
+            key = key[3:]
+        with self._lock:
+            if key in self.doctors:
+                return key
+            suggestions = difflib.get_close_matches(key, self.doctors, n=3)
+        message = f"Unknown doctor '{name}'."
+        if suggestions:
+            message += f" Did you mean: {', '.join(suggestions)}?"
+        raise UnknownDoctor(message)
+
+    def resolve_specialization(self, name: str) -> str:
+        key = "_".join(name.lower().split())
+        specializations = self.specializations()
+        if key in specializations:
+            return key
+        raise UnknownSpecialization(
+            f"Unknown specialization '{name}'. Valid: {', '.join(sorted(specializations))}."
+        )
+
+    # ------------------------------------------------------------------
+    # reads
+    # ------------------------------------------------------------------
+
+    def dates(self) -> list[str]:
+        """Dates ('DD-MM-YYYY') that have hot partitions, in calendar order."""
+        with self._lock:
+            days = list(self._catalog)
+        return sorted(days, key=day_to_iso)
+
+    def available_slots(
+        self,
+        date: str,
+        doctor_name: str | None = None,
+        specialization: str | None = None,
+    ) -> list[Slot]:
+        """Free slots on ``date`` ('DD-MM-YYYY'), ordered by time then doctor."""
+        with self._lock:
+            self._sync(date)
+            partition = self._partition(date)
+            if partition is None:
+                return []
+            return [
+                slot
+                for slot in partition.slots
+                if slot.is_available
+                and (doctor_name is None or slot.doctor_name == doctor_name)
+                and (specialization is None or slot.specialization == specialization)
+            ]
+
+    def specialization_summary(self, date: str, specialization: str) -> dict[str, list[str]]:
+        """Each doctor's free slots on ``date`` as 12-hour times, doctors sorted."""
+        with self._lock:
+            self._sync(date)
+            partition = self._partition(date)
+            if partition is None:
+                return {}
+            doctors = partition.summary().get(specialization, {})
+            return {doctor: list(times.values()) for doctor, times in doctors.items()}
+
+    def patient_appointments(self, patient_id: int) -> list[Slot]:
+        """The patient's booked slots; loads only the days they are booked on."""
+        with self._lock:
+            # another process may have added days since; otherwise the catalog is current
+            self._sync(*(self._scan() | self._catalog if self._read_token() != self._token else self._catalog))
+            self.index_patients()
+            for day, patients in list(self._day_patients.items()):
+                if patient_id in patients:
+                    self._partition(day)
+            slots = [self._get(*key) for key in self._by_patient.get(patient_id, ())]
+        return sorted(slots, key=lambda s: s.sort_key)
+
+    def find_appointments(
+        self, date_slot: str, patient_id: int, doctor_name: str | None = None
+    ) -> list[Slot]:
+        day = date_slot.split(" ")[0]
+        with self._lock:
+            self._sync(day)
+            partition = self._partition(day)
+            if partition is None:
+                return []
+            return [
+                slot
+                for slot in partition.slots
+                if slot.date_slot == date_slot
+                and slot.patient_to_attend == patient_id
+                and (doctor_name is None or slot.doctor_name == doctor_name)
+            ]
+
+    # ------------------------------------------------------------------
+    # writes
+    # ------------------------------------------------------------------
+
+    def _book(self, date_slot: str, doctor_name: str, patient_id: int) -> Slot:
+        slot = self._get(date_slot, doctor_name)
+        if slot is None or not slot.is_available:
+            raise SlotUnavailable("No available appointments for that particular case")
+        clash = self._occupancy.get((patient_id, date_slot))
+        if clash is not None:
+            raise PatientConflict(
+                f"You already have an appointment with Dr. {clash.title()} at {date_slot}"
+            )
+        slot.is_available = False
+        slot.patient_to_attend = patient_id
+        self._index_patient(slot)
+        self._partitions[slot.date].booked(slot)
+        return slot
+
+    def _release(self, date_slot: str, doctor_name: str, patient_id: int) -> Slot:
+        slot = self._get(date_slot, doctor_name)
+        if slot is None or slot.patient_to_attend != patient_id:
+            raise AppointmentNotFound("You don´t have any appointment with that specifications")
+        self._unindex_patient(slot)
+        slot.is_available = True
+        slot.patient_to_attend = None
+        self._partitions[slot.date].freed(slot)
+        return slot
+
+    def book(self, date_slot: str, doctor_name: str, patient_id: int) -> Slot:
+        with self._transaction(date_slot[:10]):
+            slot = self._book(date_slot, doctor_name, patient_id)
+            self._save(slot.date)
+            return slot
+
+    def cancel(self, date_slot: str, doctor_name: str, patient_id: int) -> Slot:
+        with self._transaction(date_slot[:10]):
+            slot = self._release(date_slot, doctor_name, patient_id)
+            self._save(slot.date)
+            return slot
+
+    def bulk_insert(self, slots, conflicts: list[Slot] | None = None) -> int:
+        """Insert new slots in one transaction, one file write per touched day.
+
+        Slots whose (date_slot, doctor_name) already exists, in the store or
+        earlier in ``slots``, are skipped. So are booked slots whose patient
+        already holds another slot at that time, as :meth:`book` would
+        refuse them; those are appended to ``conflicts``. Returns how many
+        were inserted. Raises :class:`DayArchived`, writing nothing, if any
+        slot falls on an archived day.
+        """
+        by_day: dict[str, dict[tuple[str, str], Slot]] = {}
+        for slot in slots:
+            by_day.setdefault(slot.date, {}).setdefault((slot.date_slot, slot.doctor_name), slot)
+
+        inserted = 0
+        with self._transaction(*by_day):
+            archived = sorted((day for day in by_day if self.is_archived(day)), key=day_to_iso)
+            if archived:
+                raise DayArchived(f"Cannot insert into archived days: {', '.join(archived)}")
+            roster_size = len(self.doctors)
+            for day, day_slots in by_day.items():
+                partition = self._partition(day)
+                if partition is None:
+                    partition = Partition(day, [])
+                    self._partitions[day] = partition
+                    self._catalog.add(day)
+                new = []
+                for key, slot in day_slots.items():
+                    if key in partition.by_key:
+                        continue
+                    if not slot.is_available and slot.patient_to_attend is not None:
+                        if (slot.patient_to_attend, slot.date_slot) in self._occupancy:
+                            if conflicts is not None:
+                                conflicts.append(slot)
+                            continue
+                        self._index_patient(slot)
+                    new.append(slot)
+                if not new:
+                    continue
+                partition.add(new)
+                for slot in new:
+                    self.doctors.setdefault(slot.doctor_name, slot.specialization)
+                self._save(day)
+                inserted += len(new)
+            if len(self.doctors) != roster_size:
+                self._write_roster()
+        return inserted
+
+    def reschedule(
+        self, old_date_slot: str, new_date_slot: str, doctor_name: str, patient_id: int
+    ) -> Slot:
+        """Move an appointment in one step; nothing changes if either half fails."""
+        with self._transaction(old_date_slot[:10], new_date_slot[:10]):
+            new_slot = self._get(new_date_slot, doctor_name)
+            if new_slot is None or not new_slot.is_available:
+                raise SlotUnavailable("Not available slots in the desired period")
+            old_slot = self._release(old_date_slot, doctor_name, patient_id)
+            try:
+                slot = self._book(new_date_slot, doctor_name, patient_id)
+            except PatientConflict:
+                # undo the release so a rejected move leaves the booking intact
+                old_slot.is_available = False
+                old_slot.patient_to_attend = patient_id
+                self._index_patient(old_slot)
+                self._partitions[old_slot.date].booked(old_slot)
+                raise
+            self._save(old_slot.date, slot.date)
+            return slot
+
+
+_store: SlotStore | None = None
+_store_lock = threading.Lock()
+
+
+def get_slot_store() -> SlotStore:
+    """Process-wide store, loaded on first use."""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = SlotStore()
+    return _store
+
+
+if __name__ == "__main__":
+    # python -m toolkit.slot_store archive --keep-days 7
+    parser = argparse.ArgumentParser(description="Slot store maintenance")
+    commands = parser.add_subparsers(dest="command", required=True)
+    archive = commands.add_parser("archive", help="move past partitions to the gzip archive")
+    archive.add_argument("--keep-days", type=int, default=int(RETENTION_DAYS or 0))
+    archive.add_argument("--before", help="archive days before this DD-MM-YYYY instead")
+    commands.add_parser("stats", help="show hot / archived partition counts")
+    args = parser.parse_args()
+
+    store = get_slot_store()
+    if args.command == "archive":
+        if args.before:
+            store.archive_before(args.before)
+        else:
+            store.apply_retention(args.keep_days)
+    hot = store.dates()
+    print(f"hot partitions: {len(hot)} ({hot[0] if hot else '-'} .. {hot[-1] if hot else '-'})")
+    print(f"archived partitions: {len(os.listdir(store.archive_dir))}")
@@ -1,13 +1,13 @@
-import pandas as pd
-from typing import  Literal, Optional
+from typing import Optional
 from langchain_core.tools import tool
 from data_models.models import *
-from datetime import datetime
+from toolkit.slot_store import SlotStoreError, get_slot_store
 
 @tool
-def check_availability_by_doctor(desired_date:DateModel, doctor_name:Literal['kevin anderson','robert martinez','susan davis','daniel miller','sarah wilson','michael green','lisa brown','jane smith','emily johnson','john doe']):
+def check_availability_by_doctor(desired_date:DateModel, doctor_name:str):
     """
     Checking the database if we have availability for the specific doctor.
+    doctor_name is the doctor's full name in lowercase, e.g. 'john doe'.
     The parameters should be mentioned by the user in the query
     """
     #print("🔥 check_availability_by_doctor tool invoked with:")
@@ -16,16 +16,10 @@ def check_availability_by_doctor(desired_date:DateModel, doctor_name:Literal['ke
     
     try:
 
-        df = pd.read_csv("data/doctor_availability.csv")
+        store = get_slot_store()
+        doctor_name = store.resolve_doctor(doctor_name)
+        rows = [slot.time for slot in store.available_slots(desired_date.date, doctor_name=doctor_name)]
 
-        #print(df,"\n\n")
-        
-        df['date_slot_time'] = df['date_slot'].apply(lambda input: input.split(' ')[-1])
-        
-        #print(df['date_slot_time'],"\n\n")
-
-        rows = list(df[(df['date_slot'].apply(lambda input: input.split(' ')[0]) == desired_date.date)&(df['doctor_name'] == doctor_name)&(df['is_available'] == True)]['date_slot_time'])
-        
         #print(rows,"\n\n")
 
         if len(rows) == 0:
@@ -37,15 +31,18 @@ def check_availability_by_doctor(desired_date:DateModel, doctor_name:Literal['ke
         #print(output)
 
         return output
-    
+
+    except SlotStoreError as e:
+        return str(e)
     except Exception as e:
         print("❌ Exception occurred in check_availability_by_doctor:", e)
         return f"An error occurred while checking availability: {str(e)}"
     
 @tool
-def check_availability_by_specialization(desired_date:DateModel, specialization:Literal["general_dentist", "cosmetic_dentist", "prosthodontist", "pediatric_dentist","emergency_dentist","oral_surgeon","orthodontist"]):
+def check_availability_by_specialization(desired_date:DateModel, specialization:str):
     """
     Checking the database if we have availability for the specific specialization.
+    specialization is snake_case, e.g. 'general_dentist', 'oral_surgeon'.
     The parameters should be mentioned by the user in the query
     """
     #Dummy data
@@ -55,40 +52,31 @@ def check_availability_by_specialization(desired_date:DateModel, specialization:
 
     try:
 
-        df = pd.read_csv("data/doctor_availability.csv")
-        df['date_slot_time'] = df['date_slot'].apply(lambda input: input.split(' ')[-1])
-        rows = df[(df['date_slot'].apply(lambda input: input.split(' ')[0]) == desired_date.date) & (df['specialization'] == specialization) & (df['is_available'] == True)].groupby(['specialization', 'doctor_name'])['date_slot_time'].apply(list).reset_index(name='available_slots')
+        store = get_slot_store()
+        specialization = store.resolve_specialization(specialization)
+        # precomputed per (date, specialization), already in 12-hour format
+        rows = store.specialization_summary(desired_date.date, specialization)
 
         if len(rows) == 0:
             output = "No availability in the entire day"
         else:
-            def convert_to_am_pm(time_str):
-                # Split the time string into hours and minutes
-                time_str = str(time_str)
-                hours, minutes = map(int, time_str.split(":"))
-                
-                # Determine AM or PM
-                period = "AM" if hours < 12 else "PM"
-                
-                # Convert hours to 12-hour format
-                hours = hours % 12 or 12
-                
-                # Format the output
-                return f"{hours}:{minutes:02d} {period}"
             output = f'This availability for {desired_date.date}\n'
-            for row in rows.values:
-                output += row[1] + ". Available slots: \n" + ', \n'.join([convert_to_am_pm(value)for value in row[2]])+'\n'
+            for doctor, times in rows.items():
+                output += doctor + ". Available slots: \n" + ', \n'.join(times)+'\n'
 
         return output
 
+    except SlotStoreError as e:
+        return str(e)
     except Exception as e:
         print("❌ Exception occurred in check_availability_by_doctor:", e)
         return f"An error occurred while checking availability: {str(e)}"
     
 @tool
-def set_appointment(desired_date:DateTimeModel, id_number:IdentificationNumberModel, doctor_name:Literal['kevin anderson','robert martinez','susan davis','daniel miller','sarah wilson','michael green','lisa brown','jane smith','emily johnson','john doe']):
+def set_appointment(desired_date:DateTimeModel, id_number:IdentificationNumberModel, doctor_name:str):
     """
     Set appointment or slot with the doctor.
+    doctor_name is the doctor's full name in lowercase, e.g. 'john doe'.
     The parameters MUST be mentioned by the user in the query.
     """
     print("🔥 set_appointment tool invoked with:")
@@ -98,39 +86,22 @@ def set_appointment(desired_date:DateTimeModel, id_number:IdentificationNumberMo
 
     try:
         patient_id = getattr(id_number, "id", id_number)
-        
-        df = pd.read_csv("data/doctor_availability.csv")
-
-        case = df[
-            (df['date_slot'] == desired_date.date) &
-            (df['doctor_name'] == doctor_name) &
-            (df['is_available'] == True)
-            ]
-        
         print("PATIENT ID --> ", patient_id)
-        print(case,"\n\n")
 
-        if len(case) == 0:
-            print("No available appointments for that particular case")
-            return "No available appointments for that particular case"
-        else:
-            
-            df.loc[
-                (df['date_slot'] == desired_date.date) &
-                (df['doctor_name'] == doctor_name) & 
-                (df['is_available'] == True), 
-                ['is_available','patient_to_attend']] = [False, (patient_id)]
-            
-            df.to_csv("data/doctor_availability.csv", index = False)
-            print("Successfully done")
-            return "Successfully done"
-        
+        store = get_slot_store()
+        store.book(desired_date.date, store.resolve_doctor(doctor_name), patient_id)
+        print("Successfully done")
+        return "Successfully done"
+
+    except SlotStoreError as e:
+        print(e)
+        return str(e)
     except Exception as e:
         print("❌ Exception occurred in set_appointment:", e)
         return f"An error occurred while setting appointment: {str(e)}"
 
 @tool
-def cancel_appointment(desired_date:DateTimeModel, id_number:IdentificationNumberModel, doctor_name:Optional[Literal['kevin anderson','robert martinez','susan davis','daniel miller','sarah wilson','michael green','lisa brown','jane smith','emily johnson','john doe']]):
+def cancel_appointment(desired_date:DateTimeModel, id_number:IdentificationNumberModel, doctor_name:Optional[str]):
     """
     Canceling an appointment.
     If doctor name is not provided, try to infer from patient ID and date.
@@ -145,49 +116,36 @@ def cancel_appointment(desired_date:DateTimeModel, id_number:IdentificationNumbe
         patient_id = getattr(id_number, "id", id_number)
         print("PATIENT ID --> ", patient_id)
 
-        df = pd.read_csv("data/doctor_availability.csv")
-
+        store = get_slot_store()
         if doctor_name:
-            case_to_remove = df[
-                (df['date_slot'] == desired_date.date) &
-                (df['patient_to_attend'] == patient_id) &
-                (df['doctor_name'] == doctor_name)
-                ]
-        else:
-            case_to_remove = df[
-                (df['date_slot'] == desired_date.date) &
-                (df['patient_to_attend'] == patient_id)
-                ]
-        
+            doctor_name = store.resolve_doctor(doctor_name)
+        case_to_remove = store.find_appointments(desired_date.date, patient_id, doctor_name)
+
         if len(case_to_remove) == 0:
             return "You don´t have any appointment with that specifications"
-        
+
         elif len(case_to_remove) == 1:
-            matched_row = case_to_remove.iloc[0]
-            df.loc[
-                (df['date_slot'] == matched_row['date_slot']) &
-                (df['patient_to_attend'] == patient_id) & 
-                (df['doctor_name'] == matched_row['doctor_name']), 
-                ['is_available', 'patient_to_attend']] = [True, None]
-            df.to_csv("data/doctor_availability.csv", index = False)
-            return f"Your appointment with Dr. {matched_row['doctor_name'].title()} at {matched_row['date_slot']} has been cancelled."
+            matched = store.cancel(case_to_remove[0].date_slot, case_to_remove[0].doctor_name, patient_id)
+            return f"Your appointment with Dr. {matched.doctor_name.title()} at {matched.date_slot} has been cancelled."
 
         else:
             # Multiple matches — need user confirmation
             options = "\n".join(
-                f"- Dr. {row['doctor_name'].title()} at {row['date_slot']}"
-                for _, row in case_to_remove.iterrows()
+                f"- Dr. {slot.doctor_name.title()} at {slot.date_slot}"
+                for slot in case_to_remove
             )
             return f"You have multiple appointments on that day:\n{options}\nPlease specify which one to cancel."
 
-        
+    except SlotStoreError as e:
+        return str(e)
     except Exception as e:
         print("❌ Exception occurred in cancel_appointment:", e)
         return f"An error occurred while cancelling appointment: {str(e)}"
 @tool
-def reschedule_appointment(old_date:DateTimeModel, new_date:DateTimeModel, id_number:IdentificationNumberModel, doctor_name:Literal['kevin anderson','robert martinez','susan davis','daniel miller','sarah wilson','michael green','lisa brown','jane smith','emily johnson','john doe']):
+def reschedule_appointment(old_date:DateTimeModel, new_date:DateTimeModel, id_number:IdentificationNumberModel, doctor_name:str):
     """
     Rescheduling an appointment.
+    doctor_name is the doctor's full name in lowercase, e.g. 'john doe'.
     The parameters MUST be mentioned by the user in the query.
     """
     print("🔥 reschedule_appointment tool invoked with:")
@@ -199,21 +157,13 @@ def reschedule_appointment(old_date:DateTimeModel, new_date:DateTimeModel, id_nu
     try:
         patient_id = getattr(id_number, "id", id_number)
         print("PATEINT ID TYPE ++> ", type(patient_id))
-        df = pd.read_csv("data/doctor_availability.csv")
-
-        available_for_desired_date = df[
-            (df['date_slot'] == new_date.date) &
-            (df['is_available'] == True) &
-            (df['doctor_name'] == doctor_name)
-            ]
-        
-        if len(available_for_desired_date) == 0:
-            return "Not available slots in the desired period"
-        else:
-            cancel_appointment.invoke({'desired_date':old_date, 'id_number':id_number, 'doctor_name':doctor_name})
-            set_appointment.invoke({'desired_date':new_date, 'id_number': id_number, 'doctor_name': doctor_name})
-            return "Successfully rescheduled for the desired time"
-    
+
+        store = get_slot_store()
+        store.reschedule(old_date.date, new_date.date, store.resolve_doctor(doctor_name), patient_id)
+        return "Successfully rescheduled for the desired time"
+
+    except SlotStoreError as e:
+        return str(e)
     except Exception as e:
         print("❌ Exception occurred in reschedule_appointment:", e)
         return f"An error occurred while rescheduling: {str(e)}"
\ No newline at end of file
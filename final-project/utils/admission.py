@@ -0,0 +1,177 @@
+import math
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# -----------------------------------------------------------------------------
+# Admission settings (all overridable from the environment / .env)
+# -----------------------------------------------------------------------------
+
+ADMISSION_INITIAL_LIMIT = float(os.getenv("ADMISSION_INITIAL_LIMIT", "8"))
+ADMISSION_MIN_LIMIT = float(os.getenv("ADMISSION_MIN_LIMIT", "1"))
+# keep max limit + max queue below the FastAPI threadpool size (40 by default)
+ADMISSION_MAX_LIMIT = float(os.getenv("ADMISSION_MAX_LIMIT", "16"))
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "16"))
+ADMISSION_QUEUE_TIMEOUT = float(os.getenv("ADMISSION_QUEUE_TIMEOUT", "10"))
+ADMISSION_LATENCY_TARGET = float(os.getenv("ADMISSION_LATENCY_TARGET", "10"))
+ADMISSION_THROTTLE_THRESHOLD = float(os.getenv("ADMISSION_THROTTLE_THRESHOLD", "0.1"))
+ADMISSION_BACKOFF_RATIO = float(os.getenv("ADMISSION_BACKOFF_RATIO", "0.7"))
+ADMISSION_DECREASE_COOLDOWN = float(os.getenv("ADMISSION_DECREASE_COOLDOWN", "2"))
+ADMISSION_WINDOW = int(os.getenv("ADMISSION_WINDOW", "50"))
+
+
+class Overloaded(Exception):
+    """Raised when a request is shed instead of admitted."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Service overloaded, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """AIMD concurrency limit in front of the graph runs.
+
+    The limit grows by ``1/limit`` for every healthy LLM response and is
+    multiplied by ``backoff_ratio`` when the provider throttles (429 rate over
+    the recent window above ``throttle_threshold``) or latency exceeds the
+    target. Requests above the limit wait in a bounded queue; anything beyond
+    that, or waiting longer than ``queue_timeout``, is shed with
+    :class:`Overloaded`.
+    """
+
+    def __init__(
+        self,
+        initial_limit: float = ADMISSION_INITIAL_LIMIT,
+        min_limit: float = ADMISSION_MIN_LIMIT,
+        max_limit: float = ADMISSION_MAX_LIMIT,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT,
+        latency_target: float = ADMISSION_LATENCY_TARGET,
+        throttle_threshold: float = ADMISSION_THROTTLE_THRESHOLD,
+        backoff_ratio: float = ADMISSION_BACKOFF_RATIO,
+        decrease_cooldown: float = ADMISSION_DECREASE_COOLDOWN,
+        window: int = ADMISSION_WINDOW,
+    ):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.latency_target = latency_target
+        self.throttle_threshold = throttle_threshold
+        self.backoff_ratio = backoff_ratio
+        self.decrease_cooldown = decrease_cooldown
+
+        self._cond = threading.Condition()
+        self.limit = min(max(initial_limit, min_limit), max_limit)
+        self.in_flight = 0
+        self.queued = 0
+        self.admitted_total = 0
+        self.shed_total = 0
+        self.throttled_total = 0
+        self._samples: deque[bool] = deque(maxlen=window)
+        self._last_decrease = 0.0
+        self._run_seconds = 5.0  # EWMA of a full graph run, used for Retry-After
+
+    # ------------------------------------------------------------------
+    # feedback from the LLM client
+    # ------------------------------------------------------------------
+
+    def observe(self, status_code: int | None, elapsed: float) -> None:
+        """Feed one LLM attempt into the AIMD loop (see utils.llms listeners)."""
+        throttled = status_code == 429
+        with self._cond:
+            self._samples.append(throttled)
+            if throttled:
+                self.throttled_total += 1
+            throttle_rate = sum(self._samples) / len(self._samples)
+            overloaded = (
+                (throttled and throttle_rate >= self.throttle_threshold)
+                or elapsed > self.latency_target
+                or status_code is None
+            )
+            now = time.monotonic()
+            if overloaded:
+                if now - self._last_decrease >= self.decrease_cooldown:
+                    self.limit = max(self.min_limit, self.limit * self.backoff_ratio)
+                    self._last_decrease = now
+            elif status_code < 400:
+                self.limit = min(self.max_limit, self.limit + 1.0 / self.limit)
+                self._cond.notify_all()
+
+    # ------------------------------------------------------------------
+    # admission
+    # ------------------------------------------------------------------
+
+    def _has_capacity(self) -> bool:
+        return self.in_flight < max(1, math.floor(self.limit))
+
+    def retry_after(self) -> int:
+        """Rough seconds until a slot frees up, for the Retry-After header."""
+        slots = max(1, math.floor(self.limit))
+        return max(1, math.ceil(self._run_seconds * (self.queued + 1) / slots))
+
+    def _shed(self) -> Overloaded:
+        self.shed_total += 1
+        return Overloaded(self.retry_after())
+
+    @contextmanager
+    def admit(self):
+        """Hold an in-flight slot for the duration of the block."""
+        with self._cond:
+            if not self._has_capacity():
+                if self.queued >= self.max_queue:
+                    raise self._shed()
+                self.queued += 1
+                deadline = time.monotonic() + self.queue_timeout
+                try:
+                    while not self._has_capacity():
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise self._shed()
+                        self._cond.wait(remaining)
+                finally:
+                    self.queued -= 1
+            self.in_flight += 1
+            self.admitted_total += 1
+
+        started = time.monotonic()
+        try:
+            yield
+        finally:
+            with self._cond:
+                self.in_flight -= 1
+                self._run_seconds = 0.8 * self._run_seconds + 0.2 * (time.monotonic() - started)
+                self._cond.notify()
+
+    # ------------------------------------------------------------------
+    # metrics
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        with self._cond:
+            return {
+                "limit": self.limit,
+                "in_flight": self.in_flight,
+                "queue_depth": self.queued,
+                "admitted_total": self.admitted_total,
+                "shed_total": self.shed_total,
+                "llm_throttled_total": self.throttled_total,
+            }
+
+    def prometheus(self) -> str:
+        """Render the snapshot in the Prometheus text exposition format."""
+        kinds = {
+            "limit": "gauge",
+            "in_flight": "gauge",
+            "queue_depth": "gauge",
+            "admitted_total": "counter",
+            "shed_total": "counter",
+            "llm_throttled_total": "counter",
+        }
+        lines = []
+        for name, value in self.snapshot().items():
+            lines.append(f"# TYPE appointment_admission_{name} {kinds[name]}")
+            lines.append(f"appointment_admission_{name} {value}")
+        return "\n".join(lines) + "\n"
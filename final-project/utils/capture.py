@@ -0,0 +1,162 @@
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+# JSONL file that /execute turns are appended to; unset disables capture
+CAPTURE_PATH = os.getenv("CAPTURE_PATH")
+# key for pseudonyms; set it to keep them stable across restarts
+CAPTURE_SALT = os.getenv("CAPTURE_SALT") or secrets.token_hex(16)
+
+ID_PATTERN = re.compile(r"\b\d{7,8}\b")
+EMAIL_PATTERN = re.compile(r"[\w.+-]+@[\w-]+\.[\w.]+")
+
+
+def pseudonym(value: int | str) -> int:
+    """Stable 7-digit stand-in for a patient id (still a valid id_number)."""
+    digest = hmac.new(CAPTURE_SALT.encode(), str(int(value)).encode(), hashlib.sha256).digest()
+    return 1_000_000 + int.from_bytes(digest[:8], "big") % 9_000_000
+
+
+def anonymise_thread(thread_id: str) -> str:
+    return hmac.new(CAPTURE_SALT.encode(), thread_id.encode(), hashlib.sha256).hexdigest()[:16]
+
+
+def scrub(value: Any) -> Any:
+    """Replace patient ids (7-8 digit numbers) and e-mail addresses, recursively.
+
+    Dates, times and doctor names are kept: they shape the conversation.
+    """
+    if isinstance(value, str):
+        value = EMAIL_PATTERN.sub("<email>", value)
+        return ID_PATTERN.sub(lambda m: str(pseudonym(m.group())), value)
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and 1_000_000 <= value <= 99_999_999:
+        return pseudonym(value)
+    if isinstance(value, dict):
+        return {k: scrub(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [scrub(v) for v in value]
+    return value
+
+
+class TurnRecorder(BaseCallbackHandler):
+    """Collects every chat model response of one turn, in call order."""
+
+    def __init__(self):
+        self.llm_calls: list[dict] = []
+        self.reply: str | None = None  # final assistant message, set by the caller
+        self._started: dict[Any, float] = {}
+        self._lock = threading.Lock()
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs) -> None:
+        from langchain_core.messages import message_to_dict
+
+        started = self._started.pop(run_id, None)
+        message = response.generations[0][0].message
+        data = message_to_dict(message)
+        data["data"].pop("id", None)
+        with self._lock:
+            self.llm_calls.append({
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1) if started else None,
+                "message": scrub(data),
+            })
+
+    def on_llm_error(self, error, *, run_id, **kwargs) -> None:
+        started = self._started.pop(run_id, None)
+        with self._lock:
+            self.llm_calls.append({
+                "latency_ms": round((time.perf_counter() - started) * 1000, 1) if started else None,
+                "error": type(error).__name__,
+            })
+
+
+class CaptureLog:
+    """Append-only JSONL log of anonymised /execute turns.
+
+    One line per turn: pseudonymous thread and patient, per-thread turn
+    number, start time, the scrubbed user message, every LLM response with
+    its latency, the final reply and the turn's wall time. Replay with
+    ``python benchmarks/replay.py``.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._turns: dict[str, int] = {}
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+
+    def record(
+        self,
+        *,
+        thread_id: str,
+        id_number: int,
+        message: str,
+        started: float,
+        elapsed: float,
+        recorder: TurnRecorder,
+        reply: str | None,
+        error: str | None = None,
+    ) -> None:
+        thread = anonymise_thread(thread_id)
+        with self._lock:
+            turn = self._turns[thread] = self._turns.get(thread, 0) + 1
+            entry = {
+                "thread": thread,
+                "turn": turn,
+                "ts": round(started, 3),
+                "id_number": pseudonym(id_number),
+                "message": scrub(message),
+                "llm_calls": recorder.llm_calls,
+                "reply": scrub(reply) if reply is not None else None,
+                "elapsed_ms": round(elapsed * 1000, 1),
+                "error": error,
+            }
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entry) + "\n")
+
+
+capture_log = CaptureLog(CAPTURE_PATH) if CAPTURE_PATH else None
+
+
+@contextmanager
+def capture_turn(thread_id: str, id_number: int, message: str):
+    """Record the enclosed agent run when capture is on.
+
+    Yields a :class:`TurnRecorder` to pass as a callback (and to set
+    ``reply`` on), or ``None`` when CAPTURE_PATH is unset.
+    """
+    if capture_log is None:
+        yield None
+        return
+    recorder = TurnRecorder()
+    started, wall = time.time(), time.perf_counter()
+    error = None
+    try:
+        yield recorder
+    except Exception as e:
+        error = type(e).__name__
+        raise
+    finally:
+        capture_log.record(
+            thread_id=thread_id,
+            id_number=id_number,
+            message=message,
+            started=started,
+            elapsed=time.perf_counter() - wall,
+            recorder=recorder,
+            reply=recorder.reply,
+            error=error,
+        )
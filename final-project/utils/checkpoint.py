@@ -0,0 +1,59 @@
+import hashlib
+import os
+import sqlite3
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: per-process locking only
+    fcntl = None
+
+# SQLite file shared by every uvicorn worker; unset keeps conversations in process memory
+CHECKPOINT_DB = os.getenv("CHECKPOINT_DB")
+# conversation threads hash onto this many lock stripes
+THREAD_LOCK_STRIPES = int(os.getenv("THREAD_LOCK_STRIPES", "64"))
+
+_stripes = [threading.Lock() for _ in range(THREAD_LOCK_STRIPES)]
+
+
+def make_checkpointer():
+    """MemorySaver by default; a WAL-mode SqliteSaver when CHECKPOINT_DB is set.
+
+    With the SQLite saver any worker can continue any conversation, so
+    ``uvicorn --workers N`` needs no sticky load balancing.
+    """
+    if not CHECKPOINT_DB:
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+
+    from langgraph.checkpoint.sqlite import SqliteSaver
+
+    os.makedirs(os.path.dirname(os.path.abspath(CHECKPOINT_DB)), exist_ok=True)
+    # timeout: wait for another worker's write instead of failing with "database is locked"
+    conn = sqlite3.connect(CHECKPOINT_DB, check_same_thread=False, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    saver = SqliteSaver(conn)
+    saver.setup()
+    return saver
+
+
+@contextmanager
+def thread_turn(thread_id: str):
+    """Serialise turns of one conversation across threads and workers.
+
+    Two requests for the same thread would otherwise both start from the
+    same checkpoint and one reply would be lost. Threads hash onto a fixed
+    set of stripes; with CHECKPOINT_DB the stripe is also flock'ed so the
+    guarantee holds across processes.
+    """
+    stripe = int(hashlib.sha1(thread_id.encode()).hexdigest(), 16) % THREAD_LOCK_STRIPES
+    with _stripes[stripe]:
+        if not CHECKPOINT_DB or fcntl is None:
+            yield
+            return
+        with open(f"{CHECKPOINT_DB}.turn-{stripe}.lock", "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            yield
@@ -0,0 +1,123 @@
+import contextvars
+import itertools
+import json
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, messages_from_dict
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.runnables import RunnableLambda
+from pydantic import PrivateAttr
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Offline stand‑in for ChatOpenAI that replays canned outputs.
+
+    ``responses`` are returned in turn by plain/tool‑bound calls (ReAct
+    specialists); ``routes`` are returned in turn by
+    ``with_structured_output`` calls (the supervisor router). Both cycle, so
+    one instance can drive any number of synthetic turns without network I/O.
+    """
+
+    responses: list[AIMessage]
+    routes: list[dict]
+
+    _response_iter: Any = PrivateAttr()
+    _route_iter: Any = PrivateAttr()
+
+    def model_post_init(self, __context: Any) -> None:
+        self._response_iter = itertools.cycle(self.responses)
+        self._route_iter = itertools.cycle(self.routes)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        message = next(self._response_iter).model_copy()
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _stream(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs):
+        # word by word, so /execute/stream can be exercised offline
+        message = next(self._response_iter)
+        if message.tool_calls or not isinstance(message.content, str):
+            tool_call_chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": i}
+                for i, call in enumerate(message.tool_calls)
+            ]
+            yield ChatGenerationChunk(message=AIMessageChunk(content=message.content, tool_call_chunks=tool_call_chunks))
+            return
+        words = message.content.split(" ")
+        for i, word in enumerate(words):
+            chunk = ChatGenerationChunk(message=AIMessageChunk(content=word if i == len(words) - 1 else word + " "))
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        return RunnableLambda(lambda _: dict(next(self._route_iter)))
+
+
+class ReplayDiverged(RuntimeError):
+    """The agent made more LLM calls than the recorded turn holds."""
+
+
+# recorded LLM calls of the turn running in this context
+_replay_calls: contextvars.ContextVar[deque] = contextvars.ContextVar("replay_calls")
+
+
+class ReplayChatModel(BaseChatModel):
+    """Plays back the LLM responses captured for each turn (utils/capture.py).
+
+    Wrap every agent run in :meth:`turn` with that turn's ``llm_calls``;
+    calls are consumed in order by plain, tool-bound and structured-output
+    invocations alike, so concurrent turns on one shared agent stay apart.
+    Each call sleeps for its recorded latency times ``latency_scale``.
+    """
+
+    latency_scale: float = 0.0
+
+    @contextmanager
+    def turn(self, llm_calls: list[dict]):
+        token = _replay_calls.set(deque(llm_calls))
+        try:
+            yield
+        finally:
+            _replay_calls.reset(token)
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay"
+
+    def _next_message(self) -> AIMessage:
+        calls = _replay_calls.get(None)
+        if not calls:
+            raise ReplayDiverged("no recorded LLM response left for this turn")
+        call = calls.popleft()
+        if self.latency_scale and call.get("latency_ms"):
+            time.sleep(call["latency_ms"] / 1000 * self.latency_scale)
+        if "error" in call:
+            raise RuntimeError(f"recorded LLM failure: {call['error']}")
+        return messages_from_dict([call["message"]])[0]
+
+    def _generate(self, messages: list[BaseMessage], stop=None, run_manager=None, **kwargs) -> ChatResult:
+        return ChatResult(generations=[ChatGeneration(message=self._next_message())])
+
+    @staticmethod
+    def _parse_route(message: AIMessage) -> dict:
+        if message.tool_calls:  # function-calling structured output
+            return dict(message.tool_calls[0]["args"])
+        return json.loads(message.content)  # json_schema / json_mode
+
+    def bind_tools(self, tools, **kwargs):
+        return self
+
+    def with_structured_output(self, schema, **kwargs):
+        # through the model, like ChatOpenAI, so callbacks see router calls too
+        return self | RunnableLambda(self._parse_route)
@@ -1,25 +1,223 @@
 import os
-from langchain_groq import ChatGroq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
 from dotenv import load_dotenv
-from langchain_openai import ChatOpenAI
 load_dotenv()
-# api_key = os.getenv("GROQ_API_KEY")
-OPENAI_API_KEY=os.getenv("OPENAI_API_KEY")
-os.environ["OPENAI_API_KEY"]=OPENAI_API_KEY
+
+# -----------------------------------------------------------------------------
+# HTTP client settings (all overridable from the environment / .env)
+# -----------------------------------------------------------------------------
+
+LLM_POOL_SIZE = int(os.getenv("LLM_POOL_SIZE", "20"))
+LLM_KEEPALIVE_EXPIRY = float(os.getenv("LLM_KEEPALIVE_EXPIRY", "60"))
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_CONNECT_TIMEOUT = float(os.getenv("LLM_CONNECT_TIMEOUT", "5"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "3"))
+LLM_BACKOFF_BASE = float(os.getenv("LLM_BACKOFF_BASE", "0.5"))
+LLM_BACKOFF_CAP = float(os.getenv("LLM_BACKOFF_CAP", "8"))
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "8"))
+LLM_WARM_CONNECTIONS = int(os.getenv("LLM_WARM_CONNECTIONS", "2"))
+OPENAI_BASE_URL = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1")
+GROQ_BASE_URL = os.getenv("GROQ_API_BASE", "https://api.groq.com/openai/v1")
+
+# provider -> (API base URL, environment variable holding its key), for warm-up
+PROVIDER_ENDPOINTS = {
+    "openai": (OPENAI_BASE_URL, "OPENAI_API_KEY"),
+    "groq": (GROQ_BASE_URL, "GROQ_API_KEY"),
+}
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+# Callbacks notified after every HTTP attempt as fn(status_code, elapsed_s);
+# status_code is None when the attempt failed before a response arrived.
+_response_listeners: list = []
+
+
+def add_response_listener(fn) -> None:
+    """Subscribe to per-attempt LLM latency / status observations."""
+    _response_listeners.append(fn)
+
+
+def _notify(status_code: int | None, elapsed: float) -> None:
+    for fn in _response_listeners:
+        try:
+            fn(status_code, elapsed)
+        except Exception as e:
+            print("❌ LLM response listener failed:", e)
+
+
+class PooledTransport(httpx.BaseTransport):
+    """httpx transport with a concurrency limiter and jittered retries.
+
+    Wraps a keep-alive connection pool. At most ``max_concurrency`` requests
+    are on the wire at once; callers beyond that block until a slot frees.
+    Connection errors and retryable status codes are retried with full-jitter
+    exponential backoff, honouring ``Retry-After`` when the server sends one.
+    """
+
+    def __init__(
+        self,
+        pool_size: int = LLM_POOL_SIZE,
+        keepalive_expiry: float = LLM_KEEPALIVE_EXPIRY,
+        max_retries: int = LLM_MAX_RETRIES,
+        max_concurrency: int = LLM_MAX_CONCURRENCY,
+    ):
+        self._transport = httpx.HTTPTransport(
+            limits=httpx.Limits(
+                max_connections=pool_size,
+                max_keepalive_connections=pool_size,
+                keepalive_expiry=keepalive_expiry,
+            ),
+        )
+        self._max_retries = max_retries
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after:
+                try:
+                    return min(float(retry_after), LLM_BACKOFF_CAP)
+                except ValueError:
+                    pass
+        return random.uniform(0, min(LLM_BACKOFF_CAP, LLM_BACKOFF_BASE * 2**attempt))
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            response = None
+            with self._slots:
+                started = time.perf_counter()
+                try:
+                    response = self._transport.handle_request(request)
+                except (httpx.ConnectError, httpx.ConnectTimeout, httpx.RemoteProtocolError):
+                    _notify(None, time.perf_counter() - started)
+                    if attempt >= self._max_retries:
+                        raise
+                else:
+                    _notify(response.status_code, time.perf_counter() - started)
+                    if response.status_code not in RETRYABLE_STATUS or attempt >= self._max_retries:
+                        return response
+                    response.close()
+            delay = self._backoff(attempt, response)
+            print(f"LLM request retry {attempt + 1}/{self._max_retries} in {delay:.2f}s")
+            time.sleep(delay)
+            attempt += 1
+
+    def close(self) -> None:
+        self._transport.close()
+
+
+def _build_model(provider: str, model_name: str, http_client: httpx.Client):
+    # provider SDKs are imported on first use: they dominate import time and
+    # Groq is optional
+    timeout = httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT)
+    # retries live in PooledTransport; the SDK must not retry on top
+    if provider == "openai":
+        from langchain_openai import ChatOpenAI
+
+        return ChatOpenAI(model=model_name, http_client=http_client, timeout=timeout, max_retries=0)
+    if provider == "groq":
+        from langchain_groq import ChatGroq
+
+        return ChatGroq(model=model_name, http_client=http_client, timeout=timeout, max_retries=0)
+    raise ValueError(f"Unknown LLM provider: {provider}")
+
+
+class LLMRegistry:
+    """Process-wide registry of chat models sharing one pooled HTTP client.
+
+    Every node and worker thread gets the same chat model instance per
+    (provider, model name), so TLS connections are reused across requests
+    instead of being re-established for each agent.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._http_client: httpx.Client | None = None
+        self._models: dict[tuple[str, str], object] = {}
+
+    def http_client(self) -> httpx.Client:
+        with self._lock:
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    transport=PooledTransport(),
+                    timeout=httpx.Timeout(LLM_TIMEOUT, connect=LLM_CONNECT_TIMEOUT),
+                )
+            return self._http_client
+
+    def get(self, model_name: str, provider: str = "openai"):
+        key = (provider, model_name)
+        if key in self._models:
+            return self._models[key]
+        http_client = self.http_client()
+        with self._lock:
+            if key not in self._models:
+                self._models[key] = _build_model(provider, model_name, http_client)
+            return self._models[key]
+
+    def open_connections(self, count: int = LLM_WARM_CONNECTIONS) -> int:
+        """Pre‑establish ``count`` pooled TLS connections per provider in use.
+
+        Issues cheap concurrent ``GET /models`` requests to each provider the
+        registered models talk to (OpenAI if none are registered yet), so the
+        handshakes are paid at startup; returns how many succeeded. Providers
+        without an API key are skipped. Failures are logged only.
+        """
+        http_client = self.http_client()
+        with self._lock:
+            providers = sorted({provider for provider, _ in self._models}) or ["openai"]
+        targets = []
+        for provider in providers:
+            base_url, key_env = PROVIDER_ENDPOINTS[provider]
+            api_key = os.getenv(key_env)
+            if not api_key:
+                print(f"LLM connection warm‑up: {key_env} is not set, skipping {provider}")
+                continue
+            targets += [(base_url, {"Authorization": f"Bearer {api_key}"})] * count
+
+        def ping(target):
+            base_url, headers = target
+            try:
+                http_client.get(f"{base_url}/models", headers=headers)
+                return True
+            except httpx.HTTPError as e:
+                print("❌ LLM connection warm‑up failed:", e)
+                return False
+
+        if count <= 0 or not targets:
+            return 0
+        with ThreadPoolExecutor(max_workers=len(targets)) as pool:
+            return sum(pool.map(ping, targets))
+
+    def close(self) -> None:
+        with self._lock:
+            if self._http_client is not None:
+                self._http_client.close()
+            self._http_client = None
+            self._models.clear()
+
+
+registry = LLMRegistry()
+
 
 class LLMModel:
-    def __init__(self, model_name="gpt-4o"):
+    def __init__(self, model_name="gpt-4o", provider="openai"):
         if not model_name:
             raise ValueError("Model is not defined.")
         self.model_name = model_name
-        self.openai_model=ChatOpenAI(model=self.model_name)
-        
+        self.openai_model = registry.get(self.model_name, provider)
+
     def get_model(self):
         return self.openai_model
 
 if __name__ == "__main__":
-    llm_instance = LLMModel()  
+    llm_instance = LLMModel()
     llm_model = llm_instance.get_model()
     response=llm_model.invoke("hi")
 
-    print(response)
\ No newline at end of file
+    print(response)
@@ -0,0 +1,178 @@
+import os
+import sys
+import tracemalloc
+
+# enables tracemalloc at startup and the GET /debug/memory report
+MEMORY_DIAGNOSTICS = os.getenv("MEMORY_DIAGNOSTICS", "false").lower() in ("1", "true", "yes")
+# stack depth kept per allocation; more frames attribute better but cost more
+TRACEMALLOC_FRAMES = int(os.getenv("TRACEMALLOC_FRAMES", "1"))
+
+_baseline: tracemalloc.Snapshot | None = None
+
+
+def start() -> None:
+    if not tracemalloc.is_tracing():
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    reset_baseline()
+
+
+def reset_baseline() -> None:
+    """Snapshot that later allocation reports are diffed against."""
+    global _baseline
+    if tracemalloc.is_tracing():
+        _baseline = tracemalloc.take_snapshot()
+
+
+def rss_bytes() -> int:
+    """Current resident set size (peak RSS where /proc is unavailable)."""
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def allocation_report(top: int = 15, group_by: str = "lineno") -> dict:
+    """Python heap now, and the allocation sites that grew most since :func:`start`."""
+    if not tracemalloc.is_tracing():
+        return {"tracing": False}
+    snapshot = tracemalloc.take_snapshot().filter_traces(
+        [tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, "<frozen importlib._bootstrap*>")]
+    )
+    current, peak = tracemalloc.get_traced_memory()
+    stats = snapshot.compare_to(_baseline, group_by) if _baseline else snapshot.statistics(group_by)
+    return {
+        "tracing": True,
+        "traced_bytes": current,
+        "traced_peak_bytes": peak,
+        "top_growth": [
+            {
+                "where": str(stat.traceback[0]),
+                "bytes": stat.size,
+                "bytes_diff": getattr(stat, "size_diff", stat.size),
+                "blocks": stat.count,
+            }
+            for stat in stats[:top]
+        ],
+    }
+
+
+# ----------------------------------------------------------------------
+# checkpoint accounting
+# ----------------------------------------------------------------------
+
+
+def _memory_saver_threads(saver) -> dict[str, dict]:
+    """Bytes held by an InMemorySaver, per thread, without deserialising.
+
+    ``history_bytes`` are channel values of superseded checkpoints: every
+    turn stores a full new copy of the message list, so this is what grows.
+    """
+    threads: dict[str, dict] = {}
+
+    def entry(thread):
+        return threads.setdefault(thread, {
+            "checkpoints": 0, "checkpoint_bytes": 0, "blob_bytes": 0, "write_bytes": 0, "live_bytes": 0,
+        })
+
+    latest: dict[str, tuple] = {}
+    for thread, namespaces in list(saver.storage.items()):
+        for ns, checkpoints in list(namespaces.items()):
+            for checkpoint_id, (checkpoint, metadata, _) in list(checkpoints.items()):
+                e = entry(thread)
+                e["checkpoints"] += 1
+                e["checkpoint_bytes"] += len(checkpoint[1]) + len(metadata[1])
+            if ns == "" and checkpoints:
+                latest[thread] = checkpoints[max(checkpoints)][0]
+    for (thread, _, _, _), (_, data) in list(saver.blobs.items()):
+        entry(thread)["blob_bytes"] += len(data)
+    for (thread, _, _), writes in list(saver.writes.items()):
+        entry(thread)["write_bytes"] += sum(len(value[1]) for _, _, value, _ in list(writes.values()))
+    for thread, checkpoint in latest.items():
+        versions = saver.serde.loads_typed(checkpoint)["channel_versions"]
+        threads[thread]["live_bytes"] = sum(
+            len(saver.blobs.get((thread, "", channel, version), ("", b""))[1])
+            for channel, version in versions.items()
+        )
+    for e in threads.values():
+        e["bytes"] = e["checkpoint_bytes"] + e["blob_bytes"] + e["write_bytes"]
+        e["history_bytes"] = e["blob_bytes"] - e["live_bytes"]
+    return threads
+
+
+def _sqlite_saver_threads(saver) -> dict[str, dict]:
+    threads: dict[str, dict] = {}
+    with saver.lock:
+        rows = saver.conn.execute(
+            "SELECT thread_id, COUNT(*), SUM(LENGTH(checkpoint) + LENGTH(metadata)) FROM checkpoints GROUP BY thread_id"
+        ).fetchall()
+        write_rows = saver.conn.execute(
+            "SELECT thread_id, SUM(LENGTH(value)) FROM writes GROUP BY thread_id"
+        ).fetchall()
+    for thread, count, size in rows:
+        threads[thread] = {"checkpoints": count, "checkpoint_bytes": size or 0, "write_bytes": 0}
+    for thread, size in write_rows:
+        threads.setdefault(thread, {"checkpoints": 0, "checkpoint_bytes": 0})["write_bytes"] = size or 0
+    for e in threads.values():
+        e["bytes"] = e["checkpoint_bytes"] + e["write_bytes"]
+    return threads
+
+
+def checkpoint_report(saver, top: int = 20) -> dict:
+    """Checkpoint storage per thread and per checkpoint, largest threads first."""
+    from langgraph.checkpoint.memory import InMemorySaver
+
+    if isinstance(saver, InMemorySaver):
+        threads = _memory_saver_threads(saver)
+    elif hasattr(saver, "conn"):
+        threads = _sqlite_saver_threads(saver)
+    else:
+        return {"supported": False, "saver": type(saver).__name__}
+    total = sum(e["bytes"] for e in threads.values())
+    checkpoints = sum(e["checkpoints"] for e in threads.values())
+    report = {
+        "saver": type(saver).__name__,
+        "threads": len(threads),
+        "checkpoints": checkpoints,
+        "bytes": total,
+        "bytes_per_thread": total // len(threads) if threads else 0,
+        "bytes_per_checkpoint": total // checkpoints if checkpoints else 0,
+        "largest_threads": dict(sorted(threads.items(), key=lambda kv: kv[1]["bytes"], reverse=True)[:top]),
+    }
+    if "history_bytes" in next(iter(threads.values()), {}):
+        report["history_bytes"] = sum(e["history_bytes"] for e in threads.values())
+    return report
+
+
+def message_type_report(saver, thread_ids) -> dict[str, dict]:
+    """Serialized size of the live message lists, per message type."""
+    types: dict[str, dict] = {}
+    for thread in thread_ids:
+        state = saver.get_tuple({"configurable": {"thread_id": thread, "checkpoint_ns": ""}})
+        if state is None:
+            continue
+        for message in state.checkpoint["channel_values"].get("messages", []):
+            key = message.type + (f":{message.name}" if getattr(message, "name", None) else "")
+            entry = types.setdefault(key, {"messages": 0, "bytes": 0})
+            entry["messages"] += 1
+            entry["bytes"] += len(saver.serde.dumps_typed(message)[1])
+    return dict(sorted(types.items(), key=lambda kv: kv[1]["bytes"], reverse=True))
+
+
+def memory_report(saver=None, top: int = 20, message_threads: int = 200) -> dict:
+    """Everything /debug/memory returns; message types are sampled from the
+    ``message_threads`` largest threads."""
+    report = {"rss_bytes": rss_bytes(), "allocations": allocation_report(top)}
+    if saver is not None:
+        checkpoints = checkpoint_report(saver, top=max(top, message_threads))
+        threads = list(checkpoints.get("largest_threads", {}))
+        report["message_types"] = message_type_report(saver, threads[:message_threads])
+        checkpoints["largest_threads"] = dict(list(checkpoints.get("largest_threads", {}).items())[:top])
+        report["checkpoints"] = checkpoints
+    return report
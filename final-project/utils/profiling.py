@@ -0,0 +1,131 @@
+import cProfile
+import json
+import os
+import pstats
+import random
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from datetime import datetime
+
+# where .prof (pstats) and .json breakdowns of profiled requests are written
+PROFILE_DIR = os.getenv("PROFILE_DIR", "profiles")
+# fraction of /execute requests profiled without being asked (0 = none)
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+# honour the "X-Profile: 1" request header; off by default since it writes files
+PROFILE_ALLOW_HEADER = os.getenv("PROFILE_ALLOW_HEADER", "false").lower() in ("1", "true", "yes")
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STDLIB_DIR = os.path.dirname(os.__file__).replace("\\", "/")
+
+# top-level package (or stdlib module) -> category
+PACKAGE_CATEGORIES = {
+    "network": {"httpx", "httpcore", "h11", "h2", "anyio", "ssl", "socket", "selectors", "certifi"},
+    "llm_client": {"openai", "groq", "tiktoken"},
+    "langgraph": {"langgraph"},
+    "langchain": {"langchain", "langchain_core", "langchain_openai", "langchain_groq", "langsmith"},
+    "pydantic": {"pydantic", "pydantic_core", "annotated_types"},
+    "pandas": {"pandas", "numpy"},
+    "waiting": {"threading", "queue", "concurrent"},
+}
+_CATEGORY_OF = {package: category for category, packages in PACKAGE_CATEGORIES.items() for package in packages}
+
+# cProfile hooks one thread, but only one profiler should run at a time
+_active = threading.Lock()
+
+
+def _category(filename: str, name: str) -> str:
+    if filename == "~":  # C functions: classify by the object they belong to
+        if any(key in name for key in ("_ssl.", "socket", "select", "poll")):
+            return "network"
+        if "acquire" in name or "sleep" in name or "wait" in name:
+            return "waiting"
+        return "builtins"
+    path = filename.replace("\\", "/")
+    if path.startswith(PROJECT_DIR.replace("\\", "/")) and "site-packages" not in path:
+        return "app"
+    if "site-packages/" in path:
+        package = path.split("site-packages/", 1)[1].split("/", 1)[0]
+        return _CATEGORY_OF.get(package.split(".")[0], "other")
+    if path.startswith(STDLIB_DIR):
+        package = path[len(STDLIB_DIR):].lstrip("/").split("/", 1)[0].rsplit(".", 1)[0]
+        return _CATEGORY_OF.get(package, "stdlib")
+    return "other"
+
+
+def breakdown(stats: pstats.Stats) -> dict[str, float]:
+    """Self time per category in milliseconds, largest first."""
+    totals: dict[str, float] = {}
+    for (filename, _, name), (_, _, tottime, _, _) in stats.stats.items():
+        category = _category(filename, name)
+        totals[category] = totals.get(category, 0.0) + tottime * 1000
+    return dict(sorted(((k, round(v, 1)) for k, v in totals.items()), key=lambda kv: kv[1], reverse=True))
+
+
+class RequestProfile:
+    """Result of one profiled request: wall/CPU time, category breakdown, files."""
+
+    def __init__(self, label: str):
+        self.id = f"{datetime.now():%Y%m%d-%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.label = label
+        self.wall_ms = 0.0
+        self.cpu_ms = 0.0
+        self.categories: dict[str, float] = {}
+        self.path: str | None = None
+
+    def save(self, profiler: cProfile.Profile) -> None:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        base = os.path.join(PROFILE_DIR, self.id)
+        profiler.dump_stats(f"{base}.prof")
+        self.categories = breakdown(pstats.Stats(profiler))
+        with open(f"{base}.json", "w") as f:
+            json.dump(
+                {"id": self.id, "label": self.label, "wall_ms": self.wall_ms,
+                 "cpu_ms": self.cpu_ms, "categories_ms": self.categories},
+                f,
+                indent=2,
+            )
+        self.path = f"{base}.prof"
+
+    def header(self) -> str:
+        """One-line summary for the X-Profile-Summary response header."""
+        parts = [f"wall={self.wall_ms:.0f}ms", f"cpu={self.cpu_ms:.0f}ms"]
+        parts += [f"{category}={ms:.0f}ms" for category, ms in self.categories.items()]
+        return " ".join(parts) + f"; id={self.id}"
+
+
+def should_profile(header_value: str | None) -> bool:
+    if PROFILE_ALLOW_HEADER and header_value and header_value.lower() in ("1", "true", "yes"):
+        return True
+    return PROFILE_SAMPLE_RATE > 0 and random.random() < PROFILE_SAMPLE_RATE
+
+
+@contextmanager
+def profile_request(header_value: str | None, label: str = ""):
+    """Profile the block with cProfile if requested or sampled.
+
+    Yields a :class:`RequestProfile` that is filled in on exit, or ``None``
+    when the request is not profiled (or another profile is running).
+    Only the calling thread is profiled; tool calls that LangGraph fans
+    out to its executor show up as waiting time.
+    """
+    if not should_profile(header_value) or not _active.acquire(blocking=False):
+        yield None
+        return
+    profile = RequestProfile(label)
+    profiler = cProfile.Profile()
+    wall, cpu = time.perf_counter(), time.thread_time()
+    try:
+        profiler.enable()
+        try:
+            yield profile
+        finally:
+            # saved for failed runs too: timeouts are often the slow turns
+            profiler.disable()
+            profile.wall_ms = (time.perf_counter() - wall) * 1000
+            profile.cpu_ms = (time.thread_time() - cpu) * 1000
+            profile.save(profiler)
+            print(f"profile {profile.id}: {profile.header()}")
+    finally:
+        _active.release()
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from toolkit.slot_store import RETENTION_DAYS, get_slot_store
+from utils.llms import registry
+
+
+class Readiness:
+    """Tracks startup steps; the service is ready once every step has passed."""
+
+    STEPS = ("slot_store", "graphs", "llm_connections", "synthetic_turn")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.steps: dict[str, dict] = {step: {"done": False} for step in self.STEPS}
+        self.error: str | None = None
+
+    @property
+    def ready(self) -> bool:
+        with self._lock:
+            return self.error is None and all(s["done"] for s in self.steps.values())
+
+    def mark(self, step: str, seconds: float, **details) -> None:
+        with self._lock:
+            self.steps[step] = {"done": True, "seconds": round(seconds, 3), **details}
+        print(f"warm‑up: {step} done in {seconds:.2f}s", details or "")
+
+    def fail(self, step: str, error: Exception) -> None:
+        with self._lock:
+            self.error = f"{step}: {error}"
+        print(f"❌ warm‑up: {step} failed:", error)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "ready": self.error is None and all(s["done"] for s in self.steps.values()),
+                "error": self.error,
+                "steps": {name: dict(step) for name, step in self.steps.items()},
+            }
+
+
+def synthetic_turns(agent_cls) -> None:
+    """Drive one information turn (with a real tool call) and one booking turn
+    through a separately compiled agent backed by a scripted model.
+
+    Exercises prompt templates, tool schemas, pydantic validation and the
+    slot store read path without network I/O or touching bookings.
+    """
+    from langchain_core.messages import AIMessage, HumanMessage
+    from langgraph.checkpoint.memory import MemorySaver
+
+    from utils.fake_llm import ScriptedChatModel
+
+    store = get_slot_store()
+    some_date = next(iter(store.dates()), "01-01-2025")
+    specialization = next(iter(store.doctors.values()), "general_dentist")
+
+    fake = ScriptedChatModel(
+        responses=[
+            AIMessage(
+                content="",
+                tool_calls=[{
+                    "name": "check_availability_by_specialization",
+                    "args": {"desired_date": {"date": some_date}, "specialization": specialization},
+                    "id": "warmup-call",
+                }],
+            ),
+            AIMessage(content="warm‑up information reply"),
+            AIMessage(content="warm‑up booking reply"),
+        ],
+        routes=[
+            {"next": "information_node", "reasoning": "warm‑up"},
+            {"next": "booking_node", "reasoning": "warm‑up"},
+        ],
+    )
+    agent = agent_cls(memory=MemorySaver(), llm_model=fake)
+    for text in ("warm‑up availability question", "warm‑up booking question"):
+        agent.invoke(
+            {
+                "messages": [HumanMessage(content=text)],
+                "id_number": 1000000,
+                "next": "",
+                "query": "",
+                "current_reasoning": "",
+                "follow_up_needed": False,
+            },
+            thread_id="warm-up",
+        )
+
+
+def warm_up(agent_cls, readiness: Readiness):
+    """Run every startup step in order and return the compiled agent."""
+    agent = None
+    step = "slot_store"
+    try:
+        started = time.perf_counter()
+        store = get_slot_store()
+        if RETENTION_DAYS:
+            store.apply_retention(int(RETENTION_DAYS))
+        store.index_patients()
+        store.start_watcher()
+        readiness.mark(step, time.perf_counter() - started, doctors=len(store.doctors), days=len(store.dates()))
+
+        step = "graphs"
+        started = time.perf_counter()
+        agent = agent_cls()
+        readiness.mark(step, time.perf_counter() - started)
+
+        step = "llm_connections"
+        started = time.perf_counter()
+        opened = registry.open_connections()
+        readiness.mark(step, time.perf_counter() - started, opened=opened)
+
+        step = "synthetic_turn"
+        started = time.perf_counter()
+        synthetic_turns(agent_cls)
+        readiness.mark(step, time.perf_counter() - started)
+    except Exception as e:
+        readiness.fail(step, e)
+    return agent
@@ -0,0 +1,122 @@
+"""FAISS index types for the corpus: exact (flat) or approximate (IVF, HNSW, IVF-PQ),
+storing float32, float16 or int8 scalar-quantized vectors."""
+
+from typing import Optional, Tuple
+import faiss
+import numpy as np
+
+INDEX_TYPES = ("flat", "ivf", "hnsw", "ivfpq")
+# vector storage: bytes per dimension 4, 2 and 1
+PRECISIONS = {
+    "float32": None,
+    "float16": faiss.ScalarQuantizer.QT_fp16,
+    "int8": faiss.ScalarQuantizer.QT_8bit,
+}
+
+
+def build_index(index_type: str, dim: int, precision: str = "float32", nlist: int = 1024, pq_m: int = 64,
+                pq_bits: int = 8, hnsw_m: int = 32, ef_construction: int = 80) -> faiss.Index:
+    """
+    Create an empty L2 index (the metric LangChain's FAISS store uses).
+    
+    Args:
+        index_type: "flat" (exact), "ivf" (inverted lists over a trained
+            coarse quantizer), "hnsw" (graph) or "ivfpq" (IVF with
+            product-quantized codes, pq_m * pq_bits / 8 bytes per vector)
+        dim: Embedding dimension
+        precision: "float32", "float16" or "int8" (scalar quantizer with
+            per-dimension ranges learnt in training); not for "ivfpq"
+        nlist: IVF lists (coarse centroids)
+        pq_m: PQ sub-quantizers; must divide dim
+        pq_bits: Bits per PQ sub-quantizer code
+        hnsw_m: HNSW neighbours per node
+        ef_construction: HNSW candidate list size while adding
+        
+    Returns:
+        FAISS index; IVF types and int8 must be trained (see train_index) before adding
+    """
+    if precision not in PRECISIONS:
+        raise ValueError(f"Unknown precision {precision!r}, expected one of {tuple(PRECISIONS)}")
+    qtype = PRECISIONS[precision]
+    if index_type == "flat":
+        return faiss.IndexFlatL2(dim) if qtype is None else faiss.IndexScalarQuantizer(dim, qtype, faiss.METRIC_L2)
+    if index_type == "ivf":
+        if qtype is None:
+            return faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, nlist)
+        return faiss.IndexIVFScalarQuantizer(faiss.IndexFlatL2(dim), dim, nlist, qtype, faiss.METRIC_L2)
+    if index_type == "ivfpq":
+        if qtype is not None:
+            raise ValueError("ivfpq already compresses vectors; use precision float32")
+        return faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, nlist, pq_m, pq_bits)
+    if index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, hnsw_m) if qtype is None else faiss.IndexHNSWSQ(dim, qtype, hnsw_m)
+        index.hnsw.efConstruction = ef_construction
+        return index
+    raise ValueError(f"Unknown index type {index_type!r}, expected one of {INDEX_TYPES}")
+
+
+def train_index(index: faiss.Index, vectors: np.ndarray, max_train: int = 100_000, seed: int = 0):
+    """Train an index's quantizers on (a sample of) the vectors; no-op for float32/float16 flat and HNSW."""
+    if index.is_trained:
+        return
+    if len(vectors) > max_train:
+        vectors = vectors[np.random.default_rng(seed).choice(len(vectors), max_train, replace=False)]
+    index.train(np.ascontiguousarray(vectors, dtype=np.float32))
+
+
+def set_search_params(index: faiss.Index, nprobe: Optional[int] = None, ef_search: Optional[int] = None):
+    """
+    Set the defaults an index searches with.
+    
+    Args:
+        index: Index from build_index
+        nprobe: IVF lists visited per query (more: better recall, slower)
+        ef_search: HNSW candidate list size per query (more: better recall, slower)
+    """
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None and nprobe is not None:
+        ivf.nprobe = nprobe
+    if isinstance(index, faiss.IndexHNSW) and ef_search is not None:
+        index.hnsw.efSearch = ef_search
+
+
+def enable_reconstruct(index: faiss.Index):
+    """Let an IVF index look vectors up by id (reconstruct), which MMR and the index cache need."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        ivf.make_direct_map()
+
+
+def search_parameters(index: faiss.Index, selector: faiss.IDSelector) -> faiss.SearchParameters:
+    """Per-query parameters restricting a search to selector, keeping the index's nprobe/efSearch."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if ivf is not None:
+        return faiss.SearchParametersIVF(sel=selector, nprobe=ivf.nprobe)
+    if isinstance(index, faiss.IndexHNSW):
+        return faiss.SearchParametersHNSW(sel=selector, efSearch=index.hnsw.efSearch)
+    return faiss.SearchParameters(sel=selector)
+
+
+def index_kind(index: faiss.Index) -> Tuple[str, str]:
+    """The (index_type, precision) build_index would take to create an index like this one."""
+    ivf = faiss.try_extract_index_ivf(index)
+    if isinstance(index, faiss.IndexHNSW):
+        index_type, storage = "hnsw", faiss.downcast_index(index.storage)
+    elif ivf is not None:
+        storage = faiss.downcast_index(ivf)
+        index_type = "ivfpq" if isinstance(storage, faiss.IndexIVFPQ) else "ivf"
+    else:
+        index_type, storage = "flat", index
+    qtype = storage.sq.qtype if hasattr(storage, "sq") else None
+    precision = next((name for name, value in PRECISIONS.items() if value == qtype), "float32")
+    return index_type, precision
+
+
+def is_exact(index: faiss.Index) -> bool:
+    """Whether the index keeps full vectors, so reconstruct returns them unchanged."""
+    return index_kind(index) in (("flat", "float32"), ("ivf", "float32"), ("hnsw", "float32"))
+
+
+def index_bytes(index: faiss.Index) -> int:
+    """Serialized size of the index, a close proxy for its memory footprint."""
+    return faiss.serialize_index(index).nbytes
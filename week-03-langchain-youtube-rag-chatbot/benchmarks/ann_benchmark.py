@@ -0,0 +1,119 @@
+"""Recall, latency, build time and memory of the ANN index types against flat search.
+
+Builds each index type from ann_index over a synthetic, clustered corpus
+(embeddings of transcript chunks are far from uniform) and compares the
+top-k of held-out queries with exact flat search, for a range of
+nprobe / efSearch values.
+
+    python benchmarks/ann_benchmark.py
+    python benchmarks/ann_benchmark.py --sizes 10000,100000 --dim 256 --nprobe 8,32 --ef-search 32,128
+
+At the default --dim 1536 (text-embedding-3-small), 1M chunks are 6 GB of
+float32 vectors before any index is built; use --dim to scale down.
+"""
+
+import argparse
+import math
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+os.environ.setdefault("OPENAI_API_KEY", "ann-benchmark")
+
+import faiss  # noqa: E402
+import numpy as np  # noqa: E402
+
+import ann_index  # noqa: E402
+import config  # noqa: E402
+
+MB = 1024 * 1024
+
+
+def synthetic_corpus(size: int, dim: int, queries: int, seed: int = 0):
+    """Unit vectors scattered around size // 1000 topic centres, plus queries drawn the same way."""
+    rng = np.random.default_rng(seed)
+    centres = rng.standard_normal((max(1, size // 1000), dim)).astype(np.float32)
+
+    def draw(n):
+        out = np.empty((n, dim), dtype=np.float32)
+        for start in range(0, n, 100_000):
+            stop = min(n, start + 100_000)
+            picked = centres[rng.integers(0, len(centres), stop - start)]
+            out[start:stop] = picked + rng.standard_normal((stop - start, dim), dtype=np.float32)
+        faiss.normalize_L2(out)
+        return out
+
+    return draw(size), draw(queries)
+
+
+def latency_ms(index: faiss.Index, queries: np.ndarray, k: int):
+    """Search one query at a time, like the app does; returns (mean, p95) ms and the results."""
+    times, found = [], []
+    for query in queries:
+        started = time.perf_counter()
+        found.append(index.search(query[None, :], k)[1][0])
+        times.append((time.perf_counter() - started) * 1000)
+    return float(np.mean(times)), float(np.percentile(times, 95)), np.asarray(found)
+
+
+def recall(found: np.ndarray, truth: np.ndarray) -> float:
+    k = truth.shape[1]
+    return float(np.mean([len(set(f) & set(t)) / k for f, t in zip(found, truth)]))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="10000,100000,1000000", help="comma-separated corpus sizes (chunks)")
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--types", default="ivf,hnsw,ivfpq", help="index types to compare with flat")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=config.RETRIEVAL_K)
+    parser.add_argument("--nlist", type=int, default=0, help="IVF lists (default: 4 * sqrt(size))")
+    parser.add_argument("--nprobe", default="4,16,64")
+    parser.add_argument("--ef-search", default="16,64,256")
+    parser.add_argument("--pq-m", type=int, default=config.PQ_M)
+    parser.add_argument("--hnsw-m", type=int, default=config.HNSW_M)
+    args = parser.parse_args()
+
+    print(f"{'chunks':>9} {'index':<12} {'search':<14} {'build s':>8} {'MB':>8} {'mean ms':>8} {'p95 ms':>8} "
+          f"{'recall@' + str(args.k):>9}")
+    for size in (int(s) for s in args.sizes.split(",")):
+        base, queries = synthetic_corpus(size, args.dim, args.queries)
+
+        started = time.perf_counter()
+        flat = ann_index.build_index("flat", args.dim)
+        flat.add(base)
+        build_s = time.perf_counter() - started
+        mean_ms, p95_ms, truth = latency_ms(flat, queries, args.k)
+        print(f"{size:>9,} {'flat':<12} {'exact':<14} {build_s:>8.2f} {ann_index.index_bytes(flat) / MB:>8.1f} "
+              f"{mean_ms:>8.3f} {p95_ms:>8.3f} {1.0:>9.3f}")
+        del flat
+
+        nlist = args.nlist or int(4 * math.sqrt(size))
+        for index_type in args.types.split(","):
+            started = time.perf_counter()
+            index = ann_index.build_index(index_type, args.dim, nlist=nlist, pq_m=args.pq_m, hnsw_m=args.hnsw_m,
+                                          ef_construction=config.HNSW_EF_CONSTRUCTION)
+            ann_index.train_index(index, base)
+            index.add(base)
+            build_s = time.perf_counter() - started
+            size_mb = ann_index.index_bytes(index) / MB
+            if index_type == "hnsw":
+                settings = [(f"efSearch={ef}", {"ef_search": int(ef)}) for ef in args.ef_search.split(",")]
+            else:
+                settings = [(f"nprobe={n}", {"nprobe": int(n)}) for n in args.nprobe.split(",")]
+            name = f"{index_type}{nlist}" if index_type != "hnsw" else f"hnsw{args.hnsw_m}"
+            for label, params in settings:
+                ann_index.set_search_params(index, **params)
+                mean_ms, p95_ms, found = latency_ms(index, queries, args.k)
+                print(f"{size:>9,} {name:<12} {label:<14} {build_s:>8.2f} {size_mb:>8.1f} "
+                      f"{mean_ms:>8.3f} {p95_ms:>8.3f} {recall(found, truth):>9.3f}")
+            del index
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
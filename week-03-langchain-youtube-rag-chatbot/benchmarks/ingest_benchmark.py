@@ -0,0 +1,129 @@
+"""Ingest time for a long transcript: FAISS.from_documents vs batched, concurrent embedding.
+
+Uses a stand-in for the embeddings API whose latency grows with request
+size (``--request-ms`` per call plus ``--per-chunk-ms`` per text) and that
+answers a fraction of calls with HTTP 429, so no API key or network is used.
+
+    python benchmarks/ingest_benchmark.py --chunks 2000
+    python benchmarks/ingest_benchmark.py --chunks 2000 --batch-size 32 --concurrency 8 --rate-limit 0.1
+"""
+
+import argparse
+import hashlib
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+os.environ.setdefault("OPENAI_API_KEY", "ingest-benchmark")
+os.environ["EMBEDDING_CACHE_DIR"] = tempfile.mkdtemp(prefix="embedding-cache-")
+os.environ["INDEX_CACHE_DIR"] = tempfile.mkdtemp(prefix="index-cache-")
+
+import httpx  # noqa: E402
+import numpy as np  # noqa: E402
+import openai  # noqa: E402
+from langchain_community.vectorstores import FAISS  # noqa: E402
+from langchain_core.documents import Document  # noqa: E402
+from langchain_core.embeddings import Embeddings  # noqa: E402
+
+import config  # noqa: E402
+from embedding_cache import truncate  # noqa: E402
+from vector_store_manager import VectorStoreManager  # noqa: E402
+
+DIM = 1536
+
+
+class SlowEmbeddings(Embeddings):
+    """Deterministic vectors with API-like latency and occasional 429s."""
+
+    def __init__(self, request_ms: float, per_chunk_ms: float, rate_limit: float, max_chunks: int = 1000):
+        self.request_ms = request_ms
+        self.per_chunk_ms = per_chunk_ms
+        self.rate_limit = rate_limit
+        self.max_chunks = max_chunks  # OpenAIEmbeddings' default request size
+        self.requests = 0
+        self.rate_limited = 0
+        self._lock = threading.Lock()
+
+    def _request(self, texts):
+        with self._lock:
+            self.requests += 1
+            limited = random.random() < self.rate_limit
+            self.rate_limited += limited
+        time.sleep(self.request_ms / 1000)
+        if limited:
+            request = httpx.Request("POST", "https://api.openai.com/v1/embeddings")
+            response = httpx.Response(429, request=request, headers={"retry-after": "0.2"})
+            raise openai.RateLimitError("rate limited", response=response, body=None)
+        time.sleep(self.per_chunk_ms * len(texts) / 1000)
+        return [
+            np.random.default_rng(int.from_bytes(hashlib.sha256(text.encode()).digest()[:8], "little"))
+            .standard_normal(DIM).tolist()
+            for text in texts
+        ]
+
+    def embed_documents(self, texts):
+        vectors = []
+        for i in range(0, len(texts), self.max_chunks):
+            vectors += self._request(texts[i:i + self.max_chunks])
+        return vectors
+
+    def embed_query(self, text):
+        return self._request([text])[0]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--chunks", type=int, default=2000, help="~1000-char chunks; 2000 is a 5-6 hour video")
+    parser.add_argument("--batch-size", type=int, default=config.EMBEDDING_BATCH_SIZE)
+    parser.add_argument("--concurrency", type=int, default=config.EMBEDDING_CONCURRENCY)
+    parser.add_argument("--request-ms", type=float, default=300.0, help="fixed latency per API call")
+    parser.add_argument("--per-chunk-ms", type=float, default=8.0, help="added latency per text in a call")
+    parser.add_argument("--rate-limit", type=float, default=0.0, help="fraction of calls answered with 429")
+    args = parser.parse_args()
+
+    config.EMBEDDING_BATCH_SIZE = args.batch_size
+    config.EMBEDDING_CONCURRENCY = args.concurrency
+    documents = [Document(page_content=f"chunk {i:06d} " + "lorem ipsum " * 80) for i in range(args.chunks)]
+
+    # baseline: what create_vector_store used to do (no rate limits, or it would just fail)
+    baseline = SlowEmbeddings(args.request_ms, args.per_chunk_ms, 0.0)
+    started = time.perf_counter()
+    reference = FAISS.from_documents(documents, baseline)
+    sequential_s = time.perf_counter() - started
+    print(f"FAISS.from_documents        {sequential_s:7.2f}s  {baseline.requests} requests")
+
+    manager = VectorStoreManager()
+    manager.embeddings.underlying = SlowEmbeddings(args.request_ms, args.per_chunk_ms, args.rate_limit)
+    started = time.perf_counter()
+    store = manager.create_vector_store(documents)
+    batched_s = time.perf_counter() - started
+    fake = manager.embeddings.underlying
+    print(f"batched x{args.concurrency:<2} ({args.batch_size:>4}/batch) {batched_s:7.2f}s  "
+          f"{fake.requests} requests, {fake.rate_limited} rate-limited  -> {sequential_s / batched_s:.1f}x faster")
+
+    # same vectors, whatever order the batches landed in; the queries are embedded by the
+    # baseline, as store.similarity_search would go through the rate-limited stand-in
+    probe = [documents[i].page_content for i in random.sample(range(args.chunks), min(20, args.chunks))]
+    same = all(
+        reference.similarity_search_by_vector(vector, k=1)[0].page_content
+        == store.similarity_search_by_vector(truncate(vector, config.EMBEDDING_DIMENSIONS).tolist(), k=1)[0].page_content
+        for vector in baseline.embed_documents(probe)
+    )
+    print(f"index size {store.index.ntotal}, nearest neighbours match baseline: {same}")
+
+    manager.embeddings.underlying = SlowEmbeddings(args.request_ms, args.per_chunk_ms, 0.0)
+    started = time.perf_counter()
+    manager.create_vector_store(documents)
+    print(f"re-ingest (embedding cache)  {time.perf_counter() - started:7.2f}s  "
+          f"{manager.embeddings.underlying.requests} requests")
+    return 0 if same and store.index.ntotal == args.chunks else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,107 @@
+"""Memory, recall and latency of reduced-precision and truncated embeddings.
+
+Stores the corpus as float32, float16 and int8 (scalar-quantized) vectors,
+each at several Matryoshka truncations, and compares the top-k of held-out
+queries with exact search over the full float32 vectors.
+
+    python benchmarks/precision_benchmark.py --size 100000
+    python benchmarks/precision_benchmark.py --dims 1536,512,256 --index-type hnsw
+    python benchmarks/precision_benchmark.py --embedding-cache embedding_cache/text-embedding-3-small
+
+Synthetic vectors put more variance in the leading dimensions, as
+Matryoshka-trained models do; with --embedding-cache the benchmark runs on
+real embeddings from the app's cache (the last --queries rows are the
+queries), which is the number to trust for truncation.
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+os.environ.setdefault("OPENAI_API_KEY", "precision-benchmark")
+
+import faiss  # noqa: E402
+import numpy as np  # noqa: E402
+
+import ann_index  # noqa: E402
+import config  # noqa: E402
+from ann_benchmark import latency_ms, recall, synthetic_corpus  # noqa: E402
+from embedding_cache import truncate  # noqa: E402
+
+MB = 1024 * 1024
+GB = 1024 * MB
+
+
+def matryoshka_corpus(size: int, dim: int, queries: int):
+    """Clustered unit vectors whose per-dimension spread decays with the dimension index."""
+    base, held_out = synthetic_corpus(size, dim, queries)
+    weights = (1 / np.sqrt(1 + np.arange(dim) / 128)).astype(np.float32)
+    for vectors in (base, held_out):
+        vectors *= weights
+        faiss.normalize_L2(vectors)
+    return base, held_out
+
+
+def cached_embeddings(path: str, queries: int):
+    """Vectors from an EmbeddingCache model directory (vectors.bin + meta.json)."""
+    with open(os.path.join(path, "meta.json")) as f:
+        meta = json.load(f)
+    vectors = np.fromfile(os.path.join(path, "vectors.bin"), dtype=meta["dtype"]).reshape(-1, meta["dim"])
+    vectors = vectors.astype(np.float32)
+    return vectors[:-queries], vectors[-queries:]
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=100_000, help="chunks in the synthetic corpus")
+    parser.add_argument("--dim", type=int, default=1536, help="full embedding dimension (synthetic corpus)")
+    parser.add_argument("--dims", default="1536,1024,512,256", help="truncations to compare")
+    parser.add_argument("--precisions", default="float32,float16,int8")
+    parser.add_argument("--index-type", default="flat", choices=["flat", "ivf", "hnsw"])
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("-k", type=int, default=config.RETRIEVAL_K)
+    parser.add_argument("--embedding-cache", help="benchmark real vectors from an embedding cache model directory")
+    args = parser.parse_args()
+
+    if args.embedding_cache:
+        base, queries = cached_embeddings(args.embedding_cache, args.queries)
+    else:
+        base, queries = matryoshka_corpus(args.size, args.dim, args.queries)
+    full_dim = base.shape[1]
+
+    exact = ann_index.build_index("flat", full_dim)
+    exact.add(base)
+    truth = exact.search(queries, args.k)[1]
+    del exact
+
+    print(f"{len(base):,} chunks, {full_dim} dimensions, {args.index_type} index, recall against float32 x {full_dim}")
+    print(f"{'dims':>5} {'precision':<9} {'B/vector':>9} {'MB':>8} {'chunks/GB':>11} {'build s':>8} "
+          f"{'mean ms':>8} {'p95 ms':>8} {'recall@' + str(args.k):>9}")
+    for dims in (int(d) for d in args.dims.split(",")):
+        if dims > full_dim:
+            continue
+        vectors, probes = truncate(base, dims), truncate(queries, dims)
+        for precision in args.precisions.split(","):
+            started = time.perf_counter()
+            index = ann_index.build_index(args.index_type, dims, precision, nlist=int(4 * np.sqrt(len(vectors))),
+                                          hnsw_m=config.HNSW_M, ef_construction=config.HNSW_EF_CONSTRUCTION)
+            ann_index.train_index(index, vectors)
+            index.add(vectors)
+            ann_index.set_search_params(index, nprobe=config.IVF_NPROBE, ef_search=config.HNSW_EF_SEARCH)
+            build_s = time.perf_counter() - started
+            size = ann_index.index_bytes(index)
+            mean_ms, p95_ms, found = latency_ms(index, probes, args.k)
+            print(f"{dims:>5} {precision:<9} {size / len(vectors):>9.0f} {size / MB:>8.1f} "
+                  f"{GB * len(vectors) / size:>11,.0f} {build_s:>8.2f} {mean_ms:>8.3f} {p95_ms:>8.3f} "
+                  f"{recall(found, truth):>9.3f}")
+            del index
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
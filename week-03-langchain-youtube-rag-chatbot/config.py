@@ -16,10 +16,49 @@ EMBEDDING_MODEL = "text-embedding-3-small"
 LLM_MODEL = "gpt-4o-mini"
 LLM_TEMPERATURE = 0.2
 
+# Embedding cache configuration (chunk embeddings keyed by model + sha256 of the text)
+EMBEDDING_CACHE_DIR = os.getenv("EMBEDDING_CACHE_DIR", "embedding_cache")
+EMBEDDING_CACHE_DTYPE = "float32"  # or "float16" to halve the cache size
+
+# Ingest: chunks per embedding request, requests in flight, retries on rate limits
+EMBEDDING_BATCH_SIZE = 64
+EMBEDDING_CONCURRENCY = 8
+EMBEDDING_MAX_RETRIES = 6
+
+# Per-video FAISS index cache (least recently used indexes are evicted past the limit)
+INDEX_CACHE_DIR = os.getenv("INDEX_CACHE_DIR", "index_cache")
+INDEX_CACHE_MAX_MB = 500
+
+# Corpus index type: "flat" (exact), "ivf", "hnsw" or "ivfpq" (approximate).
+# The corpus stays flat until it holds ANN_MIN_VECTORS chunks, then moves to INDEX_TYPE
+INDEX_TYPE = "flat"
+ANN_MIN_VECTORS = 50_000
+IVF_NLIST = 1024
+IVF_NPROBE = 16  # lists searched per query
+PQ_M = 64  # bytes per vector at 8 bits; must divide the embedding dimension
+PQ_BITS = 8
+HNSW_M = 32
+HNSW_EF_CONSTRUCTION = 80
+HNSW_EF_SEARCH = 64
+# filters (video, time window) matching at most this many chunks are searched exactly
+EXACT_SEARCH_MAX = 5_000
+
+# Vector storage: "float32", "float16" (half the memory) or "int8" (a quarter, scalar-quantized).
+# The first QUANTIZE_MIN_VECTORS chunks stay float32; int8 value ranges are learnt from them
+VECTOR_PRECISION = "float32"
+QUANTIZE_MIN_VECTORS = 1_000
+# Keep the first N embedding dimensions, renormalized (Matryoshka truncation, e.g. 512); None keeps all
+EMBEDDING_DIMENSIONS = None
+
 # Text splitting configuration
 CHUNK_SIZE = 1000
 CHUNK_OVERLAP = 200
 
 # Retrieval configuration
 RETRIEVAL_K = 4
-SEARCH_TYPE = "similarity"
\ No newline at end of file
+SEARCH_TYPE = "similarity"  # "similarity", "mmr" or "hybrid" (BM25 + vector, reciprocal-rank fusion)
+# Hybrid search: candidates taken from each side, RRF damping constant, and the
+# time after which vector results that are not back yet (embedding call) are skipped
+HYBRID_CANDIDATES = 20
+RRF_K = 60
+RETRIEVAL_BUDGET_MS = 500
\ No newline at end of file
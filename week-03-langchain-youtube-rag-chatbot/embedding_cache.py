@@ -0,0 +1,215 @@
+"""Persistent embedding cache keyed by chunk content."""
+
+import hashlib
+import json
+import os
+import re
+import threading
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+import numpy as np
+from langchain_core.embeddings import Embeddings
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process locking, one app process per cache
+    fcntl = None
+
+KEY_BYTES = 32  # sha256 digest
+# flock'ed while reading the file sizes and appending
+LOCK_FILE = ".lock"
+
+
+def truncate(vectors, dimensions: Optional[int]) -> np.ndarray:
+    """
+    Shorten embeddings Matryoshka-style: keep the leading dimensions, renormalize.
+
+    text-embedding-3 models are trained so that a prefix of the vector is a
+    usable embedding; this matches what the API's ``dimensions`` parameter
+    returns.
+
+    Args:
+        vectors: Embeddings, one per row
+        dimensions: Dimensions to keep (None: all)
+
+    Returns:
+        float32 array of shape (len(vectors), dimensions)
+    """
+    array = np.asarray(vectors, dtype=np.float32)
+    if dimensions is None or dimensions >= array.shape[-1]:
+        return array
+    array = array[..., :dimensions]
+    norms = np.linalg.norm(array, axis=-1, keepdims=True)
+    return array / np.where(norms == 0, 1, norms)
+
+
+class EmbeddingCache:
+    """Append-only on-disk store of embeddings, one directory per model.
+
+    ``vectors.bin`` holds the vectors as a flat float32/float16 array that is
+    memory-mapped for reads; ``keys.bin`` holds the sha256 digests of the
+    chunk texts in the same row order. Rows are written vector first, key
+    second, so a key on disk always has its vector.
+
+    Several processes (or app instances) may share a directory: appends
+    hold an flock on its lock file and number their rows from the file
+    sizes, after indexing rows the others have appended.
+    """
+
+    def __init__(self, cache_dir: str, model: str, dtype: str = "float32"):
+        self.dir = os.path.join(cache_dir, re.sub(r"[^A-Za-z0-9_.-]", "_", model))
+        os.makedirs(self.dir, exist_ok=True)
+        self.model = model
+        self._vectors_path = os.path.join(self.dir, "vectors.bin")
+        self._keys_path = os.path.join(self.dir, "keys.bin")
+        self._meta_path = os.path.join(self.dir, "meta.json")
+        self._lock_path = os.path.join(self.dir, LOCK_FILE)
+        self._lock = threading.Lock()
+        self._index: Dict[bytes, int] = {}
+        self._rows = 0  # rows of the files indexed so far
+        self._mmap: Optional[np.memmap] = None
+        self.dtype = np.dtype(dtype)
+        self.dim: Optional[int] = None
+        with self._file_lock():
+            self._sync()
+
+    @contextmanager
+    def _file_lock(self):
+        with open(self._lock_path, "a") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+        # closing the file releases the flock
+
+    def _sync(self):
+        """Index rows appended since the last look, by any process (call with the file lock held)."""
+        if self.dim is None and os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                meta = json.load(f)
+            # an existing cache keeps the dtype it was written with
+            self.dtype = np.dtype(meta["dtype"])
+            self.dim = meta["dim"]
+        if not self.dim:
+            return
+        row_bytes = self.dim * self.dtype.itemsize
+        files = ((self._keys_path, KEY_BYTES), (self._vectors_path, row_bytes))
+        sizes = [os.path.getsize(path) if os.path.exists(path) else 0 for path, _ in files]
+        rows = min(size // width for size, (_, width) in zip(sizes, files))
+        # drop a row half-written by an interrupted run (no one else is writing)
+        for size, (path, width) in zip(sizes, files):
+            if size != rows * width:
+                os.truncate(path, rows * width)
+        if rows > self._rows:
+            with open(self._keys_path, "rb") as f:
+                f.seek(self._rows * KEY_BYTES)
+                keys = f.read((rows - self._rows) * KEY_BYTES)
+            for i in range(rows - self._rows):
+                self._index.setdefault(keys[i * KEY_BYTES:(i + 1) * KEY_BYTES], self._rows + i)
+            self._rows = rows
+
+    @staticmethod
+    def key(text: str) -> bytes:
+        return hashlib.sha256(text.encode("utf-8")).digest()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _vectors(self) -> np.ndarray:
+        rows = self._rows
+        if self._mmap is None or self._mmap.shape[0] < rows:
+            self._mmap = np.memmap(self._vectors_path, dtype=self.dtype, mode="r", shape=(rows, self.dim))
+        return self._mmap
+
+    def get_many(self, keys: List[bytes]) -> List[Optional[List[float]]]:
+        """
+        Look up cached embeddings.
+
+        Args:
+            keys: Digests from :meth:`key`
+
+        Returns:
+            One embedding (or None on a miss) per key
+        """
+        with self._lock:
+            rows = [self._index.get(k) for k in keys]
+            if all(row is None for row in rows):
+                return [None] * len(keys)
+            vectors = self._vectors()
+            return [None if row is None else vectors[row].astype(np.float32).tolist() for row in rows]
+
+    def put_many(self, keys: List[bytes], embeddings: List[List[float]]) -> List[List[float]]:
+        """
+        Append new embeddings to the cache.
+
+        Args:
+            keys: Digests from :meth:`key`
+            embeddings: Embedding for each key
+
+        Returns:
+            The embeddings as stored (rounded to the cache dtype), so a
+            miss returns exactly what a later hit will
+        """
+        with self._lock, self._file_lock():
+            self._sync()
+            array = np.asarray(embeddings, dtype=self.dtype)
+            if self.dim is None:
+                self.dim = array.shape[1]
+                with open(self._meta_path, "w") as f:
+                    json.dump({"model": self.model, "dim": self.dim, "dtype": self.dtype.name}, f)
+            new = {}
+            for i, k in enumerate(keys):
+                if k not in self._index and k not in new:
+                    new[k] = i
+            if new:
+                # _sync left both files exactly self._rows rows long
+                with open(self._vectors_path, "ab") as f:
+                    f.write(array[list(new.values())].tobytes())
+                with open(self._keys_path, "ab") as f:
+                    f.write(b"".join(new))
+                for offset, k in enumerate(new):
+                    self._index[k] = self._rows + offset
+                self._rows += len(new)
+        return array.astype(np.float32).tolist()
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings wrapper that only sends texts missing from the cache.
+
+    The cache keeps full vectors; with ``dimensions`` set, documents and
+    queries are returned truncated (see :func:`truncate`), so the same cache
+    serves any dimension.
+    """
+
+    def __init__(self, underlying: Embeddings, cache: EmbeddingCache, dimensions: Optional[int] = None):
+        self.underlying = underlying
+        self.cache = cache
+        self.dimensions = dimensions
+        self.hits = 0
+        self.misses = 0
+        self._stats_lock = threading.Lock()  # batches are embedded concurrently
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        keys = [self.cache.key(text) for text in texts]
+        vectors = self.cache.get_many(keys)
+        # embed each distinct missing text once
+        missing: Dict[bytes, str] = {}
+        for k, text, vector in zip(keys, texts, vectors):
+            if vector is None:
+                missing.setdefault(k, text)
+        if missing:
+            stored = self.cache.put_many(list(missing), self.underlying.embed_documents(list(missing.values())))
+            fresh = dict(zip(missing, stored))
+            vectors = [fresh[k] if vector is None else vector for k, vector in zip(keys, vectors)]
+        with self._stats_lock:
+            self.hits += len(texts) - len(missing)
+            self.misses += len(missing)
+        if self.dimensions is not None and vectors:
+            return truncate(vectors, self.dimensions).tolist()
+        return vectors
+
+    def embed_query(self, text: str) -> List[float]:
+        vector = self.underlying.embed_query(text)
+        if self.dimensions is not None:
+            return truncate(vector, self.dimensions).tolist()
+        return vector
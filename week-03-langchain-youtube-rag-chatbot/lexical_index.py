@@ -0,0 +1,130 @@
+"""In-memory BM25 inverted index over transcript chunks."""
+
+from array import array
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import math
+import re
+import numpy as np
+
+# numbers (3.5, 1,000, 12:30) stay whole, so exact-figure questions match
+TOKEN = re.compile(r"\d+(?:[.,:]\d+)*|[^\W\d_]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased word and number tokens."""
+    return TOKEN.findall(text.lower())
+
+
+class BM25Index:
+    """Okapi BM25 over chunks identified by their docstore id.
+    
+    Postings are kept as typed arrays (4-byte chunk number, 2-byte term
+    frequency), so a chunk costs a few bytes per distinct term. Removed
+    chunks are skipped until they outnumber the live ones, then the
+    postings are rebuilt without them.
+    """
+    
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._terms: Dict[str, int] = {}
+        self._postings: List[Tuple[array, array]] = []  # per term: chunk numbers, term frequencies
+        self._ids: List[Optional[str]] = []  # chunk number -> docstore id (None once removed)
+        self._numbers: Dict[str, int] = {}
+        self._lengths = array("I")
+        self._alive = array("B")
+        self._total_length = 0
+    
+    def __len__(self) -> int:
+        return len(self._numbers)
+    
+    def add(self, ids: Sequence[str], texts: Sequence[str]):
+        """Index chunks; an id that is already indexed is replaced."""
+        self.remove([doc_id for doc_id in ids if doc_id in self._numbers])
+        for doc_id, text in zip(ids, texts):
+            number = len(self._ids)
+            self._ids.append(doc_id)
+            self._numbers[doc_id] = number
+            tokens = tokenize(text)
+            self._lengths.append(len(tokens))
+            self._alive.append(1)
+            self._total_length += len(tokens)
+            counts: Dict[str, int] = {}
+            for token in tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                term = self._terms.get(token)
+                if term is None:
+                    term = self._terms[token] = len(self._postings)
+                    self._postings.append((array("I"), array("H")))
+                numbers, frequencies = self._postings[term]
+                numbers.append(number)
+                frequencies.append(min(count, 65535))
+    
+    def remove(self, ids: Iterable[str]):
+        """Drop chunks from search results (and, once enough are gone, from memory)."""
+        for doc_id in ids:
+            number = self._numbers.pop(doc_id, None)
+            if number is not None:
+                self._ids[number] = None
+                self._alive[number] = 0
+                self._total_length -= self._lengths[number]
+        if len(self._ids) - len(self._numbers) > max(len(self._numbers), 1024):
+            self._compact()
+    
+    def _compact(self):
+        keep = np.asarray([number for number, doc_id in enumerate(self._ids) if doc_id is not None], dtype=np.int64)
+        renumber = np.full(len(self._ids), -1, dtype=np.int64)
+        renumber[keep] = np.arange(len(keep))
+        terms, postings = {}, []
+        for token, term in self._terms.items():
+            numbers = np.frombuffer(self._postings[term][0], dtype=np.uint32)
+            frequencies = np.frombuffer(self._postings[term][1], dtype=np.uint16)
+            live = renumber[numbers] >= 0
+            if live.any():
+                terms[token] = len(postings)
+                postings.append((array("I", renumber[numbers[live]].astype(np.uint32).tobytes()),
+                                 array("H", frequencies[live].tobytes())))
+        lengths = np.frombuffer(self._lengths, dtype=np.uint32)[keep]
+        self._terms, self._postings = terms, postings
+        self._ids = [self._ids[number] for number in keep]
+        self._numbers = {doc_id: number for number, doc_id in enumerate(self._ids)}
+        self._lengths = array("I", lengths.tobytes())
+        self._alive = array("B", bytes([1]) * len(keep))
+    
+    def search(self, query: str, k: int, allowed: Optional[Iterable[str]] = None) -> List[Tuple[str, float]]:
+        """
+        Rank chunks by BM25 score for the query's terms.
+        
+        Args:
+            query: Question text
+            k: Number of chunks to return
+            allowed: Only rank these docstore ids (default: all)
+            
+        Returns:
+            Up to k (docstore id, score) pairs, best first; chunks sharing no term are left out
+        """
+        if not self._numbers:
+            return []
+        live = len(self._numbers)
+        lengths = np.frombuffer(self._lengths, dtype=np.uint32).astype(np.float32)
+        alive = np.frombuffer(self._alive, dtype=np.uint8)
+        norms = self.k1 * (1 - self.b + self.b * lengths / (self._total_length / live or 1))
+        scores = np.zeros(len(self._ids), dtype=np.float32)
+        for token in set(tokenize(query)):
+            term = self._terms.get(token)
+            if term is None:
+                continue
+            numbers = np.frombuffer(self._postings[term][0], dtype=np.uint32)
+            frequencies = np.frombuffer(self._postings[term][1], dtype=np.uint16).astype(np.float32)
+            df = int(alive[numbers].sum())
+            idf = math.log(1 + (live - df + 0.5) / (df + 0.5))
+            scores[numbers] += idf * frequencies * (self.k1 + 1) / (frequencies + norms[numbers])
+        if allowed is not None:
+            mask = np.zeros(len(scores), dtype=bool)
+            mask[[self._numbers[doc_id] for doc_id in allowed if doc_id in self._numbers]] = True
+            scores[~mask] = 0
+        scores *= alive
+        top = np.argpartition(-scores, min(k, len(scores) - 1))[:k] if len(scores) > k else np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind="stable")]
+        return [(self._ids[number], float(scores[number])) for number in top if scores[number] > 0]
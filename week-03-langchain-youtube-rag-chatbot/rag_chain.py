@@ -34,8 +34,18 @@ class RAGChain:
         )
     
     def _format_docs(self, retrieved_docs):
-        """Format retrieved documents into context string."""
-        return "\n\n".join(doc.page_content for doc in retrieved_docs)
+        """Format retrieved documents into context string, prefixed with their time range when known."""
+        return "\n\n".join(
+            f"[{self._timestamp(doc.metadata['start'])}-{self._timestamp(doc.metadata['end'])}] {doc.page_content}"
+            if "start" in doc.metadata else doc.page_content
+            for doc in retrieved_docs
+        )
+    
+    @staticmethod
+    def _timestamp(seconds: float) -> str:
+        minutes, seconds = divmod(int(seconds), 60)
+        hours, minutes = divmod(minutes, 60)
+        return f"{hours}:{minutes:02d}:{seconds:02d}" if hours else f"{minutes}:{seconds:02d}"
     
     def _build_chain(self):
         """Build the complete RAG chain."""
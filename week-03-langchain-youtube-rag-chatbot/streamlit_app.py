@@ -1,5 +1,6 @@
 """Streamlit app for the RAG system."""
 
+import math
 import streamlit as st
 from transcript_processor import TranscriptProcessor
 from vector_store_manager import VectorStoreManager
@@ -17,6 +18,16 @@ def initialize_session_state():
         st.session_state.current_video_id = None
     if 'chat_history' not in st.session_state:
         st.session_state.chat_history = []
+    if 'videos' not in st.session_state:
+        st.session_state.videos = []
+    if 'selected_videos' not in st.session_state:
+        st.session_state.selected_videos = []
+
+
+@st.cache_resource
+def get_corpus():
+    """Process-wide index of every processed video, shared by all sessions."""
+    return VectorStoreManager()
 
 
 def extract_video_id(url_or_id):
@@ -37,43 +48,102 @@ def process_video(video_input):
     with st.spinner("Processing video..."):
         # Initialize components
         processor = TranscriptProcessor()
-        vector_manager = VectorStoreManager()
-        
-        # Step 1: Extract transcript
-        st.info("📥 Extracting transcript...")
-        transcript = processor.extract_transcript(video_id)
-        
-        if not transcript:
-            st.error("❌ Failed to extract transcript. Please check the video ID and ensure captions are available.")
-            return False
-        
-        st.success(f"✅ Transcript extracted ({len(transcript)} characters)")
-        
-        # Step 2: Split text
-        st.info("✂️ Splitting text into chunks...")
-        chunks = processor.split_text(transcript)
-        st.success(f"✅ Text split into {len(chunks)} chunks")
+        corpus = get_corpus()
         
-        # Step 3: Create vector store
-        st.info("🔍 Creating vector embeddings...")
-        vector_store = vector_manager.create_vector_store(chunks)
-        st.success("✅ Vector store created")
+        shared = corpus.progress.get(video_id)
+        if shared is not None and shared.error is None:
+            # Another session already indexed (or is indexing) this video
+            shared.first_batch.wait()
+            if shared.indexed == 0:
+                st.error(f"❌ Failed to index the transcript: {shared.error or 'no text found'}")
+                return False
+            st.success("⚡ Video already indexed")
+        elif corpus.load_cached_vector_store(video_id) is not None:
+            # Steps 1-3 were done for this video before
+            st.success("⚡ Loaded cached index for this video")
+        else:
+            # Step 1: Extract transcript
+            st.info("📥 Extracting transcript...")
+            segments = processor.open_transcript(video_id)
+            
+            if segments is None:
+                st.error("❌ Failed to extract transcript. Please check the video ID and ensure captions are available.")
+                return False
+            
+            # Steps 2-3: split, embed and index as a stream, in the background;
+            # questions can be asked as soon as the first batch is indexed
+            st.info("🔍 Indexing transcript...")
+            progress = corpus.ingest_in_background(processor.iter_chunks(segments), video_id=video_id)
+            progress.first_batch.wait()
+            
+            if progress.indexed == 0:
+                st.error(f"❌ Failed to index the transcript: {progress.error or 'no text found'}")
+                return False
+            
+            st.success(f"✅ First {progress.indexed} chunks indexed, the rest continue in the background")
         
         # Step 4: Initialize RAG chain
-        st.info("🔗 Initializing RAG chain...")
-        retriever = vector_manager.get_retriever()
-        rag_chain = RAGChain(retriever)
+        if st.session_state.rag_chain is None:
+            st.info("🔗 Initializing RAG chain...")
+            st.session_state.rag_chain = RAGChain(corpus.get_retriever())
         st.success("✅ RAG system ready!")
         
-        # Store in session state
-        st.session_state.rag_chain = rag_chain
+        # Store in session state; new videos are searched alongside the earlier ones
+        if video_id not in st.session_state.videos:
+            st.session_state.videos.append(video_id)
+        st.session_state.selected_videos = list(st.session_state.videos)
         st.session_state.video_processed = True
         st.session_state.current_video_id = video_id
-        st.session_state.chat_history = []
         
         return True
 
 
+@st.fragment(run_every=2)
+def show_ingest_progress():
+    """Indexing progress of this session's videos, refreshed while they run."""
+    corpus = get_corpus()
+    for video_id in st.session_state.videos:
+        progress = corpus.progress.get(video_id)
+        if progress is None:
+            continue
+        if not progress.done.is_set():
+            st.caption(f"⏳ `{video_id}`: indexing... {progress.indexed} chunks so far. You can already ask questions.")
+        elif progress.error is not None:
+            st.error(f"❌ `{video_id}`: indexing stopped after {progress.indexed} chunks: {progress.error}")
+        else:
+            st.caption(f"📚 `{video_id}`: {progress.indexed} chunks indexed")
+
+
+def video_filter():
+    """Sidebar multiselect of the session's videos that questions are answered from."""
+    if len(st.session_state.videos) > 1:
+        st.multiselect(
+            "🎞️ Answer from",
+            options=st.session_state.videos,
+            key="selected_videos",
+            help="Ask about one video or compare several"
+        )
+    # nothing selected: search all of this session's videos
+    st.session_state.rag_chain.retriever.video_ids = st.session_state.selected_videos or list(st.session_state.videos)
+
+
+def time_window_control():
+    """Sidebar slider that limits retrieval to a range of the video."""
+    duration = get_corpus().video_duration(st.session_state.rag_chain.retriever.video_ids)
+    if duration <= 0:
+        return
+    minutes = max(1, math.ceil(duration / 60))
+    start, end = st.slider(
+        "🕒 Search within (minutes)",
+        min_value=0,
+        max_value=minutes,
+        value=(0, minutes),
+        help="Answer only from this part of the video, e.g. the last 10 minutes"
+    )
+    whole_video = (start, end) == (0, minutes)
+    st.session_state.rag_chain.retriever.time_window = None if whole_video else (start * 60, end * 60)
+
+
 def main():
     """Main Streamlit app."""
     st.set_page_config(
@@ -106,13 +176,21 @@ def main():
         # Show current video status
         if st.session_state.video_processed:
             st.success(f"✅ Video processed: `{st.session_state.current_video_id}`")
+            show_ingest_progress()
             if st.button("🔄 Process New Video"):
                 st.session_state.video_processed = False
                 st.session_state.rag_chain = None
                 st.session_state.current_video_id = None
                 st.session_state.chat_history = []
+                st.session_state.videos = []
+                st.session_state.selected_videos = []
                 st.rerun()
         
+        # Restrict answers to some of the videos and part of them
+        if st.session_state.video_processed:
+            video_filter()
+            time_window_control()
+        
         # Example questions
         if st.session_state.video_processed:
             st.header("💡 Example Questions")
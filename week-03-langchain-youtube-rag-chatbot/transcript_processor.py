@@ -2,10 +2,18 @@
 
 from youtube_transcript_api import YouTubeTranscriptApi, TranscriptsDisabled
 from langchain.text_splitter import RecursiveCharacterTextSplitter
-from typing import List, Optional
+from langchain_core.documents import Document
+from typing import Iterable, Iterator, List, Optional
 import config
 
 
+def _fetch_segments(video_id: str, languages: List[str]) -> List[dict]:
+    """Transcript segments as ``{"text", "start", "duration"}`` dicts."""
+    if hasattr(YouTubeTranscriptApi, "get_transcript"):  # youtube-transcript-api < 1.0
+        return YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
+    return YouTubeTranscriptApi().fetch(video_id, languages=languages).to_raw_data()
+
+
 class TranscriptProcessor:
     """Handles YouTube transcript extraction and processing."""
     
@@ -26,13 +34,28 @@ class TranscriptProcessor:
         Returns:
             Transcript text as string, or None if not available
         """
+        segments = self.open_transcript(video_id, languages)
+        if segments is None:
+            return None
+        return " ".join(segment["text"] for segment in segments)
+    
+    def open_transcript(self, video_id: str, languages: List[str] = None) -> Optional[Iterator[dict]]:
+        """
+        Fetch a transcript as a stream of segments.
+        
+        Args:
+            video_id: YouTube video ID (not full URL)
+            languages: List of preferred languages (default: ["en"])
+            
+        Returns:
+            Iterator over {"text", "start", "duration"} segments in order,
+            or None if not available
+        """
         if languages is None:
             languages = ["en"]
             
         try:
-            transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=languages)
-            transcript = " ".join(chunk["text"] for chunk in transcript_list)
-            return transcript
+            return iter(_fetch_segments(video_id, languages))
         except TranscriptsDisabled:
             print(f"No captions available for video: {video_id}")
             return None
@@ -50,4 +73,58 @@ class TranscriptProcessor:
         Returns:
             List of document chunks
         """
-        return self.text_splitter.create_documents([text])
\ No newline at end of file
+        return self.text_splitter.create_documents([text])
+    
+    def iter_chunks(self, segments: Iterable[dict]) -> Iterator[Document]:
+        """
+        Split a stream of transcript segments into chunks as they arrive.
+        
+        Only a few chunks' worth of text is buffered: once the buffer holds
+        several chunks, all but the last are yielded and the last one (which
+        may continue in the next segments) is split again with them.
+        
+        Args:
+            segments: Transcript segments in order, e.g. from open_transcript
+            
+        Returns:
+            Iterator of document chunks whose metadata holds the "start" and
+            "end" time (seconds) of the segments they were cut from
+        """
+        flush_at = 4 * config.CHUNK_SIZE
+        buffer = ""
+        spans = []  # (first char, last char + 1, start time, end time) per segment in the buffer
+        for segment in segments:
+            if buffer:
+                buffer += " "
+            spans.append((len(buffer), len(buffer) + len(segment["text"]),
+                          segment["start"], segment["start"] + segment.get("duration", 0.0)))
+            buffer += segment["text"]
+            if len(buffer) >= flush_at:
+                chunks = self._locate(buffer, self.text_splitter.split_text(buffer))
+                for text, position in chunks[:-1]:
+                    yield self._timestamped(text, position, spans)
+                cut = chunks[-1][1]
+                buffer = buffer[cut:]
+                spans = [(first - cut, last - cut, start, end) for first, last, start, end in spans if last > cut]
+        if buffer.strip():
+            for text, position in self._locate(buffer, self.text_splitter.split_text(buffer)):
+                yield self._timestamped(text, position, spans)
+    
+    @staticmethod
+    def _locate(buffer: str, texts: List[str]) -> List[tuple]:
+        """Pair each chunk with its offset in the buffer (chunks overlap but start in order)."""
+        located, cursor = [], 0
+        for text in texts:
+            position = buffer.find(text, cursor)
+            position = cursor if position < 0 else position
+            located.append((text, position))
+            cursor = position + 1
+        return located
+    
+    @staticmethod
+    def _timestamped(text: str, position: int, spans: List[tuple]) -> Document:
+        times = [(start, end) for first, last, start, end in spans if first < position + len(text) and last > position]
+        return Document(
+            page_content=text,
+            metadata={"start": round(min(t[0] for t in times), 2), "end": round(max(t[1] for t in times), 2)}
+        )
\ No newline at end of file
@@ -2,51 +2,703 @@
 
 from langchain_openai import OpenAIEmbeddings
 from langchain_community.vectorstores import FAISS
-from typing import List
+from langchain_core.callbacks import CallbackManagerForRetrieverRun
+from langchain_core.documents import Document
+from langchain_core.retrievers import BaseRetriever
+from concurrent.futures import ALL_COMPLETED, FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+import faiss
+import hashlib
+import json
+import os
+import random
+import shutil
+import threading
+import time
+import uuid
+import numpy as np
+import openai
+from embedding_cache import CachedEmbeddings, EmbeddingCache
+from lexical_index import BM25Index
+import ann_index
 import config
 
+# transient API failures worth retrying with backoff
+RETRYABLE_ERRORS = (openai.RateLimitError, openai.APIConnectionError, openai.InternalServerError)
+
+
+class LiveIndexRetriever(BaseRetriever):
+    """Retriever over a VectorStoreManager's current index.
+    
+    The query is embedded first; only the index search takes the manager's
+    lock, so questions can be answered while batches are still being added.
+    
+    Set ``video_ids`` to search only those videos' chunks, and
+    ``time_window`` to ``(start, end)`` seconds to search only chunks
+    overlapping that part of each video; negative values count back from
+    the end, so ``(-600, None)`` is the last 10 minutes.
+    
+    With ``config.SEARCH_TYPE = "hybrid"`` BM25 and vector results are
+    fused (see VectorStoreManager.hybrid_search).
+    """
+    
+    manager: Any
+    video_ids: Optional[List[str]] = None
+    time_window: Optional[Tuple[Optional[float], Optional[float]]] = None
+    
+    def _get_relevant_documents(self, query: str, *, run_manager: CallbackManagerForRetrieverRun) -> List[Document]:
+        if config.SEARCH_TYPE == "hybrid":
+            return self.manager.hybrid_search(query, config.RETRIEVAL_K, video_ids=self.video_ids, time_window=self.time_window)
+        embedding = self.manager.embeddings.embed_query(query)
+        return self.manager.search(embedding, config.RETRIEVAL_K, video_ids=self.video_ids, time_window=self.time_window)
+
+
+class IngestProgress:
+    """Indexing state of one video."""
+    
+    def __init__(self):
+        self.indexed = 0
+        self.first_batch = threading.Event()  # set once the video can answer questions
+        self.done = threading.Event()
+        self.error: Optional[BaseException] = None
+
 
 class VectorStoreManager:
-    """Manages vector store operations for document embeddings."""
+    """Manages vector store operations for document embeddings.
+    
+    One FAISS index holds the chunks of any number of videos, each tagged
+    with its ``video_id``; searches can be limited to a set of videos. The
+    Streamlit app keeps a single manager per process, so every session on a
+    video shares the same vectors.
+    """
     
     def __init__(self):
-        self.embeddings = OpenAIEmbeddings(model=config.EMBEDDING_MODEL)
+        # chunks embedded before (by any session) are read from the local cache;
+        # the SDK does not retry, _embed_batch does (honouring Retry-After)
+        self.embeddings = CachedEmbeddings(
+            OpenAIEmbeddings(model=config.EMBEDDING_MODEL, max_retries=0),
+            EmbeddingCache(config.EMBEDDING_CACHE_DIR, config.EMBEDDING_MODEL, config.EMBEDDING_CACHE_DTYPE),
+            dimensions=config.EMBEDDING_DIMENSIONS
+        )
         self.vector_store = None
+        # guards the index while ingest adds batches and questions search it
+        self.lock = threading.RLock()
+        self.progress: Dict[str, IngestProgress] = {}
+        # FAISS positions of each video's chunks
+        self._positions: Dict[str, List[int]] = {}
+        # per video: chunk time ranges sorted by start, rebuilt when the video grows
+        self._intervals: Dict[str, dict] = {}
+        self._upgrading = False
+        # bumped by every removal, so an upgrade built meanwhile is discarded
+        self._removals = 0
+        # positions of removed chunks still in an approximate index, skipped by searches until _compact
+        self._hidden: set = set()
+        self._compaction_lock = threading.Lock()
+        # BM25 over the same chunks, for hybrid search
+        self.lexical = BM25Index()
+        # embeds and searches the query while the lexical search runs
+        self._search_pool = ThreadPoolExecutor(thread_name_prefix="vector-search")
     
-    def create_vector_store(self, documents: List):
+    def create_vector_store(self, documents: List, video_id: str = ""):
         """
         Create vector store from documents.
         
         Args:
             documents: List of document chunks to embed
+            video_id: Video the chunks belong to
             
         Returns:
             FAISS vector store
         """
-        self.vector_store = FAISS.from_documents(documents, self.embeddings)
+        return self.ingest(documents, video_id)
+    
+    def ingest(self, chunks: Iterable[Document], video_id: str = ""):
+        """
+        Embed and index a video's chunks as they arrive.
+        
+        Chunks are pulled from the iterable in batches of EMBEDDING_BATCH_SIZE
+        with at most EMBEDDING_CONCURRENCY batches in flight, so an iterator
+        is never read far ahead of the embedding API. Each batch is added to
+        the index as soon as it is embedded. Chunks already indexed for the
+        video are replaced.
+        
+        Args:
+            chunks: Document chunks, e.g. TranscriptProcessor.iter_chunks
+            video_id: Video the chunks belong to
+            
+        Returns:
+            FAISS vector store
+        """
+        progress = IngestProgress()
+        with self.lock:
+            self.remove_video(video_id)
+            self.progress[video_id] = progress
+        self._ingest(chunks, video_id, progress)
         return self.vector_store
     
-    def get_retriever(self):
+    def ingest_in_background(self, chunks: Iterable[Document], video_id: str) -> IngestProgress:
+        """
+        Run ingest on a daemon thread, unless the video is already indexed.
+        
+        Wait on the returned progress' first_batch before asking questions;
+        done and error report the outcome. The finished video is saved to
+        the index cache.
+        
+        Args:
+            chunks: Document chunks, e.g. TranscriptProcessor.iter_chunks
+            video_id: Video the chunks belong to
+            
+        Returns:
+            Progress of the video (an earlier run's if another session got there first)
+        """
+        with self.lock:
+            progress = self.progress.get(video_id)
+            if progress is not None and progress.error is None:
+                return progress
+            self.remove_video(video_id)
+            progress = self.progress[video_id] = IngestProgress()
+        
+        def run():
+            try:
+                self._ingest(chunks, video_id, progress)
+                self.cache_vector_store(video_id)
+            except Exception as e:
+                print(f"Error ingesting transcript: {e}")
+        
+        threading.Thread(target=run, name=f"ingest-{video_id}", daemon=True).start()
+        return progress
+    
+    def _ingest(self, chunks: Iterable[Document], video_id: str, progress: IngestProgress):
+        try:
+            pending = {}
+            chunks = iter(chunks)
+            with ThreadPoolExecutor(max_workers=config.EMBEDDING_CONCURRENCY) as pool:
+                while batch := list(islice(chunks, config.EMBEDDING_BATCH_SIZE)):
+                    if len(pending) >= config.EMBEDDING_CONCURRENCY:
+                        self._add_completed(pending, FIRST_COMPLETED, video_id, progress)
+                    pending[pool.submit(self._embed_batch, batch)] = batch
+                self._add_completed(pending, ALL_COMPLETED, video_id, progress)
+            if progress.indexed == 0:
+                # not an indexed video: later sessions must not take it as one
+                progress.error = ValueError("no text found in the transcript")
+        except BaseException as e:
+            progress.error = e
+            raise
+        finally:
+            progress.first_batch.set()
+            progress.done.set()
+    
+    def _add_completed(self, pending: dict, return_when: str, video_id: str, progress: IngestProgress):
+        done, _ = wait(pending, return_when=return_when)
+        for future in done:
+            batch = pending.pop(future)
+            texts = [doc.page_content for doc in batch]
+            text_embeddings = list(zip(texts, future.result()))
+            metadatas = [{**doc.metadata, "video_id": video_id} for doc in batch]
+            ids = [str(uuid.uuid4()) for _ in batch]
+            with self.lock:
+                first = self.vector_store.index.ntotal if self.vector_store is not None else 0
+                if self.vector_store is None:
+                    self.vector_store = FAISS.from_embeddings(text_embeddings, self.embeddings, metadatas=metadatas, ids=ids)
+                else:
+                    self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas, ids=ids)
+                self.lexical.add(ids, texts)
+                self._positions.setdefault(video_id, []).extend(range(first, first + len(batch)))
+                progress.indexed += len(batch)
+            progress.first_batch.set()
+            self._upgrade_index()
+    
+    def _upgrade_index(self):
+        """
+        Move a flat float32 corpus to the configured index as it grows.
+        
+        Vectors are stored at VECTOR_PRECISION from QUANTIZE_MIN_VECTORS
+        chunks on, and the index becomes INDEX_TYPE from ANN_MIN_VECTORS on.
+        The new index is trained and filled from a snapshot without holding
+        the lock, so searches continue on the old index meanwhile; chunks
+        added in the meantime are copied over before the swap. Chunks removed
+        in the meantime shift the positions the snapshot was taken at, so
+        then the new index is dropped and the upgrade starts over.
+        """
+        with self.lock:
+            store = self.vector_store
+            if self._upgrading or store is None:
+                return
+            old = store.index
+            count = old.ntotal
+            current = ann_index.index_kind(old)
+            index_type = config.INDEX_TYPE if count >= config.ANN_MIN_VECTORS else "flat"
+            precision = config.VECTOR_PRECISION if count >= config.QUANTIZE_MIN_VECTORS else "float32"
+            target = (index_type, "float32" if index_type == "ivfpq" else precision)
+            # only ever move on from a flat index, never back
+            if target == current or current[0] != "flat" or (index_type == "flat" and current[1] != "float32"):
+                return
+            self._upgrading = True
+            removals = self._removals
+            # a quantized flat index decodes to its stored approximations
+            vectors = old.reconstruct_n(0, count)
+        retry = False
+        try:
+            index = ann_index.build_index(
+                target[0], old.d, target[1], nlist=config.IVF_NLIST, pq_m=config.PQ_M, pq_bits=config.PQ_BITS,
+                hnsw_m=config.HNSW_M, ef_construction=config.HNSW_EF_CONSTRUCTION
+            )
+            ann_index.train_index(index, vectors)
+            index.add(vectors)
+            with self.lock:
+                if store is not self.vector_store or store.index is not old:  # replaced or compacted meanwhile
+                    return
+                if self._removals != removals:  # deleted in place meanwhile
+                    retry = True
+                    return
+                if old.ntotal > count:
+                    index.add(old.reconstruct_n(count, old.ntotal - count))
+                ann_index.enable_reconstruct(index)
+                ann_index.set_search_params(index, nprobe=config.IVF_NPROBE, ef_search=config.HNSW_EF_SEARCH)
+                store.index = index
+        finally:
+            self._upgrading = False
+            if retry:
+                self._upgrade_index()
+    
+    def _embed_batch(self, documents: List) -> List[List[float]]:
+        """Embed one batch, backing off exponentially on rate limits and transient errors."""
+        texts = [doc.page_content for doc in documents]
+        for attempt in range(config.EMBEDDING_MAX_RETRIES + 1):
+            try:
+                return self.embeddings.embed_documents(texts)
+            except RETRYABLE_ERRORS as e:
+                if attempt == config.EMBEDDING_MAX_RETRIES:
+                    raise
+                response = getattr(e, "response", None)
+                retry_after = response.headers.get("retry-after") if response is not None else None
+                try:
+                    delay = float(retry_after)
+                except (TypeError, ValueError):
+                    delay = min(30.0, 2 ** attempt) * random.uniform(0.5, 1.0)
+                print(f"Embedding batch failed ({type(e).__name__}), retrying in {delay:.1f}s")
+                time.sleep(delay)
+    
+    def remove_video(self, video_id: str):
+        """
+        Drop a video's chunks from the index.
+        
+        A flat index deletes them in place. An approximate index cannot, so
+        the chunks are hidden from searches at once and the index is rebuilt
+        without them on a background thread (see _compact).
+        """
+        with self.lock:
+            positions = self._positions.pop(video_id, None)
+            self.progress.pop(video_id, None)
+            if not positions:
+                return
+            store = self.vector_store
+            ids = [store.index_to_docstore_id[position] for position in positions]
+            self._removals += 1
+            self.lexical.remove(ids)
+            if isinstance(store.index, faiss.IndexFlatCodes):  # flat float32/float16/int8
+                store.delete(ids)
+                # positions after the removed ones have shifted
+                self._rebuild_positions()
+                return
+            self._hidden.update(positions)
+        threading.Thread(target=self._compact, name="compact-index", daemon=True).start()
+    
+    def _compact(self):
+        """
+        Rebuild an approximate index without its hidden positions.
+        
+        IVF ids are not renumbered by remove_ids and HNSW cannot remove at
+        all, so the kept vectors are re-added to an emptied copy of the
+        trained index. PQ codes decode to their centroids and re-encode to
+        the same codes. The rebuild runs on a snapshot without holding the
+        lock, so searches continue on the old index meanwhile; chunks added
+        in the meantime are copied over before the swap, and a removal in
+        the meantime starts the rebuild over.
+        """
+        with self._compaction_lock:
+            while True:
+                with self.lock:
+                    store = self.vector_store
+                    if store is None or not self._hidden:
+                        return
+                    old = store.index
+                    count = old.ntotal
+                    removals = self._removals
+                    hidden = set(self._hidden)
+                    keep = np.asarray([p for p in range(count) if p not in hidden], dtype=np.int64)
+                    vectors = old.reconstruct_batch(keep) if len(keep) else None
+                    index = faiss.clone_index(old)
+                index.reset()
+                if vectors is not None:
+                    index.add(vectors)
+                with self.lock:
+                    if store is not self.vector_store:  # replaced by load_vector_store
+                        return
+                    if store.index is not old or self._removals != removals:
+                        continue
+                    if old.ntotal > count:
+                        index.add(old.reconstruct_n(count, old.ntotal - count))
+                    ann_index.enable_reconstruct(index)
+                    mapping = store.index_to_docstore_id
+                    store.docstore.delete([mapping[p] for p in hidden])
+                    kept = keep.tolist() + list(range(count, old.ntotal))
+                    store.index_to_docstore_id = {i: mapping[p] for i, p in enumerate(kept)}
+                    store.index = index
+                    self._hidden = set()
+                    self._removals += 1
+                    self._rebuild_positions()
+                    return
+    
+    def _rebuild_positions(self):
+        self._positions = {}
+        self._intervals = {}
+        for position, doc_id in self.vector_store.index_to_docstore_id.items():
+            if position in self._hidden:
+                continue
+            video_id = self.vector_store.docstore.search(doc_id).metadata.get("video_id", "")
+            self._positions.setdefault(video_id, []).append(position)
+    
+    def videos(self) -> List[str]:
+        """Videos with chunks in the index."""
+        with self.lock:
+            return list(self._positions)
+    
+    def get_retriever(self, video_ids: Optional[Sequence[str]] = None,
+                      time_window: Optional[Tuple[Optional[float], Optional[float]]] = None):
         """
         Get retriever from vector store.
         
+        Args:
+            video_ids: Optional videos to search (default: the whole index)
+            time_window: Optional (start, end) in seconds to restrict the
+                search to; negative values count back from the end of each video
+        
         Returns:
             Document retriever configured for similarity search
         """
         if not self.vector_store:
             raise ValueError("Vector store not initialized. Call create_vector_store first.")
         
-        return self.vector_store.as_retriever(
-            search_type=config.SEARCH_TYPE,
-            search_kwargs={"k": config.RETRIEVAL_K}
+        return LiveIndexRetriever(
+            manager=self,
+            video_ids=list(video_ids) if video_ids is not None else None,
+            time_window=time_window
+        )
+    
+    def search(self, embedding: List[float], k: int, video_ids: Optional[Sequence[str]] = None,
+               time_window: Optional[Tuple[Optional[float], Optional[float]]] = None) -> List[Document]:
+        """
+        Similarity search, optionally restricted to videos and a time window.
+        
+        A restriction is resolved to index positions first and passed to
+        FAISS as an ID selector, so chunks outside it are never scored.
+        
+        Args:
+            embedding: Query embedding
+            k: Number of chunks to return
+            video_ids: Videos to search (default: all)
+            time_window: (start, end) seconds, see time_window_positions
+            
+        Returns:
+            Up to k chunks, most similar first
+        """
+        with self.lock:
+            store = self.vector_store
+            if store is None:
+                return []
+            positions = self._candidate_positions(video_ids, time_window)
+            if positions is None:
+                if config.SEARCH_TYPE == "mmr":
+                    return store.max_marginal_relevance_search_by_vector(embedding, k=k)
+                return store.similarity_search_by_vector(embedding, k=k)
+            if len(positions) == 0:
+                return []
+            query = np.asarray([embedding], dtype=np.float32)
+            if store._normalize_L2:
+                faiss.normalize_L2(query)
+            if len(positions) <= config.EXACT_SEARCH_MAX and not isinstance(store.index, faiss.IndexFlatCodes):
+                # an ANN search may visit none of a few scattered chunks; score them all instead
+                distances = ((store.index.reconstruct_batch(positions) - query) ** 2).sum(axis=1)
+                found = positions[np.argsort(distances)[:k]]
+            else:
+                params = ann_index.search_parameters(store.index, faiss.IDSelectorBatch(positions))
+                found = store.index.search(query, min(k, len(positions)), params=params)[1][0]
+            return [store.docstore.search(store.index_to_docstore_id[int(i)]) for i in found if i != -1]
+    
+    def hybrid_search(self, query: str, k: int, video_ids: Optional[Sequence[str]] = None,
+                      time_window: Optional[Tuple[Optional[float], Optional[float]]] = None) -> List[Document]:
+        """
+        BM25 and vector search, merged with reciprocal-rank fusion.
+        
+        The query is embedded and searched on a worker thread while the
+        lexical search runs. If the vector side is not back within
+        RETRIEVAL_BUDGET_MS, the lexical results are returned alone (unless
+        there are none, in which case the vector results are awaited).
+        
+        Args:
+            query: Question text
+            k: Number of chunks to return
+            video_ids: Videos to search (default: all)
+            time_window: (start, end) seconds, see time_window_positions
+        
+        Returns:
+            Up to k chunks, best fused rank first
+        """
+        deadline = time.monotonic() + config.RETRIEVAL_BUDGET_MS / 1000
+        vector = self._search_pool.submit(
+            lambda: self.search(self.embeddings.embed_query(query), config.HYBRID_CANDIDATES, video_ids, time_window)
         )
+        with self.lock:
+            store = self.vector_store
+            if store is None:
+                return []
+            positions = self._candidate_positions(video_ids, time_window)
+            allowed = None if positions is None else [store.index_to_docstore_id[int(p)] for p in positions]
+            lexical = [
+                store.docstore.search(doc_id)
+                for doc_id, _ in self.lexical.search(query, config.HYBRID_CANDIDATES, allowed)
+            ]
+        try:
+            dense = vector.result(timeout=max(0.0, deadline - time.monotonic()))
+        except FutureTimeoutError:
+            if lexical:
+                return lexical[:k]
+            dense = vector.result()
+        return self._fuse([dense, lexical], k)
+    
+    @staticmethod
+    def _fuse(rankings: List[List[Document]], k: int) -> List[Document]:
+        """Reciprocal-rank fusion: score each chunk by the sum of 1 / (RRF_K + rank) over the rankings."""
+        scores: Dict[str, float] = {}
+        documents: Dict[str, Document] = {}
+        for ranking in rankings:
+            for rank, doc in enumerate(ranking, start=1):
+                key = doc.id or doc.page_content  # stores saved by older versions have no document ids
+                scores[key] = scores.get(key, 0.0) + 1 / (config.RRF_K + rank)
+                documents[key] = doc
+        return [documents[key] for key in sorted(scores, key=scores.get, reverse=True)[:k]]
+    
+    def _candidate_positions(self, video_ids, time_window) -> Optional[np.ndarray]:
+        """Positions to search, or None for the whole index (call with the lock held)."""
+        # while removed chunks await compaction, even a whole-index search lists the live positions
+        everything = video_ids is None or set(video_ids) >= set(self._positions)
+        if time_window is None and everything and not self._hidden:
+            return None
+        parts = [
+            np.asarray(self._positions.get(video_id, []), dtype=np.int64) if time_window is None
+            else self.time_window_positions(video_id, *time_window)
+            for video_id in (self._positions if video_ids is None else video_ids)
+        ]
+        return np.concatenate(parts) if parts else np.empty(0, dtype=np.int64)
+    
+    def _interval_index(self, video_id: str) -> dict:
+        """Start/end times of a video's chunks, sorted by start (call with the lock held)."""
+        positions = self._positions.get(video_id, [])
+        intervals = self._intervals.get(video_id)
+        if intervals is None or intervals["count"] != len(positions):
+            timed, starts, ends = [], [], []
+            for position in positions:
+                metadata = self.vector_store.docstore.search(self.vector_store.index_to_docstore_id[position]).metadata
+                if "start" in metadata:
+                    timed.append(position)
+                    starts.append(metadata["start"])
+                    ends.append(metadata["end"])
+            order = np.argsort(starts, kind="stable")
+            starts = np.asarray(starts, dtype=np.float32)[order]
+            ends = np.asarray(ends, dtype=np.float32)[order]
+            intervals = self._intervals[video_id] = {
+                "count": len(positions),
+                "starts": starts,
+                "ends": ends,
+                "positions": np.asarray(timed, dtype=np.int64)[order],
+                "longest": float((ends - starts).max()) if len(starts) else 0.0,
+                "duration": float(ends.max()) if len(ends) else 0.0,
+            }
+        return intervals
+    
+    def video_duration(self, video_ids: Optional[Sequence[str]] = None) -> float:
+        """End time in seconds of the longest of these videos (0 without timestamps)."""
+        with self.lock:
+            ids = self._positions if video_ids is None else video_ids
+            return max((self._interval_index(video_id)["duration"] for video_id in ids), default=0.0)
+    
+    def time_window_positions(self, video_id: str, start: Optional[float], end: Optional[float]) -> np.ndarray:
+        """
+        Index positions of a video's chunks overlapping a time window (call with the lock held).
+        
+        Chunks are sorted by start time and no chunk is longer than the
+        longest one, so only starts in [start - longest, end] are checked.
+        
+        Args:
+            video_id: Video to look in
+            start: Window start in seconds (None: beginning; negative: from the end)
+            end: Window end in seconds (None: end of video; negative: from the end)
+            
+        Returns:
+            FAISS positions of the chunks in the window
+        """
+        intervals = self._interval_index(video_id)
+        duration = intervals["duration"]
+        start = 0.0 if start is None else (duration + start if start < 0 else start)
+        end = duration if end is None else (duration + end if end < 0 else end)
+        starts = intervals["starts"]
+        lo = np.searchsorted(starts, start - intervals["longest"], side="left")
+        hi = np.searchsorted(starts, end, side="right")
+        in_window = intervals["ends"][lo:hi] >= start
+        return intervals["positions"][lo:hi][in_window]
     
     def save_vector_store(self, path: str):
-        """Save vector store to disk."""
-        if self.vector_store:
-            self.vector_store.save_local(path)
+        """Save vector store to disk (without removed chunks awaiting compaction)."""
+        while self.vector_store:
+            self._compact()
+            with self.lock:
+                if not self._hidden:
+                    self.vector_store.save_local(path)
+                    return
     
     def load_vector_store(self, path: str):
         """Load vector store from disk."""
-        self.vector_store = FAISS.load_local(path, self.embeddings)
-        return self.vector_store
\ No newline at end of file
+        # the docstore is a pickle; only load indexes this app wrote itself
+        store = FAISS.load_local(path, self.embeddings, allow_dangerous_deserialization=True)
+        with self.lock:
+            self.vector_store = store
+            self._hidden = set()
+            self._rebuild_positions()
+            self.lexical = BM25Index()
+            self.lexical.add(list(store.index_to_docstore_id.values()),
+                             [store.docstore.search(doc_id).page_content for doc_id in store.index_to_docstore_id.values()])
+            self.progress = {}
+            for video_id, positions in self._positions.items():
+                self.progress[video_id] = self._finished(len(positions))
+        return self.vector_store
+    
+    @staticmethod
+    def _finished(indexed: int) -> IngestProgress:
+        progress = IngestProgress()
+        progress.indexed = indexed
+        progress.first_batch.set()
+        progress.done.set()
+        return progress
+    
+    @staticmethod
+    def index_cache_path(video_id: str, languages: Optional[List[str]] = None) -> str:
+        """
+        Cache directory for a video's index.
+        
+        The key covers everything the index depends on: video, transcript
+        languages, embedding model and chunking settings.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Transcript languages the index was built from (default: ["en"])
+            
+        Returns:
+            Path of the index directory (which may not exist yet)
+        """
+        # last entry: chunk metadata layout, so indexes without start/end/video_id are not reused
+        settings = json.dumps([config.EMBEDDING_MODEL, config.EMBEDDING_DIMENSIONS, config.CHUNK_SIZE, config.CHUNK_OVERLAP,
+                               "timestamps+video_id"])
+        digest = hashlib.sha256(settings.encode()).hexdigest()[:12]
+        name = f"{video_id}-{'_'.join(languages or ['en'])}-{digest}"
+        return os.path.join(config.INDEX_CACHE_DIR, name)
+    
+    def load_cached_vector_store(self, video_id: str, languages: Optional[List[str]] = None):
+        """
+        Add a video to the index from the index cache.
+        
+        Args:
+            video_id: YouTube video ID
+            languages: Transcript languages (default: ["en"])
+            
+        Returns:
+            FAISS vector store, or None on a cache miss
+        """
+        with self.lock:
+            progress = self.progress.get(video_id)
+            if progress is not None and progress.error is None:
+                return self.vector_store
+        path = self.index_cache_path(video_id, languages)
+        if not os.path.isdir(path):
+            return None
+        try:
+            cached = FAISS.load_local(path, self.embeddings, allow_dangerous_deserialization=True)
+        except Exception as e:
+            print(f"Error loading cached index {path}: {e}")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        os.utime(path)  # mark as recently used
+        with self.lock:
+            progress = self.progress.get(video_id)
+            if progress is not None and progress.error is None:  # another session added it meanwhile
+                return self.vector_store
+            self.remove_video(video_id)
+            first = self.vector_store.index.ntotal if self.vector_store is not None else 0
+            count = cached.index.ntotal
+            ids = [cached.index_to_docstore_id[i] for i in range(count)]
+            documents = [cached.docstore.search(doc_id) for doc_id in ids]
+            self.lexical.add(ids, [doc.page_content for doc in documents])
+            if self.vector_store is None:
+                self.vector_store = cached
+            else:
+                # add rather than merge_from, which needs both indexes to be of the same type
+                self.vector_store.add_embeddings(
+                    list(zip((doc.page_content for doc in documents), cached.index.reconstruct_n(0, count).tolist())),
+                    metadatas=[doc.metadata for doc in documents],
+                    ids=ids
+                )
+            self._positions[video_id] = list(range(first, first + count))
+            self.progress[video_id] = self._finished(count)
+        self._upgrade_index()
+        return self.vector_store
+    
+    def cache_vector_store(self, video_id: str, languages: Optional[List[str]] = None):
+        """Save one video's chunks to the index cache, then evict to the size limit."""
+        with self.lock:
+            positions = self._positions.get(video_id)
+            if not positions:
+                return
+            store = self.vector_store
+            exact = ann_index.is_exact(store.index)
+            vectors = store.index.reconstruct_batch(np.asarray(positions, dtype=np.int64)).tolist() if exact else None
+            ids = [store.index_to_docstore_id[position] for position in positions]
+            documents = [store.docstore.search(doc_id) for doc_id in ids]
+        if vectors is None:
+            # PQ only keeps approximations; the embedding cache has the originals
+            vectors = self.embeddings.embed_documents([doc.page_content for doc in documents])
+        video_store = FAISS.from_embeddings(
+            list(zip((doc.page_content for doc in documents), vectors)),
+            self.embeddings,
+            metadatas=[doc.metadata for doc in documents],
+            ids=ids
+        )
+        path = self.index_cache_path(video_id, languages)
+        # write aside and rename, so a reader never sees a half-written index
+        tmp_path = f"{path}.tmp-{uuid.uuid4().hex}"
+        video_store.save_local(tmp_path)
+        try:
+            os.replace(tmp_path, path)
+        except OSError:  # another session cached the same video first
+            shutil.rmtree(tmp_path, ignore_errors=True)
+        self._evict_index_cache(keep=path)
+    
+    @staticmethod
+    def _evict_index_cache(keep: str):
+        """Remove least recently used indexes until the cache fits INDEX_CACHE_MAX_MB."""
+        entries = []
+        for name in os.listdir(config.INDEX_CACHE_DIR):
+            path = os.path.join(config.INDEX_CACHE_DIR, name)
+            if ".tmp-" in name or not os.path.isdir(path):
+                continue
+            size = sum(entry.stat().st_size for entry in os.scandir(path) if entry.is_file())
+            entries.append((os.stat(path).st_mtime, size, path))
+        total = sum(size for _, size, _ in entries)
+        limit = config.INDEX_CACHE_MAX_MB * 1024 * 1024
+        for _, size, path in sorted(entries):
+            if total <= limit:
+                break
+            if path != keep:
+                shutil.rmtree(path, ignore_errors=True)
+                total -= size
\ No newline at end of file